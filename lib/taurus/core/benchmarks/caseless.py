@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Benchmark of the caseless containers (:class:`CaselessDict` and
+:class:`CaselessWeakValueDict`), which are used for the model name lookups
+of the factories, against the equivalent containers lowering the key on
+each access (the implementation before the key memo was introduced)"""
+
+__all__ = ["LoweringCaselessDict", "LoweringCaselessWeakValueDict",
+           "benchmark", "main"]
+
+__docformat__ = 'restructuredtext'
+
+import timeit
+import weakref
+
+from taurus.core.util.containers import CaselessDict, CaselessWeakValueDict
+
+
+class LoweringCaselessDict(dict):
+    """Reference implementation: lowers the key on each access"""
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self, key.lower())
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key.lower(), value)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key.lower())
+
+    def get(self, key, def_val=None):
+        return dict.get(self, key.lower(), def_val)
+
+
+class LoweringCaselessWeakValueDict(weakref.WeakValueDictionary):
+    """Reference implementation: lowers the key on each access"""
+
+    def __getitem__(self, key):
+        return weakref.WeakValueDictionary.__getitem__(self, key.lower())
+
+    def __setitem__(self, key, value):
+        weakref.WeakValueDictionary.__setitem__(self, key.lower(), value)
+
+    def __contains__(self, key):
+        return weakref.WeakValueDictionary.__contains__(self, key.lower())
+
+    def get(self, key, def_val=None):
+        return weakref.WeakValueDictionary.get(self, key.lower(), def_val)
+
+
+class _Value(object):
+    pass
+
+
+def _keys(n):
+    return ['tango://Host:10000/Sys/TG_Test/%d/Double_Scalar' % i
+            for i in range(n)]
+
+
+def benchmark(klass, nkeys=1000, repeat=5, number=20):
+    """Measures the lookups of a caseless container class
+
+    :param klass: (class) the container class
+    :param nkeys: (int) number of keys in the container
+    :param repeat: (int) number of measurements (the best one is reported)
+    :param number: (int) number of passes over all the keys per measurement
+
+    :return: (dict) lookups per second for each operation
+    """
+    keys = _keys(nkeys)
+    values = [_Value() for _ in keys]
+    d = klass()
+    for k, v in zip(keys, values):
+        d[k] = v
+
+    def getitem():
+        for k in keys:
+            d[k]
+
+    def get():
+        for k in keys:
+            d.get(k)
+
+    def contains():
+        for k in keys:
+            k in d
+
+    def setitem():
+        for k, v in zip(keys, values):
+            d[k] = v
+
+    ret = {}
+    for name, func in (('getitem', getitem), ('get', get),
+                       ('contains', contains), ('setitem', setitem)):
+        t = min(timeit.repeat(func, repeat=repeat, number=number))
+        ret[name] = nkeys * number / t
+    return ret
+
+
+def main():
+    pairs = ((LoweringCaselessDict, CaselessDict),
+             (LoweringCaselessWeakValueDict, CaselessWeakValueDict))
+    for reference, klass in pairs:
+        ref = benchmark(reference)
+        new = benchmark(klass)
+        print '%s (lookups/s):' % klass.__name__
+        for name in sorted(new):
+            print '    %-10s %12.0f %12.0f  x%.2f' % (
+                name, ref[name], new[name], new[name] / ref[name])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Helpers for summarizing, storing and comparing benchmark results.
+
+The results are dictionaries of benchmarks, each of them being a dictionary
+of metrics (name: number). By convention, the metrics whose name ends with
+`_per_s` are better when higher (throughputs) and the rest are better when
+lower (times, latencies, memory...)::
+
+    results = {'label': {'paint_ms_p50': 1.2, 'events_per_s': 99.5}}
+    saveResults('baseline.json', results)
+    ...
+    for row in compareResults(newresults, loadResults('baseline.json')):
+        print row
+"""
+
+__all__ = ["summarize", "isHigherBetter", "saveResults", "loadResults",
+           "compareResults", "formatComparison"]
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import json
+import time
+import platform
+
+import numpy
+
+
+def summarize(values, name, scale=1.):
+    """Returns the mean, min, max and percentiles (50, 90, 99) of the given
+    values as metrics
+
+    :param values: (sequence<float>) the measured values
+    :param name: (str) prefix for the metric names (e.g. 'latency_ms')
+    :param scale: (float) factor applied to the values (e.g. 1000 for
+                  converting seconds into milliseconds)
+
+    :return: (dict) metrics (empty if there are no values)
+    """
+    if not len(values):
+        return {}
+    values = numpy.asarray(values, dtype='d') * scale
+    p50, p90, p99 = numpy.percentile(values, (50, 90, 99))
+    return {'%s_mean' % name: float(values.mean()),
+            '%s_min' % name: float(values.min()),
+            '%s_max' % name: float(values.max()),
+            '%s_p50' % name: float(p50),
+            '%s_p90' % name: float(p90),
+            '%s_p99' % name: float(p99)}
+
+
+def isHigherBetter(metric):
+    """Returns whether higher values of the given metric are better
+
+    :param metric: (str) the metric name
+
+    :return: (bool)
+    """
+    return metric.endswith('_per_s')
+
+
+def saveResults(fname, results, **info):
+    """Saves the results as a JSON file, together with information about
+    the environment
+
+    :param fname: (str) the file name
+    :param results: (dict) the results
+    :param info: extra information to be stored
+    """
+    import taurus
+    data = {'results': results,
+            'info': dict(time=time.time(),
+                         taurus=taurus.Release.version,
+                         python=sys.version.split()[0],
+                         platform=platform.platform(),
+                         **info)}
+    with open(fname, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def loadResults(fname):
+    """Loads the results saved with :func:`saveResults`
+
+    :param fname: (str) the file name
+
+    :return: (dict) the results
+    """
+    with open(fname) as f:
+        return json.load(f)['results']
+
+
+def compareResults(results, baseline, tolerance=0.1):
+    """Compares the results with the baseline ones. Only the metrics
+    present in both are compared
+
+    :param results: (dict) the results
+    :param baseline: (dict) the baseline results
+    :param tolerance: (float) relative change allowed before considering
+                      that a metric got worse
+
+    :return: (list<tuple>) (benchmark, metric, baseline value, value,
+             ratio, regression) tuples, where ratio is value/baseline and
+             regression is True if the metric got worse beyond the tolerance
+    """
+    ret = []
+    for bench in sorted(results):
+        base = baseline.get(bench, {})
+        for metric in sorted(results[bench]):
+            if metric not in base:
+                continue
+            old, new = base[metric], results[bench][metric]
+            ratio = float(new) / old if old else float('inf')
+            if isHigherBetter(metric):
+                regression = new < old * (1 - tolerance)
+            else:
+                regression = new > old * (1 + tolerance)
+            ret.append((bench, metric, old, new, ratio, regression))
+    return ret
+
+
+def formatComparison(rows):
+    """Returns a text table for the output of :func:`compareResults`
+
+    :param rows: (list<tuple>) the comparison
+
+    :return: (str)
+    """
+    lines = ['%-20s %-24s %12s %12s %8s' % ('benchmark', 'metric',
+                                            'baseline', 'value', 'ratio')]
+    for bench, metric, old, new, ratio, regression in rows:
+        lines.append('%-20s %-24s %12.4g %12.4g %8.2f%s' % (
+            bench, metric, old, new, ratio, '  <-- WORSE' if regression
+            else ''))
+    return '\n'.join(lines)
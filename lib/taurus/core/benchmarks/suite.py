@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Benchmark suite for the hot paths of :mod:`taurus.core`: event
+dispatching (:meth:`TaurusModel.fireEvent`), polling
+(:meth:`TaurusPollingTimer._pollAttributes`), decoding of Tango values
+(:class:`TangoAttrValue`), evaluation attributes
+(:meth:`EvaluationAttribute.applyTransformation`), name validators and
+caseless containers.
+
+No control system is needed: the attributes are provided by the simulation
+scheme (:mod:`taurus.core.simulation`) and the Tango values are decoded from
+mock objects (the Tango benchmark is skipped if PyTango is not installed).
+
+Each benchmark reports the throughput (metrics ending in `_per_s`) and the
+mean, min, max and percentiles of the time per call (in microseconds). The
+results can be stored and compared with :mod:`taurus.core.benchmarks.results`.
+From the command line (see `taurusbenchmark --help`)::
+
+    taurusbenchmark --output=baseline.json
+    ...
+    taurusbenchmark --baseline=baseline.json   # exits with 1 if worse
+"""
+
+__all__ = ["BENCHMARKS", "measure", "runBenchmarks", "main"]
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import time
+import timeit
+
+from taurus.core.benchmarks.results import summarize
+
+
+def measure(func, repeat=50, number=100, ops=1, prefix=''):
+    """Measures the calls to the given function. The function is called
+    `number` times for each of the `repeat` samples; the percentiles are
+    computed over the samples.
+
+    :param func: (callable) the function to measure (without arguments)
+    :param repeat: (int) number of samples
+    :param number: (int) number of calls per sample
+    :param ops: (int) number of operations done by each call (e.g. the
+                number of listeners notified), used for the throughput
+    :param prefix: (str) prefix for the metric names
+
+    :return: (dict) the `<prefix>ops_per_s` and `<prefix>time_us_*` metrics
+    """
+    timer = timeit.default_timer
+    loop = xrange(number)
+    times = []
+    for _ in xrange(repeat):
+        t0 = timer()
+        for _ in loop:
+            func()
+        times.append((timer() - t0) / number)
+    ret = summarize(times, prefix + 'time_us', 1e6)
+    ret[prefix + 'ops_per_s'] = ops * len(times) / sum(times)
+    return ret
+
+
+class _Listener(object):
+    """A listener that just counts the events"""
+
+    def __init__(self):
+        self.count = 0
+
+    def eventReceived(self, src, evt_type, evt_value):
+        self.count += 1
+
+
+def benchFireEvent(repeat, listeners=10):
+    """fireEvent of an attribute with several listeners"""
+    import taurus
+    from taurus.core.taurusbasetypes import TaurusEventType
+    attr = taurus.Attribute('sim:scalar/bench_fireevent')
+    value = attr.read()
+    _listeners = [_Listener() for _ in range(listeners)]
+    for l in _listeners:
+        attr.addListener(l)
+    try:
+        return measure(lambda: attr.fireEvent(TaurusEventType.Change, value),
+                       repeat, 200, ops=listeners)
+    finally:
+        for l in _listeners:
+            attr.removeListener(l)
+
+
+def benchPolling(repeat, attributes=100):
+    """poll of the attributes registered in a polling timer"""
+    import taurus
+    from taurus.core.tauruspollingtimer import TaurusPollingTimer
+    timer = TaurusPollingTimer(1000)
+    attrs = [taurus.Attribute('sim:scalar/bench_polling%d' % i)
+             for i in range(attributes)]
+    listener = _Listener()
+    for a in attrs:
+        a.addListener(listener)
+        timer.addAttribute(a, auto_start=False)
+    try:
+        return measure(timer._pollAttributes, repeat, 5, ops=attributes)
+    finally:
+        for a in attrs:
+            timer.removeAttribute(a)
+            a.removeListener(listener)
+
+
+def benchTangoValue(repeat):
+    """decoding of (mock) PyTango DeviceAttribute objects"""
+    try:
+        import PyTango
+        from taurus.core.tango.tangoattribute import TangoAttrValue
+    except ImportError:
+        return None
+    import numpy
+    from taurus.core.units import UR
+    from taurus.core.taurusbasetypes import DataType, DataFormat
+
+    class _Attr(object):
+        """mock of the TangoAttribute members used for decoding"""
+        type = DataType.Float
+        _tango_data_type = PyTango.CmdArgType.DevDouble
+        _units = UR.parse_units('mm')
+
+        def __init__(self, data_format):
+            self.data_format = data_format
+
+    class _DevAttr(object):
+        """mock of a PyTango.DeviceAttribute"""
+        has_failed = False
+        is_empty = False
+        quality = PyTango.AttrQuality.ATTR_VALID
+
+        def __init__(self, value):
+            self.value = self.w_value = value
+            self.time = PyTango.TimeVal.fromtimestamp(time.time())
+
+    ret = {}
+    for prefix, data_format, value in (
+            ('scalar_', DataFormat._0D, 1.5),
+            ('spectrum_', DataFormat._1D, numpy.arange(1000.))):
+        attr, dev_attr = _Attr(data_format), _DevAttr(value)
+        ret.update(measure(lambda: TangoAttrValue(attr, dev_attr), repeat,
+                           100, prefix=prefix))
+    return ret
+
+
+def benchEvaluation(repeat):
+    """applyTransformation of evaluation attributes"""
+    import taurus
+    ret = {}
+    for prefix, name in (
+            ('scalar_', 'eval:{sim:scalar/bench_eval?noise=1}*2+1'),
+            ('spectrum_', 'eval:sin(linspace(0,1,1000))*2')):
+        attr = taurus.Attribute(name)
+        ret.update(measure(attr.applyTransformation, repeat, 50,
+                           prefix=prefix))
+    return ret
+
+
+def benchValidators(repeat):
+    """getNames of the attribute name validators"""
+    import taurus
+    names = {'eval': ['eval:{sim:scalar/a}*2', 'eval:rand(10)',
+                      'eval:@foo/bar', 'eval://localhost/a=1;a*2'],
+             'sim': ['sim:scalar', 'sim:spectrum/a?rate=10&size=100',
+                     'simulation://image?noise=1&seed=2#rvalue'],
+             'tango': ['tango://host:10000/sys/tg_test/1/double_scalar',
+                       'sys/tg_test/1/double_scalar#label',
+                       'tango:a/b/c/d?configuration=units']}
+    ret = {}
+    for scheme in sorted(names):
+        try:
+            v = taurus.Factory(scheme).getAttributeNameValidator()
+        except Exception:
+            continue  # scheme not available (e.g. PyTango not installed)
+        schemeNames = names[scheme]
+
+        def getNames():
+            for name in schemeNames:
+                v.getNames(name)
+        ret.update(measure(getNames, repeat, 50, ops=len(schemeNames),
+                           prefix=scheme + '_'))
+    return ret
+
+
+def benchCaseless(repeat, keys=1000):
+    """lookups in the caseless containers of the factories"""
+    from taurus.core.util.containers import (CaselessDict,
+                                             CaselessWeakValueDict)
+    from taurus.core.benchmarks.caseless import _keys, _Value
+    ret = {}
+    for prefix, klass in (('dict_', CaselessDict),
+                          ('weakdict_', CaselessWeakValueDict)):
+        names = _keys(keys)
+        values = [_Value() for _ in names]
+        d = klass(zip(names, values))
+        names = [n.upper() for n in names]
+
+        def lookup():
+            for n in names:
+                d[n]
+        ret.update(measure(lookup, repeat, 5, ops=keys, prefix=prefix))
+    return ret
+
+
+#: The available benchmarks (name: function). The functions receive the
+#: number of samples and return the metrics (or None if not available)
+BENCHMARKS = {'fireevent': benchFireEvent,
+              'polling': benchPolling,
+              'tangovalue': benchTangoValue,
+              'evaluation': benchEvaluation,
+              'validators': benchValidators,
+              'caseless': benchCaseless,
+              }
+
+
+def runBenchmarks(names=None, repeat=50):
+    """Runs the given benchmarks
+
+    :param names: (list<str>) the benchmark names (all if None). See
+                  :data:`BENCHMARKS`
+    :param repeat: (int) number of samples of each measurement
+
+    :return: (dict) the results (benchmark name -> metrics). The benchmarks
+             that are not available are not included
+    """
+    if names is None:
+        names = sorted(BENCHMARKS)
+    results = {}
+    for name in names:
+        metrics = BENCHMARKS[name](repeat)
+        if metrics is not None:
+            results[name] = metrics
+    return results
+
+
+def main():
+    import optparse
+    from taurus.core.benchmarks.results import (saveResults, loadResults,
+                                                compareResults,
+                                                formatComparison)
+
+    parser = optparse.OptionParser(
+        usage='%prog [options] [benchmark ...]',
+        description='Benchmarks for the taurus core. Available: %s'
+                    % ', '.join(sorted(BENCHMARKS)))
+    parser.add_option('--repeat', type='int', default=50,
+                      help='number of samples of each measurement '
+                           '[default: %default]')
+    parser.add_option('--output', help='save the results to a JSON file')
+    parser.add_option('--baseline',
+                      help='compare with the results of a JSON file')
+    parser.add_option('--tolerance', type='float', default=0.1,
+                      help='relative change tolerated when comparing '
+                           '[default: %default]')
+    options, args = parser.parse_args()
+    for name in args:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark "%s"' % name)
+
+    results = runBenchmarks(args or None, repeat=options.repeat)
+    for name in sorted(set(args or BENCHMARKS) - set(results)):
+        print name, '(not available)'
+    for name in sorted(results):
+        print name
+        for metric, value in sorted(results[name].items()):
+            print '    %-24s %12.4g' % (metric, value)
+    if options.output:
+        saveResults(options.output, results, repeat=options.repeat)
+    if options.baseline:
+        rows = compareResults(results, loadResults(options.baseline),
+                              options.tolerance)
+        print formatComparison(rows)
+        if any(row[5] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
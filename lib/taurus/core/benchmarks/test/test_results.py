@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.benchmarks.results"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import tempfile
+import unittest
+from taurus.core.benchmarks.results import (summarize, saveResults,
+                                            loadResults, compareResults)
+
+
+class ResultsTest(unittest.TestCase):
+    '''TestCase for the benchmark results helpers'''
+
+    def test_summarize(self):
+        '''Check the summary of the measured values'''
+        s = summarize([0.001 * i for i in range(1, 101)], 'time_ms', 1000)
+        self.assertAlmostEqual(s['time_ms_min'], 1)
+        self.assertAlmostEqual(s['time_ms_max'], 100)
+        self.assertAlmostEqual(s['time_ms_mean'], 50.5)
+        self.assertAlmostEqual(s['time_ms_p50'], 50.5)
+        self.assertTrue(s['time_ms_p90'] < s['time_ms_p99'] < 100)
+        self.assertEqual(summarize([], 'time_ms'), {})
+
+    def test_save_load(self):
+        '''Check that the results can be saved and loaded'''
+        results = {'a': {'x_per_s': 10., 'y_ms': 2.5}}
+        fd, fname = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            saveResults(fname, results, comment='test')
+            self.assertEqual(loadResults(fname), results)
+        finally:
+            os.remove(fname)
+
+    def test_compare(self):
+        '''Check the detection of regressions'''
+        baseline = {'a': {'x_per_s': 100., 'y_ms': 10., 'z_ms': 1.},
+                    'b': {'x_per_s': 1.}}
+        results = {'a': {'x_per_s': 80., 'y_ms': 10.5, 'w_ms': 3.},
+                   'c': {'x_per_s': 1.}}
+        rows = compareResults(results, baseline, tolerance=0.1)
+        self.assertEqual([r[:2] for r in rows],
+                         [('a', 'x_per_s'), ('a', 'y_ms')])
+        self.assertEqual([r[5] for r in rows], [True, False])
+        rows = compareResults({'a': {'y_ms': 12.}}, baseline)
+        self.assertTrue(rows[0][5])
+        self.assertAlmostEqual(rows[0][4], 1.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.benchmarks.suite"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import unittest
+from taurus.core.benchmarks.suite import BENCHMARKS, measure, runBenchmarks
+
+
+class SuiteTest(unittest.TestCase):
+    '''TestCase for the core benchmark suite'''
+
+    def test_measure(self):
+        '''Check the metrics of a measurement'''
+        calls = []
+        m = measure(lambda: calls.append(1), repeat=4, number=3, ops=2,
+                    prefix='x_')
+        self.assertEqual(len(calls), 12)
+        self.assertEqual(sorted(m), ['x_ops_per_s', 'x_time_us_max',
+                                     'x_time_us_mean', 'x_time_us_min',
+                                     'x_time_us_p50', 'x_time_us_p90',
+                                     'x_time_us_p99'])
+        self.assertTrue(m['x_ops_per_s'] > 0)
+
+    def test_run(self):
+        '''Check that all the (available) benchmarks run'''
+        results = runBenchmarks(repeat=2)
+        self.assertTrue(set(results) <= set(BENCHMARKS))
+        # these do not depend on optional modules
+        for name in ('fireevent', 'polling', 'evaluation', 'validators',
+                     'caseless'):
+            metrics = results[name]
+            throughputs = [v for k, v in metrics.items()
+                           if k.endswith('ops_per_s')]
+            self.assertTrue(throughputs, name)
+            self.assertTrue(all(v > 0 for v in throughputs), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -61,6 +61,11 @@ Similarly, you can combine epics attributes with attributes from other schemes::
     $> taurusform 'ca:my:example' 'tango:sys/tg_test/1/float_scalar'\
        'eval:{ca:my:example}*{tango:sys/tg_test/1/float_scalar}'
 
+The PVs are connected in background, so creating an epics attribute does not
+block (until the PV is connected, the attribute is "connecting" and its value
+is invalid). The PV updates are decoded and notified to the listeners from a
+worker thread.
+
 Currently, the taurus epics scheme just supports epics PVs, implementing them as
 taurus attributes. Other model types such as the Authority, and Device classes
 are just convenience dummy objects in the epics scheme at this point.
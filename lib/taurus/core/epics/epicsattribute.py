@@ -28,8 +28,10 @@ Epics module. See __init__.py for more detailed documentation
 __all__ = ['EpicsAttribute']
 
 
+import threading
+
 import numpy
-from taurus.core.units import Quantity
+from taurus.core.units import Quantity, UR
 
 from taurus.core.taurusbasetypes import (TaurusEventType, TaurusAttrValue,
                                          TaurusTimeVal, AttrQuality, DataType,
@@ -73,6 +75,14 @@ class EpicsAttribute(TaurusAttribute):
     """
     A :class:`TaurusAttribute` that gives access to an Epics Process Variable.
 
+    The PV is connected asynchronously: until the connection is established
+    the attribute is "connecting" (see :meth:`isConnecting`) and its value
+    is invalid (`rvalue` is None). The monitor updates received in the CA
+    thread are decoded in a worker of the :class:`EpicsFactory` (the updates
+    arriving meanwhile are coalesced) and the control metadata (type, units,
+    limits...) is only decoded again when it changes, in which case a
+    configuration event is fired.
+
     .. seealso:: :mod:`taurus.core.epics`
 
     .. warning:: In most cases this class should not be instantiated directly.
@@ -86,41 +96,73 @@ class EpicsAttribute(TaurusAttribute):
                           storeCallback=storeCallback)
 
         self._label = self.getSimpleName()
-        self._value = None
+        self._value = self.__connectingValue()
         self.data_format = None
         self.type = None
         self._range = [None, None]
         self._alarm = [None, None]
         self._warning = [None, None]
+        self._units = UR.dimensionless
+
+        self.__connecting = True
+        self.__metadata_key = None
+        self.__metadata_changed = False
+        self.__lock = threading.Lock()
 
+        # the PV is connected in background (see EpicsFactory)
         self.__pv = epics.PV(self.getNormalName(), callback=self.onEpicsEvent,
                              form='ctrl',
                              connection_callback=self.onEpicsConnectionEvent)
-        self.__pv.wait_for_connection()
 
     def getPV(self):
         """Returns the underlying :obj:`epics.PV` object
         """
         return self.__pv
 
+    def isConnecting(self):
+        """Returns True until the first connection to the PV is established
+
+        :return: (bool)
+        """
+        return self.__connecting
+
+    def __connectingValue(self):
+        attr_value = TaurusAttrValue()
+        attr_value.time = TaurusTimeVal.now()
+        attr_value.quality = AttrQuality.ATTR_INVALID
+        return attr_value
+
     def onEpicsEvent(self, **kwargs):
         """callback for PV changes"""
-        # this is called from the ca thread.
-        # TODO: Consider doing the following on a different thread
-        self._value = self.decode(self.__pv)
-        self.fireEvent(TaurusEventType.Change, self._value)
+        # this is called from the ca thread: the PV is decoded in a worker
+        self.factory()._enqueue(self)
 
     def onEpicsConnectionEvent(self, **kwargs):
         """callback for PV connection changes"""
+        # this is called from the ca thread
         if kwargs['conn']:
             self.debug('(re)connected to epics PV')
-            if self._value is not None:
-                self._value.error = None
+            self.__connecting = False
         else:
             self.warning('Connection to epics PV lost')
-            self._value.error = ChannelAccessException('PV "%s" not connected' %
-                                                       kwargs['pvname'])
-        self.fireEvent(TaurusEventType.Change, self._value)
+        # the metadata may change on (re)connection
+        self.__metadata_key = None
+        self.factory()._enqueue(self)
+
+    def _processEvents(self):
+        """decodes the current state of the PV and fires the corresponding
+        events. It is called from a worker of the :class:`EpicsFactory` after
+        (one or more) PV updates"""
+        with self.__lock:
+            value = self.decode(self.__pv)
+            self._value = value
+            config_changed = self.__metadata_changed
+            self.__metadata_changed = False
+        # the events are fired without holding the lock, since the listeners
+        # may call read(cache=False)
+        if config_changed:
+            self.fireEvent(TaurusEventType.Config, value)
+        self.fireEvent(TaurusEventType.Change, value)
 
     # ~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
     # Necessary to overwrite from TaurusAttribute
@@ -141,10 +183,47 @@ class EpicsAttribute(TaurusAttribute):
         """
         attr_value = TaurusAttrValue()
         if not pv.connected:
+            if self.__connecting:
+                return self.__connectingValue()
             attr_value.error = ChannelAccessException('PV "%s" not connected' %
                                                       pv.pvname)
             return attr_value
         v = pv.value
+        # type, data format, units and limits (only if they changed)
+        key = self.__metadataKey(pv)
+        if key != self.__metadata_key:
+            self.__decodeMetadata(pv, v)
+            self.__metadata_key = key
+            self.__metadata_changed = True
+        if self.type in (DataType.Integer, DataType.Float):
+            v = Quantity(v, self._units)
+
+        # rvalue
+        attr_value.rvalue = v
+        # wvalue
+        if pv.write_access:
+            attr_value.wvalue = v
+        # time
+        if pv.timestamp is None:
+            attr_value.time = TaurusTimeVal.now()
+        else:
+            attr_value.time = TaurusTimeVal.fromtimestamp(pv.timestamp)
+        # quality
+        if pv.severity > 0:
+            attr_value.quality = AttrQuality.ATTR_ALARM
+        else:
+            attr_value.quality = AttrQuality.ATTR_VALID
+        return attr_value
+
+    def __metadataKey(self, pv):
+        """returns the PV fields from which the metadata is decoded"""
+        return (pv.ftype, pv.count, pv.write_access, pv.units,
+                pv.lower_ctrl_limit, pv.upper_ctrl_limit,
+                pv.lower_alarm_limit, pv.upper_alarm_limit,
+                pv.lower_warning_limit, pv.upper_warning_limit)
+
+    def __decodeMetadata(self, pv, v):
+        """updates the type, data format, writability, units and limits"""
         # type
         try:
             self.type = Dbr2TaurusType[pv.ftype]
@@ -159,7 +238,7 @@ class EpicsAttribute(TaurusAttribute):
             self.data_format = DataFormat(len(numpy.shape(v)))
         # units and limits support
         if self.type in (DataType.Integer, DataType.Float):
-            v = Quantity(v, pv.units)
+            self._units = Quantity(1, pv.units).units
             self._range = self.__decode_limit(pv.lower_ctrl_limit,
                                               pv.upper_ctrl_limit)
             self._alarm = self.__decode_limit(pv.lower_alarm_limit,
@@ -167,25 +246,8 @@ class EpicsAttribute(TaurusAttribute):
             self._warning = self.__decode_limit(pv.lower_warning_limit,
                                                 pv.upper_warning_limit)
 
-        # rvalue
-        attr_value.rvalue = v
-        # wvalue
-        if pv.write_access:
-            attr_value.wvalue = v
-        # time
-        if pv.timestamp is None:
-            attr_value.time = TaurusTimeVal.now()
-        else:
-            attr_value.time = TaurusTimeVal.fromtimestamp(pv.timestamp)
-        # quality
-        if pv.severity > 0:
-            attr_value.quality = AttrQuality.ATTR_ALARM
-        else:
-            attr_value.quality = AttrQuality.ATTR_VALID
-        return attr_value
-
     def __decode_limit(self, l, h):
-        units = self.__pv.units
+        units = self._units
         if l is None or numpy.isnan(l):
             l = None
         else:
@@ -213,7 +275,8 @@ class EpicsAttribute(TaurusAttribute):
         """
         if not cache:
             self.__pv.get(use_monitor=False)
-            self._value = self.decode(self.__pv)
+            with self.__lock:
+                self._value = self.decode(self.__pv)
         return self._value
 
     def poll(self):
@@ -28,6 +28,7 @@ Epics module. See __init__.py for more detailed documentation
 __all__ = ['EpicsFactory']
 
 
+import threading
 import weakref
 
 try:
@@ -41,6 +42,7 @@ except ImportError:
 from taurus.core.taurusexception import TaurusException
 from taurus.core.util.singleton import Singleton
 from taurus.core.util.log import Logger
+from taurus.core.util.scheduler import Scheduler
 from taurus.core.taurusbasetypes import TaurusElementType
 from taurus.core.taurusfactory import TaurusFactory
 
@@ -52,6 +54,12 @@ from epicsauthority import EpicsAuthority
 class EpicsFactory(Singleton, TaurusFactory, Logger):
     """
     A Singleton class that provides Epics related objects.
+
+    The factory does not wait for the connection of the PVs of the
+    attributes it creates: the connection requests of the attributes
+    created in a row are sent together by a worker thread, which also
+    decodes the PV updates received in the CA thread (coalescing the updates
+    of each PV that arrive before it is decoded).
     """
 
     schemes = ("ca", "epics",)
@@ -78,6 +86,14 @@ class EpicsFactory(Singleton, TaurusFactory, Logger):
             raise Exception('"epics" module is not available')
         self.epics_attrs = weakref.WeakValueDictionary()
         self.epics_devs = weakref.WeakValueDictionary()
+        # the ids of the attributes with PV updates to be decoded
+        self._pending_ids = set()
+        self._flush = False
+        self._lock = threading.Lock()
+        # the PVs are decoded (and the connection requests flushed) in the
+        # scheduler thread, attached to the CA context of the PVs
+        self._scheduler = Scheduler(self.__class__.__name__,
+                                    setup=epics.ca.use_initial_context)
 
     def getAuthority(self, name=None):
         """Obtain the Epics (ca) authority object.
@@ -141,8 +157,43 @@ class EpicsFactory(Singleton, TaurusFactory, Logger):
         if a is None:  # if the full name is not there, create one
             a = EpicsAttribute(fullname, parent=None)  # note: no parent!
             self.epics_attrs[fullname] = a
+            self._requestFlush()
         return a
 
+    def _requestFlush(self):
+        """requests the worker to send the pending connection requests"""
+        with self._lock:
+            if self._flush:
+                return
+            self._flush = True
+        self._scheduler.schedule(0, self._flushIO)
+
+    def _flushIO(self):
+        with self._lock:
+            self._flush = False
+        epics.ca.flush_io()
+
+    def _enqueue(self, attr):
+        """requests the worker to decode the PV of the given attribute (the
+        request is ignored if there is already one pending)
+
+        :param attr: (EpicsAttribute)
+        """
+        with self._lock:
+            if id(attr) in self._pending_ids:
+                return
+            self._pending_ids.add(id(attr))
+        self._scheduler.schedule(0, self._process, attr)
+
+    def _process(self, attr):
+        with self._lock:
+            self._pending_ids.discard(id(attr))
+        try:
+            attr._processEvents()
+        except Exception:
+            self.warning('Error processing the events of %s', attr)
+            self.debug('Details:', exc_info=1)
+
     def getAuthorityNameValidator(self):
         """Return EpicsAuthorityNameValidator"""
         import epicsvalidator
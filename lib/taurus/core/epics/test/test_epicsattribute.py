@@ -27,13 +27,16 @@
 
 import os
 import sys
+import time
+import threading
 import numpy
 import subprocess
 import unittest
 from taurus.core.units import Quantity
 import taurus
 from taurus.test import insertTest, getResourcePath
-from taurus.core.taurusbasetypes import DataType, AttrQuality, DataFormat
+from taurus.core.taurusbasetypes import (DataType, AttrQuality, DataFormat,
+                                         TaurusEventType)
 from taurus.core.taurusbasetypes import TaurusAttrValue
 
 
@@ -79,6 +82,52 @@ class AttributeTestCase(unittest.TestCase):
         else:
             taurus.warning('Process not started, cannot terminate it.')
 
+    def test_connecting(self):
+        """the attribute of an unreachable PV is created without waiting"""
+        t0 = time.time()
+        a = taurus.Attribute('ca:test:unreachable')
+        self.assertTrue(time.time() - t0 < 1)
+        self.assertTrue(a.isConnecting())
+        v = a.read()
+        self.assertIsNone(v.rvalue)
+        self.assertEqual(v.quality, AttrQuality.ATTR_INVALID)
+
+    def test_events(self):
+        """the PV updates are decoded and notified to the listeners"""
+        a = taurus.Attribute('ca:test:a')
+        received = threading.Event()
+        events = []
+
+        def listener(src, evt_type, evt_value):
+            events.append(evt_type)
+            if getattr(evt_value, 'rvalue', None) is not None:
+                received.set()
+        a.addListener(listener)
+        try:
+            self.assertTrue(received.wait(5), 'no value received')
+        finally:
+            a.removeListener(listener)
+        self.assertFalse(a.isConnecting())
+        self.assertEqual(a.getType(), DataType.Float)
+        self.assertIn(TaurusEventType.Change, events)
+
+    def test_readFromListener(self):
+        """the listeners can read the attribute while handling an event"""
+        a = taurus.Attribute('ca:test:a')
+        received = threading.Event()
+        values = []
+
+        def listener(src, evt_type, evt_value):
+            if getattr(evt_value, 'rvalue', None) is not None:
+                values.append(src.read(cache=False))
+                received.set()
+        a.addListener(listener)
+        try:
+            self.assertTrue(received.wait(5), 'no value read (deadlock?)')
+        finally:
+            a.removeListener(listener)
+        self.assertIsNotNone(values[0].rvalue)
+
     def write_read_attr(self, attrname=None, setvalue=None, expected=None,
                         expected_attrv=None, expectedshape=None):
         """check creation and correct write-and-read of an attribute"""
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""
+.. currentmodule:: taurus.core.simulation
+
+Simulation extension for taurus core model.
+
+The simulation extension provides synthetic attributes that are generated in
+process, without any control system. It is meant for load testing and for
+benchmarking the Taurus widgets (and applications) with a controlled amount
+of events: the rate, the size and the content of the values, as well as the
+errors, are set in the model name.
+
+The scheme name is 'sim' ('simulation' also works). The attribute names have
+the form::
+
+    sim:<kind>[/<label>][?<param>=<value>[&<param>=<value>...]]
+
+where `<kind>` is one of "scalar", "spectrum" or "image" and the optional
+`<label>` allows to have several attributes with the same parameters. The
+supported parameters are:
+
+ - rate: events per second (default: 0, i.e., no events. The attribute can
+   still be read or polled)
+ - size: number of points of a spectrum (e.g. 1000) or shape of an image
+   (e.g. 480x640)
+ - amplitude, offset and period: the signal is a sine of the given amplitude
+   and period (in samples), shifted by the given offset
+ - noise: standard deviation of the gaussian noise added to the signal
+ - error: probability of generating an error event instead of a value
+ - seed: the seed of the random generator (default: 0). Attributes with the
+   same parameters generate the same sequence of values and errors.
+
+For example, to get a 1000-points spectrum that changes 50 times per second::
+
+    >>> import taurus
+    >>> a = taurus.Attribute('sim:spectrum?rate=50&size=1000&noise=0.1')
+
+Or to test a form with 100 scalars changing at 10Hz, 1% of them errors::
+
+    $> taurusform `for i in $(seq 100); do \
+       echo "sim:scalar/s$i?rate=10&error=0.01&seed=$i"; done`
+
+All the events are generated from a single thread of the
+:class:`SimulationFactory`. The Authority and Device classes are just
+convenience dummy objects in the simulation scheme.
+"""
+
+from .simfactory import *
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+'''
+Simulation module. See __init__.py for more detailed documentation
+'''
+__all__ = ['SimulationAttribute', 'SimulationError']
+
+
+import threading
+
+import numpy
+
+from taurus.core.units import Quantity
+from taurus.core.taurusbasetypes import (TaurusEventType, TaurusAttrValue,
+                                         TaurusTimeVal, AttrQuality, DataType,
+                                         DataFormat)
+from taurus.core.taurusattribute import TaurusAttribute
+from taurus.core.taurusexception import TaurusException
+from taurus.core.taurushelper import Manager
+
+
+class SimulationError(TaurusException):
+    """The exception used for the simulated errors"""
+    pass
+
+
+def _parseSize(size):
+    return tuple(int(n) for n in size.split('x'))
+
+
+# converters and default values of the simulation parameters
+_PARAMETERS = {'rate': (float, 0.),
+               'size': (_parseSize, None),
+               'amplitude': (float, 1.),
+               'offset': (float, 0.),
+               'period': (float, 100.),
+               'noise': (float, 0.),
+               'error': (float, 0.),
+               'seed': (int, 0),
+               }
+
+_DEFAULT_SIZES = {'scalar': (), 'spectrum': (100,), 'image': (100, 100)}
+
+_FORMATS = {'scalar': DataFormat._0D,
+            'spectrum': DataFormat._1D,
+            'image': DataFormat._2D}
+
+
+def parseParameters(kind, params):
+    """Returns a dictionary with the simulation parameters (with defaults for
+    the missing ones) of the given parameters string (the query of the
+    attribute name, e.g. "rate=10&size=100").
+
+    :param kind: (str) kind of attribute ("scalar", "spectrum" or "image")
+    :param params: (str or None) the parameters string
+
+    :return: (dict)
+
+    :raises: :ValueError: if a parameter is unknown, repeated or invalid
+    """
+    ret = {}
+    for param in filter(None, (params or '').split('&')):
+        key, _, value = param.partition('=')
+        if key not in _PARAMETERS:
+            raise ValueError('Unknown simulation parameter "%s"' % key)
+        if key in ret:
+            raise ValueError('Repeated simulation parameter "%s"' % key)
+        ret[key] = _PARAMETERS[key][0](value)
+    for key, (_, default) in _PARAMETERS.items():
+        ret.setdefault(key, default)
+    if ret['size'] is None or kind == 'scalar':
+        ret['size'] = _DEFAULT_SIZES[kind]
+    if len(ret['size']) != len(_DEFAULT_SIZES[kind]):
+        raise ValueError('Invalid size for %s: %s' % (kind, params))
+    if ret['rate'] < 0 or ret['period'] <= 0 or ret['noise'] < 0 or \
+            not 0 <= ret['error'] <= 1 or min(ret['size'] or (1,)) < 1:
+        raise ValueError('Invalid simulation parameters: %s' % params)
+    return ret
+
+
+class SimulationAttribute(TaurusAttribute):
+    """
+    A :class:`TaurusAttribute` whose values are generated in process: a sine
+    (of the configured amplitude, offset and period) plus gaussian noise. A
+    spectrum is a sine wave that moves one point per value and an image is
+    the product of two such waves.
+
+    The values (and the errors) are a function of the parameters and of the
+    number of values generated so far, so attributes with the same parameters
+    generate the same sequences.
+
+    While the attribute has listeners and its rate is not 0, the
+    :class:`SimulationFactory` generates a value (and fires a change event,
+    or an error event) at the given rate.
+
+    .. seealso:: :mod:`taurus.core.simulation`
+
+    .. warning:: In most cases this class should not be instantiated directly.
+                 Instead it should be done via the
+                 :meth:`SimulationFactory.getAttribute`
+    """
+
+    def __init__(self, name, parent, storeCallback=None):
+        self.call__init__(TaurusAttribute, name, parent,
+                          storeCallback=storeCallback)
+
+        v = self.getNameValidator()
+        groups = v.getUriGroups(name)
+        self._kind = groups['kind']
+        self._label = groups['label'] or self._kind
+        self._params = parseParameters(self._kind, groups['params'])
+
+        self.writable = False
+        self.type = DataType.Float
+        self.data_format = _FORMATS[self._kind]
+        amplitude, offset = self._params['amplitude'], self._params['offset']
+        self._range = [Quantity(offset - amplitude),
+                       Quantity(offset + amplitude)]
+
+        self._value = None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._random = numpy.random.RandomState(self._params['seed'])
+        k = 2 * numpy.pi / self._params['period']
+        self._phases = [k * numpy.arange(n) for n in self._params['size']]
+        self._k = k
+
+    def getParameters(self):
+        """Returns a dictionary with the simulation parameters"""
+        return dict(self._params)
+
+    def getRate(self):
+        """Returns the rate (in events per second) of the attribute"""
+        return self._params['rate']
+
+    def getCount(self):
+        """Returns the number of values (and errors) generated so far"""
+        return self._count
+
+    def _generate(self):
+        """Generates the next value. Returns a TaurusAttrValue, or a
+        SimulationError if an error is injected"""
+        p = self._params
+        with self._lock:
+            n = self._count
+            self._count += 1
+            if p['error'] and self._random.random_sample() < p['error']:
+                return SimulationError('Simulated error #%d in %s' %
+                                       (n, self.getFullName()))
+            shift = self._k * n
+            if self._kind == 'scalar':
+                value = numpy.sin(shift)
+            elif self._kind == 'spectrum':
+                value = numpy.sin(self._phases[0] + shift)
+            else:
+                y, x = self._phases
+                value = numpy.outer(numpy.cos(y), numpy.sin(x + shift))
+            value = p['offset'] + p['amplitude'] * value
+            if p['noise']:
+                value = value + self._random.normal(0, p['noise'],
+                                                    p['size'] or None)
+        attr_value = TaurusAttrValue()
+        attr_value.rvalue = Quantity(value)
+        attr_value.time = TaurusTimeVal.now()
+        attr_value.quality = AttrQuality.ATTR_VALID
+        return attr_value
+
+    def _tick(self):
+        """Generates a new value and fires the corresponding event.
+        It is called by the :class:`SimulationFactory` at the attribute rate
+        """
+        value = self._generate()
+        if isinstance(value, SimulationError):
+            self.fireEvent(TaurusEventType.Error, value)
+        else:
+            self._value = value
+            self.fireEvent(TaurusEventType.Change, value)
+
+    def __fireRegisterEvent(self, listener):
+        # fire a first change event
+        try:
+            v = self.read()
+            self.fireEvent(TaurusEventType.Change, v, listener)
+        except Exception as e:
+            self.fireEvent(TaurusEventType.Error, e, listener)
+
+    def addListener(self, listener):
+        """ Add a TaurusListener object in the listeners list.
+            If it is the first listener, it schedules the generation of
+            events. A first change event is sent to the new listener.
+            If the listener is already registered nothing happens."""
+        ret = TaurusAttribute.addListener(self, listener)
+        if not ret:
+            return ret
+        if len(self._listeners) == 1:
+            self._subscribeEvents()
+        Manager().addJob(self.__fireRegisterEvent, None, (listener,))
+        return ret
+
+    def removeListener(self, listener):
+        """ Remove a TaurusListener from the listeners list. If it is the
+            last listener, the generation of events is stopped.
+            If the listener is not registered nothing happens."""
+        ret = TaurusAttribute.removeListener(self, listener)
+        if ret and not self.hasListeners():
+            self._deactivatePolling()
+            self._unsubscribeEvents()
+        return ret
+
+    # ~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
+    # Necessary to overwrite from TaurusAttribute
+    # ~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
+
+    def encode(self, value):
+        return value
+
+    def decode(self, attr_value):
+        return attr_value
+
+    def write(self, value, with_read=True):
+        raise TaurusException('Simulated attributes are read-only')
+
+    def read(self, cache=True):
+        """returns the value of the attribute.
+
+        :param cache: (bool) If True (default), the last generated value will
+                      be returned. If False, a new value is generated
+
+        :return: attribute value
+
+        :raises: :SimulationError: if an error is injected
+        """
+        if not cache or self._value is None:
+            value = self._generate()
+            if isinstance(value, SimulationError):
+                raise value
+            self._value = value
+        return self._value
+
+    def poll(self):
+        try:
+            v = self.read(cache=False)
+        except SimulationError as e:
+            self.fireEvent(TaurusEventType.Error, e)
+        else:
+            self.fireEvent(TaurusEventType.Periodic, v)
+
+    def isUsingEvents(self):
+        return self.getRate() > 0
+
+    def _subscribeEvents(self):
+        if self.getRate() > 0:
+            self.factory().schedule(self)
+
+    def _unsubscribeEvents(self):
+        self.factory().unschedule(self)
+
+    def factory(self):
+        from .simfactory import SimulationFactory
+        return SimulationFactory()
+
+    @classmethod
+    def getNameValidator(cls):
+        from .simvalidator import SimulationAttributeNameValidator
+        return SimulationAttributeNameValidator()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+'''
+Simulation module. See __init__.py for more detailed documentation
+'''
+__all__ = ['SimulationFactory']
+
+
+import threading
+import time
+import weakref
+
+from taurus.core.taurusexception import TaurusException
+from taurus.core.util.singleton import Singleton
+from taurus.core.util.log import Logger
+from taurus.core.util.scheduler import Scheduler
+from taurus.core.taurusbasetypes import TaurusElementType
+from taurus.core.taurusfactory import TaurusFactory
+
+from .simattribute import SimulationAttribute
+from .simdevice import SimulationDevice
+from .simauthority import SimulationAuthority
+
+
+class SimulationFactory(Singleton, TaurusFactory, Logger):
+    """
+    A Singleton class that provides Simulation related objects.
+
+    The factory also generates the events of the simulated attributes: a
+    single thread calls each scheduled attribute at its rate. If the rates
+    cannot be sustained and the events get more than :attr:`MaxLag` seconds
+    late, the pending ones are dropped (i.e., the attributes are rescheduled
+    from the current time).
+    """
+
+    schemes = ("sim", "simulation",)
+    DEFAULT_DEVICE = 'sim:/'
+    DEFAULT_AUTHORITY = 'sim://'
+    caseSensitive = True
+    elementTypesMap = {TaurusElementType.Authority: SimulationAuthority,
+                       TaurusElementType.Device: SimulationDevice,
+                       TaurusElementType.Attribute: SimulationAttribute
+                       }
+
+    #: maximum delay (in seconds) of the scheduled events
+    MaxLag = 1.
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization."""
+        name = self.__class__.__name__
+        self.call__init__(Logger, name)
+        self.call__init__(TaurusFactory)
+        self.sim_attrs = weakref.WeakValueDictionary()
+        self.sim_devs = weakref.WeakValueDictionary()
+        # the scheduled call of each attribute generating events
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._scheduler = Scheduler(name)
+
+    def getAuthority(self, name=None):
+        """Obtain the Simulation authority object.
+
+        :param name: (str) only a dummy authority ("sim://") is supported
+
+        :return: (SimulationAuthority)
+        """
+        if name is None:
+            name = 'sim://'
+
+        v = self.getAuthorityNameValidator()
+        if not v.isValid(name):
+            raise TaurusException("Invalid sim authority name %s" % name)
+
+        if not hasattr(self, "_auth"):
+            self._auth = SimulationAuthority(self.DEFAULT_AUTHORITY)
+        return self._auth
+
+    def getDevice(self, dev_name):
+        """Obtain the SimulationDevice object.
+
+        :param dev_name: (str) only one dummy device ("") is supported
+
+        :return: (SimulationDevice)
+        """
+        validator = self.getDeviceNameValidator()
+        names = validator.getNames(dev_name)
+        if names is None:
+            raise TaurusException("Invalid sim device name %s" % dev_name)
+        fullname = names[0]
+        d = self.sim_devs.get(fullname, None)
+        if d is None:  # if the full name is not there, create one
+            d = SimulationDevice(fullname, parent=self.getAuthority())
+            self.sim_devs[fullname] = d
+        return d
+
+    def getAttribute(self, attr_name):
+        """Obtain the object corresponding to the given attribute name. If the
+        corresponding attribute already exists, the existing instance is
+        returned. Otherwise a new instance is stored and returned.
+
+        :param attr_name: (str) the attribute name string. See
+                          :mod:`taurus.core.simulation` for valid attribute
+                          names
+
+        :return: (SimulationAttribute)
+
+        :raises: :TaurusException: if the given name is invalid.
+        """
+        validator = self.getAttributeNameValidator()
+        names = validator.getNames(attr_name)
+        if names is None:
+            raise TaurusException(
+                "Invalid sim attribute name %s" % attr_name)
+        fullname = names[0]
+        a = self.sim_attrs.get(fullname, None)
+        if a is None:  # if the full name is not there, create one
+            dev = self.getDevice(self.DEFAULT_DEVICE)
+            try:
+                a = SimulationAttribute(fullname, parent=dev)
+            except ValueError as e:
+                raise TaurusException(str(e))
+            self.sim_attrs[fullname] = a
+        return a
+
+    def schedule(self, attr):
+        """Starts generating events of the given attribute at its rate
+
+        :param attr: (SimulationAttribute)
+        """
+        with self._lock:
+            if id(attr) in self._calls:
+                return
+            t = time.time() + 1. / attr.getRate()
+            self._calls[id(attr)] = self._scheduler.schedule(
+                t, self._generate, attr, t)
+
+    def unschedule(self, attr):
+        """Stops generating events of the given attribute
+
+        :param attr: (SimulationAttribute)
+        """
+        with self._lock:
+            call = self._calls.pop(id(attr), None)
+            if call is not None:
+                self._scheduler.cancel(call)
+
+    def _generate(self, attr, t):
+        """reschedules the given attribute and generates its events (it is
+        called from the scheduler thread at the time t)"""
+        now = time.time()
+        with self._lock:
+            if id(attr) not in self._calls:
+                return
+            t += 1. / attr.getRate()
+            if t < now - self.MaxLag:
+                t = now
+            self._calls[id(attr)] = self._scheduler.schedule(
+                t, self._generate, attr, t)
+        try:
+            attr._tick()
+        except Exception:
+            self.warning('Error generating the events of %s',
+                         attr.getFullName())
+            self.debug('Details:', exc_info=1)
+
+    def getAuthorityNameValidator(self):
+        """Return SimulationAuthorityNameValidator"""
+        from . import simvalidator
+        return simvalidator.SimulationAuthorityNameValidator()
+
+    def getDeviceNameValidator(self):
+        """Return SimulationDeviceNameValidator"""
+        from . import simvalidator
+        return simvalidator.SimulationDeviceNameValidator()
+
+    def getAttributeNameValidator(self):
+        """Return SimulationAttributeNameValidator"""
+        from . import simvalidator
+        return simvalidator.SimulationAttributeNameValidator()
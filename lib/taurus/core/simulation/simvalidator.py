@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""
+Simulation module. See __init__.py for more detailed documentation
+"""
+__all__ = ['SimulationAuthorityNameValidator',
+           'SimulationDeviceNameValidator',
+           'SimulationAttributeNameValidator']
+
+from taurus.core.taurusvalidator import (TaurusAttributeNameValidator,
+                                         TaurusDeviceNameValidator,
+                                         TaurusAuthorityNameValidator)
+
+#: kinds of simulated attributes
+KINDS = ('scalar', 'spectrum', 'image')
+
+#: parameters accepted in the query of the simulated attribute names
+PARAMETERS = ('rate', 'size', 'amplitude', 'offset', 'period', 'noise',
+              'error', 'seed')
+
+_PARAM = r'(%s)=[^&#= ]+' % '|'.join(PARAMETERS)
+
+
+class SimulationAuthorityNameValidator(TaurusAuthorityNameValidator):
+    """Validator for Simulation authority names. For now, the only supported
+    authority is "//":
+    """
+    scheme = '(sim|simulation)'
+    authority = '//'
+    path = '(?!)'
+    query = '(?!)'
+    fragment = '(?!)'
+
+    def getNames(self, fullname, factory=None):
+        if self.isValid(fullname):
+            return 'sim://', '//', ''
+        return None
+
+
+class SimulationDeviceNameValidator(TaurusDeviceNameValidator):
+    """Validator for Simulation device names. Apart from the standard named
+    groups (scheme, authority, path, query and fragment), the following named
+    groups are created:
+
+     - devname: device name (only empty string allowed for now)
+
+    Note: brackets on the group name indicate that this group will only contain
+    a string if the URI contains it.
+    """
+
+    scheme = '(sim|simulation)'
+    authority = SimulationAuthorityNameValidator.authority
+    path = r'/(?P<devname>)'  # (only empty string allowed for now)
+    query = '(?!)'
+    fragment = '(?!)'
+
+    def getNames(self, fullname, factory=None):
+        if self.isValid(fullname):
+            return 'sim:/', '', ''
+        return None
+
+
+class SimulationAttributeNameValidator(TaurusAttributeNameValidator):
+    """Validator for Simulation attribute names. Apart from the standard named
+    groups (scheme, authority, path, query and fragment), the following named
+    groups are created:
+
+     - attrname: attribute name (kind and label).
+     - kind: the kind of attribute ("scalar", "spectrum" or "image")
+     - [label]: an arbitrary label for the attribute
+     - [params]: the parameters of the simulation (the query)
+
+    Note: brackets on the group name indicate that this group will only contain
+    a value if the URI contains it.
+    """
+    scheme = '(sim|simulation)'
+    authority = SimulationAuthorityNameValidator.authority
+    path = (r'(?P<attrname>(?P<kind>%s)(/(?P<label>[a-zA-Z0-9_\-\.]+))?)'
+            % '|'.join(KINDS))
+    query = r'(?P<params>%s(&%s)*)' % (_PARAM, _PARAM)
+    fragment = '[^# ]*'
+
+    def getNames(self, fullname, factory=None, fragment=False):
+        """reimplemented from :class:`TaurusAttributeNameValidator`.
+        The parameters are sorted in the normal and complete names, so that
+        they do not depend on the order used in the given name"""
+
+        groups = self.getUriGroups(fullname)
+        if groups is None:
+            return None
+
+        normal = groups['attrname']
+        params = groups['params']
+        if params is not None:
+            normal += '?' + '&'.join(sorted(params.split('&')))
+        complete = 'sim:%s' % normal
+        # the short name must identify the attribute within its (dummy)
+        # device (e.g. for polling), so the parameters are kept in it
+        short = normal
+
+        # return fragment if requested
+        if fragment:
+            key = groups.get('fragment', None)
+            return complete, normal, short, key
+        return complete, normal, short
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.simulation.test.test_simattribute..."""
+
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import time
+
+import numpy
+import unittest
+
+import taurus
+from taurus.core import DataFormat, DataType, TaurusEventType
+from taurus.core.taurusexception import TaurusException
+from taurus.core.simulation.simattribute import (SimulationAttribute,
+                                                 SimulationError,
+                                                 parseParameters)
+from taurus.test import insertTest
+
+
+class _Listener(object):
+    """collects the events received (from any thread)"""
+
+    def __init__(self):
+        self.events = []
+        self.changed = threading.Event()
+
+    def eventReceived(self, src, evt_type, evt_value):
+        self.events.append((evt_type, evt_value))
+        self.changed.set()
+
+    def count(self, evt_type):
+        return len([e for e in self.events if e[0] == evt_type])
+
+
+@insertTest(helper_name='read', name='sim:scalar', shape=(),
+            data_format=DataFormat._0D)
+@insertTest(helper_name='read', name='sim:spectrum?size=7', shape=(7,),
+            data_format=DataFormat._1D)
+@insertTest(helper_name='read', name='sim:image', shape=(100, 100),
+            data_format=DataFormat._2D)
+@insertTest(helper_name='read', name='sim:image?size=3x5', shape=(3, 5),
+            data_format=DataFormat._2D)
+@insertTest(helper_name='invalidParameters', kind='scalar',
+            params='rate=fast')
+@insertTest(helper_name='invalidParameters', kind='scalar',
+            params='rate=1&rate=2')
+@insertTest(helper_name='invalidParameters', kind='scalar', params='rate=-1')
+@insertTest(helper_name='invalidParameters', kind='scalar', params='error=2')
+@insertTest(helper_name='invalidParameters', kind='spectrum',
+            params='size=3x3')
+@insertTest(helper_name='invalidParameters', kind='image', params='size=0x3')
+@insertTest(helper_name='invalidParameters', kind='image', params='foo=1')
+class SimulationAttributeTestCase(unittest.TestCase):
+
+    def read(self, name=None, shape=None, data_format=None):
+        a = taurus.Attribute(name)
+        self.assertIsInstance(a, SimulationAttribute)
+        self.assertEqual(a.getType(), DataType.Float)
+        self.assertEqual(a.getDataFormat(), data_format)
+        self.assertFalse(a.isWritable())
+        v = a.read()
+        self.assertEqual(numpy.shape(v.rvalue.magnitude), shape)
+        self.assertIs(a.read(), v)
+        self.assertIsNot(a.read(cache=False), v)
+
+    def invalidParameters(self, kind=None, params=None):
+        self.assertRaises(ValueError, parseParameters, kind, params)
+        name = 'sim:%s/invalid?%s' % (kind, params)
+        self.assertRaises(TaurusException, taurus.Attribute, name)
+
+    def test_parameters(self):
+        a = taurus.Attribute('sim:spectrum/params?size=10&rate=5&noise=.5')
+        p = a.getParameters()
+        self.assertEqual(p['size'], (10,))
+        self.assertEqual(p['rate'], 5)
+        self.assertEqual(p['noise'], .5)
+        self.assertEqual(p['amplitude'], 1)
+        self.assertEqual(p['seed'], 0)
+        self.assertIs(taurus.Attribute(
+            'simulation:spectrum/params?noise=.5&rate=5&size=10'), a)
+        self.assertEqual(a.getLabel(), 'params')
+        self.assertEqual(taurus.Attribute('sim:image').getLabel(), 'image')
+
+    def test_signal(self):
+        """the values without noise are a sine of the given parameters"""
+        a = taurus.Attribute('sim:scalar/signal?amplitude=2&offset=1&period=4')
+        values = [a.read(cache=False).rvalue.magnitude for _ in range(5)]
+        numpy.testing.assert_allclose(values, [1, 3, 1, -1, 1], atol=1e-12)
+        self.assertEqual(a.getCount(), 5)
+
+    def test_deterministic(self):
+        """attributes with the same parameters generate the same values and
+        errors"""
+        sequences = []
+        for label in ('a', 'b'):
+            a = taurus.Attribute('sim:spectrum/%s?noise=1&error=.3&seed=5'
+                                 % label)
+            seq = []
+            for _ in range(20):
+                try:
+                    seq.append(a.read(cache=False).rvalue.magnitude)
+                except SimulationError:
+                    seq.append(None)
+            sequences.append(seq)
+        a, b = sequences
+        self.assertEqual([v is None for v in a], [v is None for v in b])
+        self.assertIn(None, a)
+        for v, w in zip(a, b):
+            if v is not None:
+                numpy.testing.assert_array_equal(v, w)
+        c = taurus.Attribute('sim:spectrum/c?noise=1&seed=6')
+        self.assertFalse(numpy.array_equal(
+            c.read(cache=False).rvalue.magnitude, a[0]))
+
+    def test_write(self):
+        a = taurus.Attribute('sim:scalar')
+        self.assertRaises(TaurusException, a.write, 1)
+
+    def test_events(self):
+        """events are generated at the given rate while there are
+        listeners"""
+        a = taurus.Attribute('sim:scalar/events?rate=50')
+        self.assertTrue(a.isUsingEvents())
+        listener = _Listener()
+        a.addListener(listener)
+        try:
+            time.sleep(1)
+        finally:
+            a.removeListener(listener)
+        n = listener.count(TaurusEventType.Change)
+        # the rate is approximate (and the first event is an extra one)
+        self.assertTrue(35 <= n <= 55, '%d events received' % n)
+        time.sleep(.1)
+        self.assertEqual(len(listener.events), n)
+
+    def test_errors(self):
+        """errors are injected with the given probability"""
+        a = taurus.Attribute('sim:scalar/errors?rate=200&error=0.5&seed=1')
+        listener = _Listener()
+        a.addListener(listener)
+        try:
+            time.sleep(.5)
+        finally:
+            a.removeListener(listener)
+        errors = listener.count(TaurusEventType.Error)
+        self.assertTrue(errors > 10, '%d errors received' % errors)
+        self.assertTrue(listener.count(TaurusEventType.Change) > 10)
+        for evt_type, evt_value in listener.events:
+            if evt_type == TaurusEventType.Error:
+                self.assertIsInstance(evt_value, SimulationError)
+
+    def test_noRate(self):
+        """without a rate only the first event is received"""
+        a = taurus.Attribute('sim:scalar/norate')
+        self.assertFalse(a.isUsingEvents())
+        listener = _Listener()
+        a.addListener(listener)
+        try:
+            self.assertTrue(listener.changed.wait(1))
+            time.sleep(.1)
+        finally:
+            a.removeListener(listener)
+        self.assertEqual(len(listener.events), 1)
+        self.assertEqual(listener.events[0][0], TaurusEventType.Change)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.simulation.test.test_simvalidator..."""
+
+
+__docformat__ = 'restructuredtext'
+
+import unittest
+from taurus.core.test import (valid, invalid, names,
+                              AbstractNameValidatorTestCase)
+from taurus.core.simulation.simvalidator import (
+    SimulationAuthorityNameValidator,
+    SimulationDeviceNameValidator,
+    SimulationAttributeNameValidator)
+
+
+# ==============================================================================
+# Tests for Simulation Authority  name validation
+# ==============================================================================
+@valid(name='sim://', groups=dict(authority='//'))
+@names(name='sim://', out=('sim://', '//', ''))
+@names(name='simulation://', out=('sim://', '//', ''))
+@invalid(name='sim:')
+@invalid(name='sim:/')
+@invalid(name='sim:///')
+@invalid(name='sim://a')
+class SimulationAuthValidatorTestCase(AbstractNameValidatorTestCase,
+                                      unittest.TestCase):
+    validator = SimulationAuthorityNameValidator
+
+
+# ==============================================================================
+# Tests for Simulation Device name validation
+# ==============================================================================
+@valid(name='sim:/', groups=dict(authority=None, devname='', path='/'))
+@valid(name='sim:///', groups=dict(authority='//', devname='', path='/'))
+@names(name='simulation:/', out=('sim:/', '', ''))
+@invalid(name='sim:')
+@invalid(name='sim://')
+@invalid(name='sim:/foo')
+class SimulationDevValidatorTestCase(AbstractNameValidatorTestCase,
+                                     unittest.TestCase):
+    validator = SimulationDeviceNameValidator
+
+
+# ==============================================================================
+# Tests for Simulation Attribute name validation
+# ==============================================================================
+@valid(name='sim:scalar',
+       groups={'scheme': 'sim',
+               'authority': None,
+               'attrname': 'scalar',
+               'kind': 'scalar',
+               'label': None,
+               'params': None,
+               'fragment': None})
+@valid(name='sim:image/cam-1?rate=10&size=480x640#shape',
+       groups={'attrname': 'image/cam-1',
+               'kind': 'image',
+               'label': 'cam-1',
+               'params': 'rate=10&size=480x640',
+               'fragment': 'shape'})
+@valid(name='simulation:spectrum?noise=0.5')
+@invalid(name='sim:')
+@invalid(name='sim:vector')
+@invalid(name='sim:scalar/')
+@invalid(name='sim:scalar/a/b')
+@invalid(name='sim:scalar?')
+@invalid(name='sim:scalar?foo=1')
+@invalid(name='sim:scalar?rate=')
+@invalid(name='sim:scalar?rate=1&')
+@names(name='sim:scalar', out=('sim:scalar', 'scalar', 'scalar'))
+@names(name='simulation:spectrum/a?size=10&rate=5',
+       out=('sim:spectrum/a?rate=5&size=10', 'spectrum/a?rate=5&size=10',
+            'spectrum/a?rate=5&size=10'))
+@names(name='sim:image?seed=1&error=0.1#label',
+       out=('sim:image?error=0.1&seed=1', 'image?error=0.1&seed=1',
+            'image?error=0.1&seed=1'))
+class SimulationAttrValidatorTestCase(AbstractNameValidatorTestCase,
+                                      unittest.TestCase):
+    validator = SimulationAttributeNameValidator
@@ -56,11 +56,13 @@ from taurus.core.util.event import _BoundMethodWeakrefWithCall
 # -------------------------------------------------------------------------
 from taurus.core.util.log import (debug, taurus4_deprecation,
                                   deprecation_decorator)
+from taurus.core.util.metrics import MetricsRegistry
 
 from taurus.core.tango.enums import (EVENT_TO_POLLING_EXCEPTIONS,
                                      FROM_TANGO_TO_NUMPY_TYPE,
                                      DevState)
 
+from .util.attrinfocache import AttributeInfoCache, encodeAttributeInfoEx
 from .util.tango_taurus import (description_from_tango,
                                 display_level_from_tango,
                                 quality_from_tango,
@@ -69,6 +71,9 @@ from .util.tango_taurus import (description_from_tango,
                                 str_2_obj, data_format_from_tango,
                                 data_type_from_tango)
 
+_metrics = MetricsRegistry()
+_attrInfoCache = AttributeInfoCache()
+
 
 class TangoAttrValue(TaurusAttrValue):
     """A TaurusAttrValue specialization to decode PyTango.DeviceAttribute
@@ -276,12 +281,18 @@ class TangoAttribute(TaurusAttribute):
 
         attr_info = None
         if parent:
-            attr_name = self.getSimpleName()
-            try:
-                attr_info = parent.attribute_query(attr_name)
-            except (AttributeError, PyTango.DevFailed):
-                # if PyTango could not connect to the dev
-                attr_info = None
+            # the cached configuration (if any) is refreshed asynchronously
+            attr_info = _attrInfoCache.get(self.getFullName())
+            from_cache = attr_info is not None
+            if not from_cache:
+                attr_name = self.getSimpleName()
+                try:
+                    attr_info = parent.attribute_query(attr_name)
+                except (AttributeError, PyTango.DevFailed):
+                    # if PyTango could not connect to the dev
+                    attr_info = None
+        else:
+            from_cache = False
 
         # Set default values in case the attrinfoex is None
         self.writable = False
@@ -296,7 +307,12 @@ class TangoAttribute(TaurusAttribute):
         # subscribe to configuration events (unsubscription done at cleanup)
         self.__cfg_evt_id = None
         if self.factory().is_tango_subscribe_enabled():
-            self._subscribeConfEvents()
+            if from_cache:
+                Manager().addJob(self.__subscribeCachedConfEvents)
+            else:
+                self._subscribeConfEvents()
+        elif from_cache:
+            Manager().addJob(self._refreshAttrInfoEx)
 
     def __del__(self):
         self.cleanUp()
@@ -741,6 +757,29 @@ class TangoAttribute(TaurusAttribute):
                 self.debug("Error getting attribute configuration")
                 self.traceback()
                 
+    def __subscribeCachedConfEvents(self):
+        # (unless the attribute was cleaned up meanwhile)
+        if self._pytango_attrinfoex is not None:
+            self._subscribeConfEvents()
+
+    def _refreshAttrInfoEx(self):
+        """Queries the configuration of the attribute (e.g. to refresh the one
+        taken from the :class:`AttributeInfoCache`) and notifies the listeners
+        if it changed"""
+        dev = self.getParentObj()
+        if dev is None or self._pytango_attrinfoex is None:
+            return
+        try:
+            attrinfoex = dev.attribute_query(self.getSimpleName())
+        except (AttributeError, PyTango.DevFailed) as e:
+            self.debug("Error getting attribute configuration: %s", e)
+            return
+        if (encodeAttributeInfoEx(attrinfoex) ==
+                encodeAttributeInfoEx(self._pytango_attrinfoex)):
+            return
+        self._decodeAttrInfoEx(attrinfoex)
+        self.fireEvent(TaurusEventType.Config, self.__attr_value)
+
     def _unsubscribeConfEvents(self):
         # Careful in this method: This is intended to be executed in the cleanUp
         # so we should not access external objects from the factory, like the
@@ -770,6 +809,8 @@ class TangoAttribute(TaurusAttribute):
         It propagates the event to listeners and delegates other tasks to
         specific handlers for different event types.
         """
+        if _metrics.enabled:
+            _metrics.count('tango_events', self.getFullName())
         with self.__read_lock:
             # if it is a configuration event
             if isinstance(event, PyTango.AttrConfEventData):
@@ -814,6 +855,8 @@ class TangoAttribute(TaurusAttribute):
             if (self.__attr_value is not None
                 and filter_old_event
                 and time < self.__attr_value.time.totime()):
+                if _metrics.enabled:
+                    _metrics.count('dropped_events', self.getFullName())
                 return [None, None]
 
             self.__attr_value = attr_value
@@ -983,6 +1026,7 @@ class TangoAttribute(TaurusAttribute):
             return
 
         self._pytango_attrinfoex = i = pytango_attrinfoex
+        _attrInfoCache.put(self.getFullName(), i)
 
         self.writable = i.writable != PyTango.AttrWriteType.READ
         self._label = i.label
@@ -33,6 +33,7 @@ __docformat__ = "restructuredtext"
 
 import os
 import operator
+import threading
 import weakref
 
 from PyTango import (Database, DeviceProxy, DevFailed, ApiUtil)
@@ -40,11 +41,15 @@ from taurus import Device
 from taurus.core.taurusbasetypes import TaurusDevState, TaurusEventType
 from taurus.core.taurusauthority import TaurusAuthority
 from taurus.core.util.containers import CaselessDict
-from taurus.core.util.log import taurus4_deprecation
+from taurus.core.util.log import debug, taurus4_deprecation
+from taurus.core.util.threadpool import ThreadPool
+from .util.attrinfocache import AttributeInfoCache
 
 
 InvalidAlias = "nada"
 
+_attrInfoCache = AttributeInfoCache()
+
 
 class TangoInfo(object):
 
@@ -110,13 +115,15 @@ class TangoDevClassInfo(TangoInfo):
 class TangoDevInfo(TangoInfo):
 
     def __init__(self, container, name=None, full_name=None, alias=None,
-                 server=None, klass=None, exported=False, host=None):
+                 server=None, klass=None, exported=False, host=None,
+                 started=None):
         super(TangoDevInfo, self).__init__(container, name=name,
                                            full_name=full_name)
         self._alias = alias
         self._server = weakref.ref(server)
         self._klass = weakref.ref(klass)
         self._exported = bool(int(exported))
+        self._started = started or None
         self._alive = None
         self._state = None
         self._host = host
@@ -146,6 +153,11 @@ class TangoDevInfo(TangoInfo):
     def exported(self):
         return self._exported
 
+    def started(self):
+        """Returns the time in which the device was last exported, as given
+        by the Tango database (or None if unknown)"""
+        return self._started
+
     def alive(self):
         if self._alive is None:
             if self._alivePending:
@@ -188,6 +200,21 @@ class TangoDevInfo(TangoInfo):
                 return a
         return None
 
+    def requestAttributes(self, callback=None):
+        """Returns the attributes of the device if they are already known.
+        Otherwise, returns None and obtains them in the background (see
+        :meth:`TangoDatabaseCache.refreshAttributesAsync`)
+
+        :param callback: (callable) called with the list of attributes
+                         (from a worker thread) when they are obtained
+
+        :return: (list<TangoAttrInfo> or None)
+        """
+        if self._attributes:
+            return self._attributes
+        self.container().refreshAttributesAsync(self, callback)
+        return None
+
     def setAttributes(self, attributes):
         self._attributes = attributes
 
@@ -209,10 +236,20 @@ class TangoDevInfo(TangoInfo):
     def refreshAttributes(self):
         attrs = []
         try:
-            dev = self.getDeviceProxy()
-            if dev is None:
-                raise DevFailed()  # @todo: check if this is the right exception to throw
-            attr_info_list = dev.attribute_list_query_ex()
+            # the attributes cached since the last export are still valid
+            started = self.started()
+            attr_info_list = None
+            if started is not None:
+                attr_info_list = _attrInfoCache.getAttributeList(
+                    self.fullName(), started)
+            if attr_info_list is None:
+                dev = self.getDeviceProxy()
+                if dev is None:
+                    raise DevFailed()  # @todo: check if this is the right exception to throw
+                attr_info_list = dev.attribute_list_query_ex()
+                if started is not None:
+                    _attrInfoCache.putAttributeList(self.fullName(), started,
+                                                    attr_info_list)
             for attr_info in attr_info_list:
                 full_name = "%s/%s" % (self.fullName(), attr_info.name)
                 attr_obj = TangoAttrInfo(self.container(),
@@ -297,8 +334,15 @@ class TangoServInfo(TangoInfo):
 
 class TangoDatabaseCache(object):
 
+    #: number of threads obtaining the attributes of the devices in the
+    #: background (see :meth:`refreshAttributesAsync`)
+    AttributeWorkers = 8
+
     def __init__(self, db):
         self._db = weakref.ref(db)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pendingAttributes = {}
         self._device_tree = None
         self._server_tree = None
         self._servers = None
@@ -320,8 +364,8 @@ class TangoDatabaseCache(object):
         db_dev_name = '/'.join((db.getFullName(), db.dev_name()))
         if hasattr(Device(db_dev_name), 'DbMySqlSelect'):
             # optimization in case the db exposes a MySQL select API
-            query = ("SELECT name, alias, exported, host, server, class " +
-                     "FROM device")
+            query = ("SELECT name, alias, exported, host, server, class, " +
+                     "started FROM device")
             r = db.command_inout("DbMySqlSelect", query)
             row_nb, column_nb = r[0][-2:]
             data = r[1]
@@ -341,14 +385,17 @@ class TangoDatabaseCache(object):
                 klass = db.get_class_for_device(d)
                 alias = all_alias.get(d, '')
                 exported = str(int(d in all_exported))
-                data.extend((name, alias, exported, host, server, klass))
-            column_nb = 6  # len ((name, alias, exported, host, server, klass))
+                data.extend((name, alias, exported, host, server, klass,
+                             started))
+            # len ((name, alias, exported, host, server, klass, started))
+            column_nb = 7
 
         CD = CaselessDict
         dev_dict, serv_dict, klass_dict, alias_dict = CD(), {}, {}, CD()
 
         for i in xrange(0, len(data), column_nb):
-            name, alias, exported, host, server, klass = data[i:i + column_nb]
+            (name, alias, exported, host, server, klass,
+             started) = data[i:i + column_nb]
             if name.count("/") != 2:
                 continue  # invalid/corrupted entry: just ignore it
             if server.count("/") != 1:
@@ -368,7 +415,8 @@ class TangoDatabaseCache(object):
             full_name = "%s/%s" % (db.getFullName(), name)
             dev_dict[name] = di = TangoDevInfo(self, name=name, full_name=full_name,
                                                alias=alias, server=si, klass=dc,
-                                               exported=exported, host=host)
+                                               exported=exported, host=host,
+                                               started=started)
 
             si.addDevice(di)
             dc.addDevice(di)
@@ -406,6 +454,46 @@ class TangoDatabaseCache(object):
             pass
         device.setAttributes(attrs)
 
+    def refreshAttributesAsync(self, device, callback=None):
+        """Refreshes the attributes of the given device in a pool of worker
+        threads, so that the attributes of many devices are obtained in
+        parallel. The requests for a device which is already being refreshed
+        are merged.
+
+        :param device: (TangoDevInfo) the device
+        :param callback: (callable) called with the list of attributes
+                         (from a worker thread) when they are obtained
+        """
+        name = device.name()
+        with self._lock:
+            callbacks = self._pendingAttributes.get(name)
+            pending = callbacks is not None
+            if not pending:
+                self._pendingAttributes[name] = callbacks = []
+            if callback is not None:
+                callbacks.append(callback)
+            if self._pool is None:
+                self._pool = ThreadPool(name="TangoAttributesTP",
+                                        Psize=self.AttributeWorkers, Qsize=0)
+        if not pending:
+            self._pool.add(self._refreshAttributes, None, device)
+
+    def _refreshAttributes(self, device):
+        """refreshes the attributes of a device and passes them to the
+        callbacks (called from a worker thread)"""
+        try:
+            device.refreshAttributes()
+        finally:
+            with self._lock:
+                callbacks = self._pendingAttributes.pop(device.name(), ())
+        attributes = device._attributes
+        for callback in callbacks:
+            try:
+                callback(attributes)
+            except Exception as e:
+                debug('Error passing the attributes of %s to %r (%r)',
+                      device.name(), callback, e)
+
     def getDevice(self, name):
         """Returns a :class:`TangoDevInfo` object with information
         about the given device name
@@ -30,12 +30,14 @@ __all__ = ["TangoDevice"]
 __docformat__ = "restructuredtext"
 
 import time
-from PyTango import (DeviceProxy, DevFailed, LockerInfo, DevState)
+from PyTango import (DeviceProxy, DevFailed, LockerInfo, DevState,
+                     NamedDevFailedList)
 
 from taurus.core.taurusdevice import TaurusDevice
 from taurus.core.taurusbasetypes import (TaurusDevState, TaurusLockInfo,
                                          LockStatus, TaurusEventType)
 from taurus.core.util.log import taurus4_deprecation
+from taurus.core.util.containers import CaselessDict
 
 
 class _TangoInfo(object):
@@ -369,6 +371,45 @@ class TangoDevice(TaurusDevice):
             result = e
         self.__pollResult(attrs, ts, result, error=error)
 
+    def writeAttributes(self, attrs_values):
+        '''optimized by writing multiple attributes in one go (and by
+        reading back those not using events in one go)'''
+        names, values = [], []
+        for attr, value in attrs_values:
+            names.append(attr.getSimpleName())
+            try:
+                values.append(attr.encode(value))
+            except Exception:
+                # let the attributes report their own errors
+                return TaurusDevice.writeAttributes(self, attrs_values)
+
+        errors = [None] * len(names)
+        try:
+            self.write_attributes(zip(names, values))
+        except NamedDevFailedList as e:
+            for named_df in e.err_list:
+                errors[named_df.idx_in_call] = DevFailed(*named_df.err_stack)
+        except DevFailed as e:
+            errors = [e] * len(names)
+        for name, error in zip(names, errors):
+            if error is not None:
+                self.error("[Tango] write of %s failed: %s", name, error[0].desc)
+
+        readback = CaselessDict()
+        for (attr, _), error in zip(attrs_values, errors):
+            if error is None and attr.isReadWrite() \
+                    and not attr.isUsingEvents():
+                readback[attr.getSimpleName()] = attr
+        if readback:
+            ts = time.time()
+            try:
+                result = self.read_attributes(readback.keys())
+            except DevFailed as e:
+                self.debug('Cannot read back the written attributes: %s', e)
+            else:
+                self.__pollResult(readback, ts, result)
+        return errors
+
     def _repr_html_(self):
         try:
             info = self.getDeviceProxy().info()
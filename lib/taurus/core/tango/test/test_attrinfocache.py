@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Tests for taurus.core.tango.util.attrinfocache"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import shutil
+import tempfile
+import unittest
+import cPickle as pickle
+
+import PyTango
+
+from taurus.core.tango.util.attrinfocache import (AttributeInfoCache,
+                                                  encodeAttributeInfoEx,
+                                                  decodeAttributeInfoEx)
+
+_NAME = 'tango://foo:10000/a/b/c/attr'
+
+
+def _attrInfoEx(label='attr', unit='mm'):
+    i = PyTango.AttributeInfoEx()
+    i.name = 'attr'
+    i.label = label
+    i.unit = unit
+    i.data_type = PyTango.CmdArgType.DevDouble
+    i.data_format = PyTango.AttrDataFormat.SPECTRUM
+    i.writable = PyTango.AttrWriteType.READ_WRITE
+    i.max_dim_x = 10
+    i.format = '%6.3f'
+    i.min_value = '-5'
+    i.alarms.max_alarm = '7'
+    return i
+
+
+class AttributeInfoCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._fname = os.path.join(self._dir, 'cache')
+        self._cache = AttributeInfoCache()
+        self._oldFileName = self._cache.getFileName()
+        self._cache.setFileName(None)
+
+    def tearDown(self):
+        self._cache.setFileName(self._oldFileName)
+        shutil.rmtree(self._dir)
+
+    def test_encodeDecode(self):
+        '''Check that the encoded configuration is decoded back'''
+        data = encodeAttributeInfoEx(_attrInfoEx())
+        pickle.loads(pickle.dumps(data))
+        i = decodeAttributeInfoEx(data)
+        self.assertEqual(i.label, 'attr')
+        self.assertEqual(i.unit, 'mm')
+        self.assertEqual(i.data_type, PyTango.CmdArgType.DevDouble)
+        self.assertEqual(i.data_format, PyTango.AttrDataFormat.SPECTRUM)
+        self.assertEqual(i.writable, PyTango.AttrWriteType.READ_WRITE)
+        self.assertEqual(i.max_dim_x, 10)
+        self.assertEqual(i.alarms.max_alarm, '7')
+        self.assertEqual(encodeAttributeInfoEx(i), data)
+
+    def test_disabled(self):
+        '''Check that a disabled cache does not store anything'''
+        self._cache.put(_NAME, _attrInfoEx())
+        self.assertIsNone(self._cache.get(_NAME))
+
+    def test_saveLoad(self):
+        '''Check that the entries are saved and loaded (case insensitive)'''
+        self._cache.setFileName(self._fname)
+        self._cache.put(_NAME, _attrInfoEx(label='foo'))
+        self._cache.save()
+        self._cache.setFileName(None)
+        self._cache.setFileName(self._fname)
+        self.assertEqual(self._cache.get(_NAME.upper()).label, 'foo')
+
+    def test_merge(self):
+        '''Check that saving keeps the more recent entries of the file'''
+        self._cache.setFileName(self._fname)
+        self._cache.put(_NAME, _attrInfoEx(label='old'))
+        self._cache.put(_NAME + '2', _attrInfoEx(label='mine'))
+        # another process writes a more recent entry
+        newer = encodeAttributeInfoEx(_attrInfoEx(label='new'))
+        with open(self._fname, 'wb') as f:
+            pickle.dump(dict(version=AttributeInfoCache.FormatVersion,
+                             entries={_NAME: (1e20, newer)}), f)
+        self._cache.save()
+        self._cache.setFileName(None)
+        self._cache.setFileName(self._fname)
+        self.assertEqual(self._cache.get(_NAME).label, 'new')
+        self.assertEqual(self._cache.get(_NAME + '2').label, 'mine')
+
+    def test_attributeList(self):
+        '''Check that the attribute lists are discarded on device restart'''
+        self._cache.setFileName(self._fname)
+        devname = _NAME.rsplit('/', 1)[0]
+        self._cache.putAttributeList(devname, 'started1', [_attrInfoEx()])
+        infos = self._cache.getAttributeList(devname, 'started1')
+        self.assertEqual([i.label for i in infos], ['attr'])
+        self.assertEqual(self._cache.get(_NAME).label, 'attr')
+        self.assertIsNone(self._cache.getAttributeList(devname, 'started2'))
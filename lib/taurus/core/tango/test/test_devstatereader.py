@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Tests for taurus.core.tango.util.devstatereader"""
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import unittest
+
+import PyTango
+
+from taurus.core.tango.util.devstatereader import DeviceStateReader
+
+
+class _FakeAuthority(object):
+    """authority whose devices belong to servers named after their domain"""
+
+    def getFullName(self):
+        return 'tango://foo:10000'
+
+    def getDevice(self, name):
+        class _Info(object):
+            def server(self):
+                return self
+
+            def name(self):
+                return name.split('/')[0]
+        return _Info()
+
+
+class _FakeProxy(object):
+
+    def __init__(self, name, reads):
+        self._name = name
+        self._reads = reads
+
+    def read_attribute_asynch(self, attr_name):
+        self._reads.append(self._name)
+        if '/dead/' in self._name:
+            raise PyTango.DevFailed()
+        return 1
+
+    def read_attribute_reply(self, request, timeout):
+        class _Reply(object):
+            value = PyTango.DevState.ON
+        return _Reply()
+
+
+class DeviceStateReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._reader = DeviceStateReader()
+        self._reader.clear()
+        self._reads = []
+        self._reader._getProxy = lambda n: _FakeProxy(n, self._reads)
+        self._authority = _FakeAuthority()
+        self._received = {}
+        self._event = threading.Event()
+
+    def tearDown(self):
+        del self._reader._getProxy
+        self._reader.clear()
+
+    def _callback(self, states):
+        self._received.update(states)
+        if len(self._received) == self._expected:
+            self._event.set()
+
+    def _request(self, names):
+        self._expected = len(names)
+        return self._reader.requestStates(names, self._callback,
+                                          authority=self._authority)
+
+    def test_read(self):
+        '''Check that the states are read and then cached'''
+        names = ['a/b/1', 'a/b/2', 'c/d/1']
+        self.assertEqual(self._request(names), {})
+        self._event.wait(5)
+        self.assertEqual(self._received,
+                         dict.fromkeys(names, PyTango.DevState.ON))
+        self.assertEqual(self._request(names),
+                         dict.fromkeys(names, PyTango.DevState.ON))
+        self.assertEqual(len(self._reads), 3)
+
+    def test_unreachableServer(self):
+        '''Check that the devices of an unreachable server are not waited'''
+        names = ['a/dead/1', 'a/dead/2']
+        self._request(names)
+        self._event.wait(5)
+        self.assertEqual(self._received, dict.fromkeys(names))
+        self.assertEqual(len(self._reads), 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.tango.tangodevice"""
+
+__docformat__ = 'restructuredtext'
+
+import PyTango
+import unittest
+from taurus.core.units import Quantity
+
+import taurus
+from taurus.core.tango.test import TangoSchemeTestLauncher
+
+
+class DeviceTestCase(TangoSchemeTestLauncher, unittest.TestCase):
+    """TestCase for TangoDevice.writeAttributes"""
+
+    def _attr(self, name):
+        return taurus.Attribute('%s/%s' % (self.DEV_NAME, name))
+
+    def test_writeAttributes(self):
+        """the attributes of a device are written in one go"""
+        dev = taurus.Device(self.DEV_NAME)
+        a, b = self._attr('short_scalar'), self._attr('float_scalar')
+        errors = dev.writeAttributes([(a, Quantity(1, 'm')),
+                                      (b, Quantity(2.5, 'mm'))])
+        self.assertEqual(errors, [None, None])
+        self.assertEqual(a.read(cache=False).wvalue, Quantity(1000, 'mm'))
+        self.assertEqual(b.read(cache=False).wvalue, Quantity(2.5, 'mm'))
+
+    def test_writeAttributesErrors(self):
+        """the errors of write_attributes are mapped to each attribute"""
+        dev = taurus.Device(self.DEV_NAME)
+        a, b, c = (self._attr('short_scalar'), self._attr('short_scalar_nu'),
+                   self._attr('float_scalar'))
+        b.range = [Quantity(0), Quantity(100)]
+        try:
+            errors = dev.writeAttributes([(a, Quantity(1, 'm')),
+                                          (b, 1000),
+                                          (c, Quantity(2.5, 'mm'))])
+        finally:
+            b.range = [float('-inf'), float('inf')]
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], PyTango.DevFailed)
+        self.assertIsNone(errors[2])
+        self.assertEqual(a.read(cache=False).wvalue, Quantity(1000, 'mm'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""A persistent cache of the configuration (:class:`PyTango.AttributeInfoEx`)
+of the Tango attributes, shared by the taurus processes of a host.
+
+When enabled (see the `TANGO_CONFIG_CACHE_FILE` custom setting), the
+:class:`~taurus.core.tango.TangoAttribute` objects take their configuration
+from the cache (instead of querying the device), and they refresh it
+asynchronously (from the configuration events). The cache is written to the
+file when the program exits. Each entry keeps the time in which its
+configuration was obtained, so that the processes sharing the file only
+replace the entries written by others with more recent ones.
+
+The cache also keeps the list of attributes of the devices (see
+:meth:`AttributeInfoCache.getAttributeList`), which is discarded when the
+device is exported again (i.e., when its server is restarted).
+"""
+
+__all__ = ["AttributeInfoCache", "encodeAttributeInfoEx",
+           "decodeAttributeInfoEx"]
+
+__docformat__ = 'restructuredtext'
+
+import os
+import time
+import threading
+import cPickle as pickle
+
+import PyTango
+
+from taurus.core.util.log import Logger
+from taurus.core.util.singleton import Singleton
+
+#: the members of the AttributeInfoEx that are kept in the cache
+_FIELDS = ('name', 'writable', 'data_format', 'data_type', 'max_dim_x',
+           'max_dim_y', 'description', 'label', 'unit', 'standard_unit',
+           'display_unit', 'format', 'min_value', 'max_value', 'min_alarm',
+           'max_alarm', 'writable_attr_name', 'disp_level', 'root_attr_name',
+           'memorized', 'enum_labels')
+_ALARMS_FIELDS = ('min_alarm', 'max_alarm', 'min_warning', 'max_warning',
+                  'delta_t', 'delta_val')
+_EVENTS_FIELDS = (('ch_event', ('rel_change', 'abs_change')),
+                  ('per_event', ('period',)),
+                  ('arch_event', ('archive_abs_change', 'archive_rel_change',
+                                  'archive_period')))
+
+
+def _encodeField(value):
+    if getattr(type(value), 'values', None) is not None:
+        # PyTango enumerations
+        return int(value)
+    if isinstance(value, (int, long, float, basestring)):
+        return value
+    # vectors of strings
+    return list(value)
+
+
+def _decodeField(obj, name, value):
+    current = getattr(obj, name)
+    values = getattr(type(current), 'values', None)
+    if values is not None:
+        value = values[value]
+    if isinstance(value, list):
+        del current[:]
+        current.extend(value)
+    else:
+        setattr(obj, name, value)
+
+
+def encodeAttributeInfoEx(attrinfoex):
+    """Returns a picklable representation (a dict) of the given attribute
+    configuration
+
+    :param attrinfoex: (PyTango.AttributeInfoEx)
+
+    :return: (dict)
+    """
+    ret = {}
+    for name in _FIELDS:
+        try:
+            ret[name] = _encodeField(getattr(attrinfoex, name))
+        except AttributeError:
+            # not supported by this version of Tango
+            pass
+    alarms = attrinfoex.alarms
+    ret['alarms'] = dict([(n, _encodeField(getattr(alarms, n)))
+                          for n in _ALARMS_FIELDS])
+    events = attrinfoex.events
+    for evt_name, names in _EVENTS_FIELDS:
+        evt = getattr(events, evt_name)
+        ret[evt_name] = dict([(n, _encodeField(getattr(evt, n)))
+                              for n in names])
+    return ret
+
+
+def decodeAttributeInfoEx(data):
+    """Returns the attribute configuration corresponding to the given
+    representation (see :func:`encodeAttributeInfoEx`)
+
+    :param data: (dict)
+
+    :return: (PyTango.AttributeInfoEx)
+    """
+    attrinfoex = PyTango.AttributeInfoEx()
+    for name in _FIELDS:
+        if name in data:
+            _decodeField(attrinfoex, name, data[name])
+    alarms = attrinfoex.alarms
+    for name, value in data['alarms'].items():
+        _decodeField(alarms, name, value)
+    events = attrinfoex.events
+    for evt_name, _ in _EVENTS_FIELDS:
+        evt = getattr(events, evt_name)
+        for name, value in data[evt_name].items():
+            _decodeField(evt, name, value)
+    return attrinfoex
+
+
+class AttributeInfoCache(Singleton, Logger):
+    """Singleton cache of the configuration of the Tango attributes, keyed by
+    their full name (e.g. `tango://host:10000/a/b/c/attr`).
+
+    The cache is disabled (i.e., :meth:`get` returns None and :meth:`put`
+    does nothing) unless a file name is set (see :meth:`setFileName`).
+    """
+
+    #: version of the format of the cache file (files written with other
+    #: versions are ignored)
+    FormatVersion = 1
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization."""
+        import taurus.tauruscustomsettings
+        name = self.__class__.__name__
+        self.call__init__(Logger, name)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._modified = set()
+        self._fileName = None
+        fname = getattr(taurus.tauruscustomsettings,
+                        'TANGO_CONFIG_CACHE_FILE', None)
+        if fname:
+            self.setFileName(fname)
+
+    def isEnabled(self):
+        """Returns whether the cache is enabled
+
+        :return: (bool)
+        """
+        return self._fileName is not None
+
+    def getFileName(self):
+        """Returns the name of the cache file (or None if disabled)
+
+        :return: (str or None)
+        """
+        return self._fileName
+
+    def setFileName(self, fname):
+        """Sets the file of the cache, loads its entries and registers the
+        cache to be saved when the program exits. Passing None disables the
+        cache (and discards its entries)
+
+        :param fname: (str or None) the file name
+        """
+        if fname is None:
+            self._fileName = None
+            self.clear()
+            return
+        if self._fileName is None:
+            import atexit
+            atexit.register(self._saveAtExit)
+        self._fileName = os.path.abspath(os.path.expanduser(fname))
+        self.load()
+
+    def clear(self):
+        """Discards all the entries (the file is not modified)"""
+        with self._lock:
+            self._entries = {}
+            self._modified = set()
+
+    def get(self, name):
+        """Returns the cached configuration of the given attribute
+
+        :param name: (str) the attribute full name
+
+        :return: (PyTango.AttributeInfoEx or None) the configuration, or None
+                 if it is not cached
+        """
+        entry = self._entries.get(name.lower())
+        if entry is None:
+            return None
+        try:
+            return decodeAttributeInfoEx(entry[1])
+        except Exception as e:
+            self.debug('Cannot decode cached configuration of %s (%r)',
+                       name, e)
+            return None
+
+    def put(self, name, attrinfoex):
+        """Stores the configuration of the given attribute (if the cache is
+        enabled)
+
+        :param name: (str) the attribute full name
+        :param attrinfoex: (PyTango.AttributeInfoEx) the configuration
+        """
+        if self._fileName is None:
+            return
+        data = encodeAttributeInfoEx(attrinfoex)
+        key = name.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == data:
+                return
+            self._entries[key] = time.time(), data
+            self._modified.add(key)
+
+    def getAttributeList(self, devname, started):
+        """Returns the cached configuration of all the attributes of the
+        given device, provided that it was obtained after the last export of
+        the device
+
+        :param devname: (str) the device full name
+        :param started: (str) the time in which the device was last exported
+                        (as given by the Tango database)
+
+        :return: (seq<PyTango.AttributeInfoEx> or None) the configurations,
+                 or None if they are not cached (or outdated)
+        """
+        entry = self._entries.get(devname.lower())
+        if entry is None or entry[1].get('started') != started:
+            return None
+        try:
+            return [decodeAttributeInfoEx(d) for d in entry[1]['attributes']]
+        except Exception as e:
+            self.debug('Cannot decode cached attributes of %s (%r)',
+                       devname, e)
+            return None
+
+    def putAttributeList(self, devname, started, attrinfoexs):
+        """Stores the configuration of all the attributes of the given
+        device (if the cache is enabled)
+
+        :param devname: (str) the device full name
+        :param started: (str) the time in which the device was last exported
+                        (as given by the Tango database)
+        :param attrinfoexs: (seq<PyTango.AttributeInfoEx>) the configurations
+        """
+        if self._fileName is None:
+            return
+        data = dict(started=started,
+                    attributes=map(encodeAttributeInfoEx, attrinfoexs))
+        key = devname.lower()
+        with self._lock:
+            self._entries[key] = time.time(), data
+            self._modified.add(key)
+        for attrinfoex in attrinfoexs:
+            self.put('%s/%s' % (devname, attrinfoex.name), attrinfoex)
+
+    def _readFile(self, fname):
+        try:
+            with open(fname, 'rb') as f:
+                cached = pickle.load(f)
+        except IOError:
+            return {}
+        except Exception as e:
+            self.warning('Cannot read the attribute configuration cache '
+                         '"%s" (%r)', fname, e)
+            return {}
+        if cached.get('version') != self.FormatVersion:
+            self.info('Ignoring attribute configuration cache "%s" '
+                      '(unsupported version)', fname)
+            return {}
+        return cached['entries']
+
+    def load(self):
+        """Loads the entries of the cache file (the entries in memory are
+        only replaced by more recent ones)"""
+        if self._fileName is None:
+            return
+        entries = self._readFile(self._fileName)
+        with self._lock:
+            for key, entry in entries.iteritems():
+                current = self._entries.get(key)
+                if current is None or current[0] < entry[0]:
+                    self._entries[key] = entry
+                    self._modified.discard(key)
+
+    def save(self):
+        """Writes the entries modified by this process to the cache file
+        (keeping the more recent entries written by other processes)"""
+        fname = self._fileName
+        if fname is None:
+            return
+        with self._lock:
+            modified = dict([(k, self._entries[k]) for k in self._modified])
+        if not modified:
+            return
+        entries = self._readFile(fname)
+        for key, entry in modified.iteritems():
+            current = entries.get(key)
+            if current is None or current[0] < entry[0]:
+                entries[key] = entry
+        dirname = os.path.dirname(fname)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        # write a temporary file and rename it, so that the processes
+        # reading the cache never see a partially written file
+        tmpname = '%s.%d.tmp' % (fname, os.getpid())
+        with open(tmpname, 'wb') as f:
+            pickle.dump(dict(version=self.FormatVersion, entries=entries), f,
+                        pickle.HIGHEST_PROTOCOL)
+        os.rename(tmpname, fname)
+        with self._lock:
+            for key, entry in modified.iteritems():
+                # (unless it was modified again meanwhile)
+                if self._entries.get(key) is entry:
+                    self._modified.discard(key)
+
+    def _saveAtExit(self):
+        try:
+            self.save()
+        except Exception as e:
+            self.warning('Cannot write the attribute configuration cache '
+                         '"%s" (%r)', self._fileName, e)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""A service that reads the state of many Tango devices in the background
+(e.g. for colouring the device trees).
+
+The states are read asynchronously: the devices are grouped by server, the
+groups are read in parallel by a pool of worker threads, and the devices of
+each group are read with parallel asynchronous requests. The read states are
+cached for some time (see the `DEVICE_STATE_TTL` custom setting), so that
+the clients requesting the same devices do not read them again.
+"""
+
+__all__ = ["DeviceStateReader"]
+
+__docformat__ = 'restructuredtext'
+
+import time
+import threading
+
+import PyTango
+
+from taurus.core.util.log import Logger
+from taurus.core.util.singleton import Singleton
+from taurus.core.util.threadpool import ThreadPool
+
+
+class DeviceStateReader(Singleton, Logger):
+    """Singleton service that reads the state of Tango devices in bulk.
+
+    Use :meth:`requestStates` for obtaining the cached states of some
+    devices and for reading the rest of them in the background. E.g.::
+
+        def received(states):
+            print states  # e.g. {'sys/tg_test/1': PyTango.DevState.RUNNING}
+
+        reader = DeviceStateReader()
+        states = reader.requestStates(['sys/tg_test/1'], received)
+
+    The states of the devices that cannot be read are reported as None.
+    """
+
+    #: default time (in seconds) during which the read states are valid
+    DefaultTTL = 3.
+
+    #: default number of threads reading the states
+    DefaultWorkers = 4
+
+    #: timeout (in milliseconds) of the state requests
+    Timeout = 1000
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization."""
+        import taurus.tauruscustomsettings
+        name = self.__class__.__name__
+        self.call__init__(Logger, name)
+        self._ttl = getattr(taurus.tauruscustomsettings, 'DEVICE_STATE_TTL',
+                            self.DefaultTTL)
+        self._workers = getattr(taurus.tauruscustomsettings,
+                                'DEVICE_STATE_WORKERS', self.DefaultWorkers)
+        self._lock = threading.Lock()
+        # {full device name: (read time, state)}
+        self._states = {}
+        # {full device name: [(callback, name as requested), ...]}
+        self._pending = {}
+        self._proxies = {}
+        self._pool = None
+
+    def getTTL(self):
+        """Returns the time during which the read states are valid
+
+        :return: (float) the time (in seconds)
+        """
+        return self._ttl
+
+    def setTTL(self, ttl):
+        """Sets the time during which the read states are valid
+
+        :param ttl: (float) the time (in seconds)
+        """
+        self._ttl = ttl
+
+    def clear(self):
+        """Discards the cached states"""
+        with self._lock:
+            self._states = {}
+
+    def getCachedState(self, name, authority=None):
+        """Returns the cached state of the given device (even if expired)
+
+        :param name: (str) the device name (e.g. `sys/tg_test/1`)
+        :param authority: (TangoAuthority) the authority of the device (if
+                          None, the default one is used)
+
+        :return: (PyTango.DevState or None) the state, or None if it is not
+                 cached (or if it could not be read)
+        """
+        entry = self._states.get(self._getFullName(name, authority))
+        if entry is None:
+            return None
+        return entry[1]
+
+    def requestStates(self, names, callback, authority=None):
+        """Returns the cached states of the given devices, and reads the
+        expired ones in the background. The callback is called (from a worker
+        thread) with the states read, once per server.
+
+        :param names: (seq<str>) the device names (e.g. `sys/tg_test/1`)
+        :param callback: (callable) a callable receiving a dictionary of
+                         {device name: state}
+        :param authority: (TangoAuthority) the authority of the devices (if
+                          None, the default one is used)
+
+        :return: (dict) the valid cached states, as {device name: state}
+        """
+        if authority is None:
+            authority = self._getDefaultAuthority()
+        ret, missing = {}, []
+        now = time.time()
+        with self._lock:
+            for name in names:
+                full_name = self._getFullName(name, authority)
+                entry = self._states.get(full_name)
+                if entry is not None and now - entry[0] < self._ttl:
+                    ret[name] = entry[1]
+                    continue
+                requests = self._pending.get(full_name)
+                if requests is None:
+                    self._pending[full_name] = requests = []
+                    missing.append((name, full_name))
+                requests.append((callback, name))
+            if missing and self._pool is None:
+                self._pool = ThreadPool(name="DeviceStateTP", parent=self,
+                                        Psize=self._workers, Qsize=0)
+        if missing:
+            self._pool.add(self._dispatch, None, missing, authority)
+        return ret
+
+    def _getDefaultAuthority(self):
+        import taurus
+        return taurus.Factory('tango').getAuthority()
+
+    def _getFullName(self, name, authority):
+        if authority is None:
+            authority = self._getDefaultAuthority()
+        return ('%s/%s' % (authority.getFullName(), name)).lower()
+
+    def _getServerName(self, name, authority):
+        """returns the server of the given device, from the cache of the
+        authority (or None if unknown)"""
+        try:
+            return authority.getDevice(name).server().name()
+        except Exception:
+            return None
+
+    def _dispatch(self, devices, authority):
+        """groups the given devices by server and enqueues the reading of
+        each group (called from a worker thread)"""
+        groups = {}
+        for name, full_name in devices:
+            server = self._getServerName(name, authority) or full_name
+            groups.setdefault(server, []).append(full_name)
+        for server, full_names in groups.items():
+            self._pool.add(self._read, None, server, full_names)
+
+    def _getProxy(self, full_name):
+        proxy = self._proxies.get(full_name)
+        if proxy is None:
+            proxy = PyTango.DeviceProxy(full_name)
+            self._proxies[full_name] = proxy
+        return proxy
+
+    def _read(self, server, full_names):
+        """reads the states of the given devices of a server (called from a
+        worker thread)"""
+        states, requests = {}, []
+        for i, full_name in enumerate(full_names):
+            try:
+                proxy = self._getProxy(full_name)
+                requests.append((full_name, proxy,
+                                 proxy.read_attribute_asynch('State')))
+            except PyTango.DevFailed as e:
+                # the server cannot be reached: do not wait for the rest of
+                # its devices
+                self.debug('Cannot read the states of %s (%r)', server, e)
+                states.update(dict.fromkeys(full_names[i:]))
+                break
+        for full_name, proxy, request in requests:
+            try:
+                reply = proxy.read_attribute_reply(request, self.Timeout)
+                states[full_name] = reply.value
+            except PyTango.DevFailed as e:
+                self.debug('Cannot read the state of %s (%r)', full_name, e)
+                states[full_name] = None
+        self._update(states)
+
+    def _update(self, states):
+        """caches the read states and passes them to the callbacks"""
+        now = time.time()
+        received = {}
+        with self._lock:
+            for full_name, state in states.items():
+                self._states[full_name] = now, state
+                for callback, name in self._pending.pop(full_name, ()):
+                    received.setdefault(callback, {})[name] = state
+        for callback, dct in received.items():
+            try:
+                callback(dct)
+            except Exception as e:
+                self.debug('Error passing the device states to %r (%r)',
+                           callback, e)
@@ -129,6 +129,25 @@ class TaurusDevice(TaurusModel):
         for attr in attrs.values():
             attr.poll()
 
+    def writeAttributes(self, attrs_values):
+        '''Writes several attributes of the device. This default
+        implementation simply writes each attribute one by one. Schemes that
+        support it should reimplement it to write them in a single request.
+
+        :param attrs_values: (sequence<tuple>) (attribute, value) pairs
+
+        :return: (list) the error (an Exception or None if the write
+                 succeeded) of each attribute
+        '''
+        errors = []
+        for attr, value in attrs_values:
+            try:
+                attr.write(value)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
     @property
     def description(self):
         return self._description
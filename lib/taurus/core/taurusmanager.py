@@ -30,7 +30,11 @@ __all__ = ["TaurusManager"]
 __docformat__ = "restructuredtext"
 
 import os
+import time
 import atexit
+import threading
+import collections
+from Queue import Queue, Empty
 
 from .util.singleton import Singleton
 from .util.log import Logger, taurus4_deprecation
@@ -43,6 +47,7 @@ from .taurusattribute import TaurusAttribute
 from .taurusexception import TaurusException
 from .taurusfactory import TaurusFactory
 from .taurushelper import getSchemeFromName
+from .taurusoperation import TaurusOperation, WriteAttrOperation
 from taurus import tauruscustomsettings
 
 
@@ -372,13 +377,146 @@ class TaurusManager(Singleton, Logger):
             if class_name[i].isupper():
                 return class_name[:i].lower()
 
-    def applyPendingOperations(self, ops):
-        """Executes the given operations
+    def applyPendingOperations(self, ops, timeout=None):
+        """Executes the given operations.
+
+        Consecutive write operations are grouped by device: the attributes of
+        each device are written in one go (see
+        :meth:`TaurusDevice.writeAttributes`) and the devices are written in
+        parallel. All the operations are executed even if some of them fail;
+        the error of each write operation is available from
+        :meth:`WriteAttrOperation.getError` (and the callbacks of the
+        operations are only called if they succeed).
 
         :param ops: the sequence of operations
-        :type ops: sequence<taurus.core.taurusoperation.TaurusOperation>"""
+        :type ops: sequence<taurus.core.taurusoperation.TaurusOperation>
+        :param timeout: (float) maximum time (in s) to wait for the parallel
+                        writes. If None, the `PENDING_OPERATIONS_TIMEOUT`
+                        custom setting is used. Note that a write that
+                        times out is not cancelled (it may still be applied
+                        later): when it finishes, the error of its
+                        operation is updated (and the outcome logged), but
+                        its callbacks are not called
+
+        :raises: the error of the failed operation (or a
+                 :class:`TaurusException` if several operations failed)
+        """
+        if timeout is None:
+            timeout = getattr(tauruscustomsettings,
+                              'PENDING_OPERATIONS_TIMEOUT', 30)
+        errors, writes = [], []
+        for o in ops:
+            if isinstance(o, WriteAttrOperation):
+                writes.append(o)
+                continue
+            errors += self._applyWriteOperations(writes, timeout)
+            writes = []
+            try:
+                o.execute()
+            except Exception as e:
+                errors.append((o, e))
+        errors += self._applyWriteOperations(writes, timeout)
+
+        if len(errors) == 1:
+            raise errors[0][1]
+        elif errors:
+            msg = '\n'.join('%s: %s' % (o.attr.getFullName()
+                                        if hasattr(o, 'attr') else o, e)
+                            for o, e in errors)
+            raise TaurusException('%d of %d operations failed:\n%s' %
+                                  (len(errors), len(ops), msg))
+
+    def _applyWriteOperations(self, ops, timeout):
+        """Executes the given write operations grouped by device (and the
+        devices in parallel). Returns the (operation, error) of the failed
+        ones"""
+        if not ops:
+            return []
+        groups = collections.OrderedDict()
         for o in ops:
-            o.execute()
+            groups.setdefault(o.getDevice(), []).append(o)
+        results = {}
+        timedout = set()
+        lock = threading.Lock()
+
+        def store(group, errors):
+            with lock:
+                if id(group) not in timedout:
+                    results[id(group)] = errors
+                    return
+            # the write finished after the timeout: update the outcome
+            for o, error in zip(group, errors):
+                o.setError(error)
+                if error is None:
+                    self.warning('%s was written after the timeout',
+                                 o.attr.getFullName())
+                else:
+                    self.warning('Writing %s failed after the timeout: %s',
+                                 o.attr.getFullName(), error)
+
+        def write(dev, group):
+            if dev is None or len(group) == 1:
+                errors = []
+                for o in group:
+                    try:
+                        o.attr.write(o.value)
+                        errors.append(None)
+                    except Exception as e:
+                        errors.append(e)
+            else:
+                errors = dev.writeAttributes([(o.attr, o.value)
+                                              for o in group])
+            store(group, errors)
+
+        if len(groups) == 1:
+            write(*groups.items()[0])
+        else:
+            queue = Queue()
+            for item in groups.items():
+                queue.put(item)
+
+            def worker():
+                while True:
+                    try:
+                        dev, group = queue.get_nowait()
+                    except Empty:
+                        return
+                    try:
+                        write(dev, group)
+                    except Exception as e:
+                        store(group, [e] * len(group))
+
+            nworkers = getattr(tauruscustomsettings,
+                               'PENDING_OPERATIONS_WORKERS', 8)
+            workers = []
+            for i in range(min(nworkers, len(groups))):
+                t = threading.Thread(name='%s.W%d' % (self.log_name, i),
+                                     target=worker)
+                t.daemon = True
+                t.start()
+                workers.append(t)
+            deadline = time.time() + timeout
+            for t in workers:
+                t.join(max(0, deadline - time.time()))
+
+        with lock:
+            for group in groups.values():
+                if id(group) not in results:
+                    timedout.add(id(group))
+        failed = []
+        for group in groups.values():
+            errors = results.get(id(group))
+            if errors is None:
+                errors = [TaurusException('Timeout writing %s' %
+                                          o.attr.getFullName())
+                          for o in group]
+            for o, error in zip(group, errors):
+                o.setError(error)
+                if error is None:
+                    TaurusOperation.execute(o)
+                else:
+                    failed.append((o, error))
+        return failed
 
     def changeDefaultPollingPeriod(self, period):
         plugin_classes = self._get_plugin_classes()
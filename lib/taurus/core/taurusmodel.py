@@ -29,17 +29,21 @@ __all__ = ["TaurusModel"]
 
 __docformat__ = "restructuredtext"
 
+import time
 import weakref
 import operator
 import threading
 
 from .util.log import Logger
+from .util.metrics import MetricsRegistry
 from .util.event import (CallableRef,
                          BoundMethodWeakref,
                          _BoundMethodWeakrefWithCall)
 from .taurusbasetypes import TaurusEventType, MatchLevel
 from .taurushelper import Factory
 
+_metrics = MetricsRegistry()
+
 
 class TaurusModel(Logger):
 
@@ -283,6 +287,10 @@ class TaurusModel(Logger):
         if not operator.isSequenceType(listeners):
             listeners = listeners,
 
+        metrics = _metrics.enabled
+        if metrics:
+            t0 = time.time()
+
         for listener in listeners:
             if isinstance(listener, weakref.ref) or isinstance(listener, BoundMethodWeakref):
                 l = listener()
@@ -296,6 +304,11 @@ class TaurusModel(Logger):
             elif operator.isCallable(l):
                 l(self, event_type, event_value)
 
+        if metrics:
+            name = self.getFullName()
+            _metrics.count('events', name)
+            _metrics.observe('listeners', name, time.time() - t0)
+
     def isWritable(self):
         return False
 
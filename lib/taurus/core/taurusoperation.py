@@ -77,7 +77,26 @@ class WriteAttrOperation(TaurusOperation):
                           attr, callbacks=callbacks)
         self.attr = attr
         self.value = value
+        self._error = None
+
+    def getDevice(self):
+        return self.attr.getParentObj()
+
+    def getError(self):
+        """Returns the error of the last execution of the operation
+
+        :return: (Exception or None) None if the write succeeded
+        """
+        return self._error
+
+    def setError(self, error):
+        self._error = error
 
     def execute(self):
-        self.attr.write(self.value)
+        self._error = None
+        try:
+            self.attr.write(self.value)
+        except Exception as e:
+            self._error = e
+            raise
         TaurusOperation.execute(self)
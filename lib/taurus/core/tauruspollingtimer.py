@@ -36,6 +36,9 @@ import threading
 from .util.log import Logger, DebugIt
 from .util.containers import CaselessWeakValueDict
 from .util.timer import Timer
+from .util.metrics import MetricsRegistry
+
+_metrics = MetricsRegistry()
 
 
 class TaurusPollingTimer(Logger):
@@ -133,6 +136,9 @@ class TaurusPollingTimer(Logger):
         """Polls the registered attributes. This method is called by the timer
            when it is time to poll. Do not call this method directly
         """
+        metrics = _metrics.enabled
+        if metrics:
+            t0 = time.time()
         req_ids = {}
         for dev, attrs in self.dev_dict.items():
             try:
@@ -142,7 +148,15 @@ class TaurusPollingTimer(Logger):
                 self.error("poll_asynch error")
                 self.debug("Details:", exc_info=1)
         for dev, (attrs, req_id) in req_ids.items():
+            if metrics:
+                t1 = time.time()
             try:
                 dev.poll(attrs, req_id=req_id)
             except Exception as e:
                 self.error("poll_reply error")
+            if metrics:
+                _metrics.observe('poll', dev.getFullName(), time.time() - t1)
+                for attr in attrs.values():
+                    _metrics.count('polls', attr.getFullName())
+        if metrics:
+            _metrics.observe('polling_timer', self.log_name, time.time() - t0)
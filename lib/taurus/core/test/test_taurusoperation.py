@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.taurusmanager.TaurusManager.applyPendingOperations"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import time
+import unittest
+
+import taurus
+from taurus.core.taurusexception import TaurusException
+from taurus.core.taurusoperation import TaurusOperation, WriteAttrOperation
+from taurus.core.util.log import Logger
+
+
+class _Device(object):
+    """records the calls to writeAttributes"""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+
+    def writeAttributes(self, attrs_values):
+        self.calls.append([a.name for a, _ in attrs_values])
+        time.sleep(self.delay)
+        return [a.write(v, _written=False) for a, v in attrs_values]
+
+
+class _Attribute(Logger):
+    """a writable attribute (fails if the value is negative)"""
+
+    def __init__(self, name, device):
+        Logger.__init__(self, name)
+        self.name = name
+        self.device = device
+        self.value = None
+        self.writes = 0
+
+    def getParentObj(self):
+        return self.device
+
+    def getFullName(self):
+        return self.name
+
+    def write(self, value, _written=True):
+        if value < 0:
+            error = ValueError('%s: invalid value' % self.name)
+            if _written:
+                raise error
+            return error
+        self.value = value
+        self.writes += 1
+
+
+class ApplyPendingOperationsTest(unittest.TestCase):
+    '''TestCase for the grouped execution of the pending operations'''
+
+    def test_grouped(self):
+        '''Check that the writes are grouped by device'''
+        d1, d2 = _Device(), _Device()
+        attrs = [_Attribute('a', d1), _Attribute('b', d2),
+                 _Attribute('c', d1), _Attribute('d', None)]
+        called = []
+        ops = [WriteAttrOperation(a, i, [lambda operation: called.append(
+            operation.attr.name)]) for i, a in enumerate(attrs)]
+        taurus.Manager().applyPendingOperations(ops)
+        self.assertEqual([a.value for a in attrs], [0, 1, 2, 3])
+        self.assertEqual(d1.calls, [['a', 'c']])
+        # single writes do not use writeAttributes
+        self.assertEqual(d2.calls, [])
+        self.assertEqual(sorted(called), ['a', 'b', 'c', 'd'])
+        self.assertTrue(all(o.getError() is None for o in ops))
+
+    def test_parallel(self):
+        '''Check that the devices are written in parallel'''
+        devs = [_Device(0.2) for _ in range(5)]
+        ops = []
+        for i, d in enumerate(devs):
+            for j in range(2):
+                ops.append(WriteAttrOperation(_Attribute('%d%d' % (i, j), d),
+                                              j))
+        t0 = time.time()
+        taurus.Manager().applyPendingOperations(ops)
+        self.assertTrue(time.time() - t0 < 0.6)
+        self.assertTrue(all(d.calls for d in devs))
+
+    def test_errors(self):
+        '''Check that the errors are reported per operation'''
+        d = _Device()
+        ok, bad = _Attribute('ok', d), _Attribute('bad', d)
+        ops = [WriteAttrOperation(ok, 1), WriteAttrOperation(bad, -1)]
+        self.assertRaises(ValueError,
+                          taurus.Manager().applyPendingOperations, ops)
+        self.assertEqual(ok.value, 1)
+        self.assertIsNone(ops[0].getError())
+        self.assertIsInstance(ops[1].getError(), ValueError)
+
+        other = _Attribute('other', _Device())
+        ops.append(WriteAttrOperation(other, -2))
+        self.assertRaises(TaurusException,
+                          taurus.Manager().applyPendingOperations, ops)
+
+    def test_timeout(self):
+        '''Check that the slow devices are reported as timeouts'''
+        slow, fast = _Device(0.5), _Device()
+        ops = [WriteAttrOperation(_Attribute(n, d), 1)
+               for n, d in (('s1', slow), ('s2', slow), ('f1', fast),
+                            ('f2', fast))]
+        self.assertRaises(TaurusException,
+                          taurus.Manager().applyPendingOperations, ops,
+                          timeout=0.1)
+        self.assertIsInstance(ops[0].getError(), TaurusException)
+        self.assertIsNone(ops[2].getError())
+
+    def test_lateWrite(self):
+        '''Check that the outcome of a write finishing after the timeout is
+        updated (but its callbacks are not called)'''
+        slow, fast = _Device(0.3), _Device()
+        called = []
+        ops = [WriteAttrOperation(_Attribute(n, d), v, [
+            lambda operation: called.append(operation.attr.name)])
+            for n, d, v in (('s1', slow, 1), ('s2', slow, -1),
+                            ('f1', fast, 1), ('f2', fast, 1))]
+        self.assertRaises(TaurusException,
+                          taurus.Manager().applyPendingOperations, ops,
+                          timeout=0.1)
+        self.assertIsInstance(ops[0].getError(), TaurusException)
+        time.sleep(0.5)
+        self.assertEqual(ops[0].attr.value, 1)
+        self.assertIsNone(ops[0].getError())
+        self.assertIsInstance(ops[1].getError(), ValueError)
+        self.assertEqual(sorted(called), ['f1', 'f2'])
+
+    def test_order(self):
+        '''Check that other operations are executed in order'''
+        executed = []
+        d = _Device()
+        op = TaurusOperation(callbacks=[
+            lambda operation: executed.append(a.value)])
+        a = _Attribute('a', d)
+        ops = [WriteAttrOperation(a, 1), op, WriteAttrOperation(a, 2)]
+        taurus.Manager().applyPendingOperations(ops)
+        self.assertEqual(executed, [1])
+        self.assertEqual(a.value, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides the infrastructure for retrieving historical (archived)
+values of attributes, e.g. for filling the history of a trend with the
+values recorded before it was started.
+
+The archiving system is accessed through an :class:`ArchivingReader`.
+Readers for PyTangoArchiving (:class:`PyTangoArchivingReader`) and for a
+local SQLite database (:class:`SQLiteArchivingReader`) are provided, but any
+object implementing the :class:`ArchivingReader` interface can be used.
+
+:class:`ArchivingBackfill` keeps track of the time intervals that have
+already been requested for each model and retrieves only the missing ones,
+in worker threads::
+
+    def onData(model, t, v):
+        print model, len(t)
+
+    backfill = ArchivingBackfill(SQLiteArchivingReader('/tmp/archive.db'),
+                                 onData)
+    backfill.request('eval:rand()', time.time() - 3600, time.time())
+"""
+
+__all__ = ["ArchivingReader", "PyTangoArchivingReader",
+           "SQLiteArchivingReader", "IntervalSet", "ArchivingBackfill",
+           "getDefaultArchivingReader"]
+
+__docformat__ = "restructuredtext"
+
+import threading
+import sqlite3
+
+import numpy
+
+from taurus.core.util.log import Logger
+from taurus.core.util.threadpool import ThreadPool
+
+
+class ArchivingReader(object):
+    """Interface for archiving readers. Subclasses must implement
+    :meth:`getValues` and may reimplement :meth:`isArchived`.
+
+    Readers are used from worker threads, so implementations must be
+    thread-safe.
+    """
+
+    def isArchived(self, model):
+        """Returns whether the given model is archived
+
+        :param model: (str) the model name
+
+        :return: (bool)
+        """
+        return True
+
+    def getValues(self, model, start, end):
+        """Returns the values archived for the given model in the given time
+        interval, sorted by time
+
+        :param model: (str) the model name
+        :param start: (float) start of the interval (epoch seconds)
+        :param end: (float) end of the interval (epoch seconds)
+
+        :return: (tuple<numpy.ndarray,numpy.ndarray>) timestamps and values.
+                 The values array is one-dimensional for scalar attributes
+                 and two-dimensional (one row per timestamp) for spectra
+        """
+        raise NotImplementedError(
+            'getValues must be implemented in ArchivingReader subclasses')
+
+
+class PyTangoArchivingReader(ArchivingReader):
+    """Archiving reader based on PyTangoArchiving (which must be installed)
+    """
+
+    def __init__(self, *args, **kwargs):
+        """The arguments are passed to :class:`PyTangoArchiving.Reader`"""
+        import PyTangoArchiving  # TODO: tango-centric
+        self._reader = PyTangoArchiving.Reader(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _attrName(model):
+        # PyTangoArchiving uses tango attribute names without scheme
+        return model.split('://', 1)[-1]
+
+    def isArchived(self, model):
+        """Reimplemented from :meth:`ArchivingReader.isArchived`"""
+        with self._lock:
+            return bool(self._reader.is_attribute_archived(
+                self._attrName(model)))
+
+    def getValues(self, model, start, end):
+        """Reimplemented from :meth:`ArchivingReader.getValues`"""
+        with self._lock:
+            values = self._reader.get_attribute_values(
+                self._attrName(model), start, end)
+        values = [(t, v) for t, v in values if v is not None]
+        if not values:
+            return numpy.zeros(0), numpy.zeros(0)
+        t, v = zip(*values)
+        return numpy.array(t, dtype='d'), numpy.array(v, dtype='d')
+
+
+class SQLiteArchivingReader(ArchivingReader):
+    """Archiving reader for a SQLite database containing a table with
+    (model, time, value) columns. It is useful as a local stand-in for a
+    real archiving system (e.g. for tests or for replaying recorded data).
+    Only scalar numeric values are supported.
+    """
+
+    def __init__(self, fname, table='archive'):
+        """
+        :param fname: (str) the database file name
+        :param table: (str) the name of the table. It is created if it does
+                      not exist
+        """
+        self._fname = fname
+        self._table = table
+        conn = sqlite3.connect(self._fname)
+        try:
+            conn.execute('CREATE TABLE IF NOT EXISTS %s '
+                         '(model TEXT, time REAL, value REAL)' % table)
+            conn.execute('CREATE INDEX IF NOT EXISTS %s_idx '
+                         'ON %s (model, time)' % (table, table))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def insert(self, model, times, values):
+        """Stores values for the given model
+
+        :param model: (str) the model name
+        :param times: (sequence<float>) timestamps (epoch seconds)
+        :param values: (sequence<float>) values
+        """
+        conn = sqlite3.connect(self._fname)
+        try:
+            conn.executemany('INSERT INTO %s VALUES (?, ?, ?)' % self._table,
+                             [(model, float(t), float(v))
+                              for t, v in zip(times, values)])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def isArchived(self, model):
+        """Reimplemented from :meth:`ArchivingReader.isArchived`"""
+        conn = sqlite3.connect(self._fname)
+        try:
+            cursor = conn.execute('SELECT 1 FROM %s WHERE model=? LIMIT 1' %
+                                  self._table, (model,))
+            return cursor.fetchone() is not None
+        finally:
+            conn.close()
+
+    def getValues(self, model, start, end):
+        """Reimplemented from :meth:`ArchivingReader.getValues`"""
+        conn = sqlite3.connect(self._fname)
+        try:
+            rows = conn.execute('SELECT time, value FROM %s WHERE model=? '
+                                'AND time>=? AND time<? ORDER BY time' %
+                                self._table, (model, start, end)).fetchall()
+        finally:
+            conn.close()
+        data = numpy.array(rows, dtype='d').reshape(len(rows), 2)
+        return data[:, 0], data[:, 1]
+
+
+class IntervalSet(object):
+    """A set of disjoint, sorted [start, end) intervals"""
+
+    def __init__(self):
+        self._intervals = []
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def __iter__(self):
+        return iter(self._intervals)
+
+    def add(self, start, end):
+        """Adds an interval, merging it with the overlapping (or contiguous)
+        ones
+
+        :param start: (float) start of the interval
+        :param end: (float) end of the interval
+        """
+        if end <= start:
+            return
+        merged = []
+        for s, e in self._intervals:
+            if e < start or s > end:
+                merged.append((s, e))
+            else:
+                start, end = min(s, start), max(e, end)
+        merged.append((start, end))
+        merged.sort()
+        self._intervals = merged
+
+    def missing(self, start, end):
+        """Returns the parts of the given interval which are not covered
+
+        :param start: (float) start of the interval
+        :param end: (float) end of the interval
+
+        :return: (list<tuple>) list of (start, end) tuples
+        """
+        ret = []
+        for s, e in self._intervals:
+            if e <= start:
+                continue
+            if s >= end:
+                break
+            if s > start:
+                ret.append((start, s))
+            start = max(start, e)
+        if start < end:
+            ret.append((start, end))
+        return ret
+
+    def clear(self):
+        """Removes all intervals"""
+        self._intervals = []
+
+
+class ArchivingBackfill(Logger):
+    """Retrieves archived values for the requested intervals, asynchronously
+    and without repeating requests for intervals already retrieved.
+
+    The retrieved data is passed to a callback with the signature
+    `callback(model, t, v)` (see :meth:`ArchivingReader.getValues`). Note that
+    the callback is called from a worker thread.
+    """
+
+    #: minimum length (in seconds) of the intervals to be retrieved. Smaller
+    #: gaps are ignored
+    MinInterval = 1.
+
+    def __init__(self, reader, callback, name=None, parent=None, workers=1):
+        """
+        :param reader: (ArchivingReader) the archiving reader
+        :param callback: (callable) called with the retrieved data
+        :param name: (str) logger name
+        :param parent: (Logger) logger parent
+        :param workers: (int) number of worker threads
+        """
+        Logger.__init__(self, name or self.__class__.__name__, parent)
+        self._reader = reader
+        self._callback = callback
+        self._workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self._intervals = {}
+        self._archived = {}
+
+    def getReader(self):
+        """Returns the archiving reader
+
+        :return: (ArchivingReader)
+        """
+        return self._reader
+
+    def request(self, model, start, end):
+        """Requests the archived values of the given model for the given
+        interval. Only the parts of the interval that have not been requested
+        before are retrieved. This method returns immediately.
+
+        :param model: (str) the model name
+        :param start: (float) start of the interval (epoch seconds)
+        :param end: (float) end of the interval (epoch seconds)
+
+        :return: (list<tuple>) the intervals that have been scheduled for
+                 retrieval
+        """
+        with self._lock:
+            if self._archived.get(model, True) is False:
+                return []
+            intervals = self._intervals.setdefault(model, IntervalSet())
+            missing = [(s, e) for s, e in intervals.missing(start, end)
+                       if e - s >= self.MinInterval]
+            if not missing:
+                return []
+            for s, e in missing:
+                # mark as requested now, to avoid duplicate requests
+                intervals.add(s, e)
+            if self._pool is None:
+                self._pool = ThreadPool(name="ArchivingBackfillTP",
+                                        parent=self, Psize=self._workers,
+                                        Qsize=0)
+        for s, e in missing:
+            self._pool.add(self._fetch, None, model, s, e)
+        return missing
+
+    def _fetch(self, model, start, end):
+        """retrieves the data (called from a worker thread)"""
+        try:
+            with self._lock:
+                archived = self._archived.get(model)
+            if archived is None:
+                archived = self._reader.isArchived(model)
+                with self._lock:
+                    # unless the model was cleared meanwhile
+                    if model in self._intervals:
+                        self._archived.setdefault(model, archived)
+            if not archived:
+                self.info('%s is not archived', model)
+                return
+            t, v = self._reader.getValues(model, start, end)
+        except Exception, e:
+            # the interval stays marked as requested: call clear() to retry
+            self.warning('Cannot read archived values of %s: %r', model, e)
+            self.debug('Details:', exc_info=1)
+            return
+        if len(t):
+            self._callback(model, t, v)
+
+    def getRequestedIntervals(self, model):
+        """Returns the intervals already requested for the given model
+
+        :param model: (str) the model name
+
+        :return: (list<tuple>) list of (start, end) tuples
+        """
+        with self._lock:
+            return list(self._intervals.get(model, []))
+
+    def clear(self, model=None):
+        """Forgets the requested intervals so that they can be requested
+        again
+
+        :param model: (str or None) the model name. If None, all the models
+                      are cleared
+        """
+        with self._lock:
+            if model is None:
+                self._intervals.clear()
+                self._archived.clear()
+            else:
+                self._intervals.pop(model, None)
+                self._archived.pop(model, None)
+
+
+_defaultReader = None
+
+
+def getDefaultArchivingReader():
+    """Returns the default archiving reader (a
+    :class:`PyTangoArchivingReader`), or None if PyTangoArchiving is not
+    available. The reader is created only once.
+
+    :return: (ArchivingReader or None)
+    """
+    global _defaultReader
+    if _defaultReader is None:
+        try:
+            _defaultReader = PyTangoArchivingReader()
+        except Exception, e:
+            Logger('ArchivingReader').info(
+                'Archiving not available (%r)', e)
+            _defaultReader = False
+    return _defaultReader or None
@@ -64,7 +64,8 @@ A Taurus related example::
 """
 
 __all__ = ["Codec", "NullCodec", "ZIPCodec", "BZ2Codec", "JSONCodec",
-           "FunctionCodec", "PlotCodec", "CodecPipeline", "CodecFactory"]
+           "NDArrayCodec", "FunctionCodec", "PlotCodec", "CodecPipeline",
+           "CodecFactory"]
 
 __docformat__ = "restructuredtext"
 
@@ -158,10 +159,34 @@ class ZIPCodec(Codec):
         1200, 31
         >>> format, decoded_data = codec.decode((format, encoded_data))
         >>> print decoded_data[20]
-        'Hello world\\nHello wo'"""
+        'Hello world\\nHello wo'
+
+    The compression level (1 is fastest, 9 is best compression) can be set
+    with :meth:`setLevel`. It does not affect the decoding."""
+
+    #: default compression level
+    DefaultLevel = 6
+
+    def __init__(self):
+        Codec.__init__(self)
+        self._level = self.DefaultLevel
+
+    def getLevel(self):
+        """Returns the compression level used for encoding
+
+        :return: (int) the compression level (1-9)"""
+        return self._level
+
+    def setLevel(self, level):
+        """Sets the compression level used for encoding
+
+        :param level: (int) the compression level (1-9)"""
+        self._level = level
 
     def encode(self, data, *args, **kwargs):
-        """encodes the given data to a gzip string. The given data **must** be a string
+        """encodes the given data to a gzip string. The given data **must** be
+        a string (or an object supporting the buffer interface, such as a
+        contiguous numpy array)
 
         :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
 
@@ -170,7 +195,7 @@ class ZIPCodec(Codec):
         format = 'zip'
         if len(data[0]):
             format += '_%s' % data[0]
-        return format, zlib.compress(data[1])
+        return format, zlib.compress(data[1], self._level)
 
     def decode(self, data, *args, **kwargs):
         """decodes the given data from a gzip string.
@@ -201,10 +226,34 @@ class BZ2Codec(Codec):
         1200, 68
         >>> format, decoded_data = codec.decode((format, encoded_data))
         >>> print decoded_data[20]
-        'Hello world\\nHello wo'"""
+        'Hello world\\nHello wo'
+
+    The compression level (1 is fastest, 9 is best compression) can be set
+    with :meth:`setLevel`. It does not affect the decoding."""
+
+    #: default compression level
+    DefaultLevel = 9
+
+    def __init__(self):
+        Codec.__init__(self)
+        self._level = self.DefaultLevel
+
+    def getLevel(self):
+        """Returns the compression level used for encoding
+
+        :return: (int) the compression level (1-9)"""
+        return self._level
+
+    def setLevel(self, level):
+        """Sets the compression level used for encoding
+
+        :param level: (int) the compression level (1-9)"""
+        self._level = level
 
     def encode(self, data, *args, **kwargs):
-        """encodes the given data to a bz2 string. The given data **must** be a string
+        """encodes the given data to a bz2 string. The given data **must** be
+        a string (or an object supporting the buffer interface, such as a
+        contiguous numpy array)
 
         :param data: (sequence[str, obj]) a sequence of two elements where the first item is the encoding format of the second item object
 
@@ -213,7 +262,7 @@ class BZ2Codec(Codec):
         format = 'bz2'
         if len(data[0]):
             format += '_%s' % data[0]
-        return format, bz2.compress(data[1])
+        return format, bz2.compress(data[1], self._level)
 
     def decode(self, data, *args, **kwargs):
         """decodes the given data from a bz2 string.
@@ -341,8 +390,10 @@ class JSONCodec(Codec):
         if isinstance(data[1], buffer):
             data = data[0], str(data[1])
 
-        data = json.loads(data[1])
-        if ensure_ascii:
+        encoded = data[1]
+        data = json.loads(encoded)
+        # without strings (e.g. arrays of numbers) there is nothing to encode
+        if ensure_ascii and '"' in encoded:
             data = self._transform_ascii(data)
         return format, data
 
@@ -446,6 +497,78 @@ class BSONCodec(Codec):
         return newdict
 
 
+class NDArrayCodec(Codec):
+    """A codec able to encode/decode numpy arrays to/from a binary string
+    containing a short text header (dtype and shape) followed by the array
+    data, as it is stored in memory.
+
+    The decoding does not copy the data: the returned array is a read-only
+    view of the given string. Combine it with a compression codec for
+    reducing the size (e.g. `zip_ndarray`).
+
+    Example::
+
+        >>> from taurus.core.util.codecs import CodecFactory
+
+        >>> cf = CodecFactory()
+        >>> codec = cf.getCodec('zip_ndarray')
+        >>>
+        >>> # first encode something
+        >>> data = numpy.arange(100000, dtype='float32').reshape(1000, 100)
+        >>> format, encoded_data = codec.encode(("", data))
+        >>>
+        >>> # now decode it
+        >>> format, decoded_data = codec.decode((format, encoded_data))
+        >>> print decoded_data.dtype, decoded_data.shape
+        float32 (1000, 100)"""
+
+    #: the data is aligned to this number of bytes
+    Alignment = 16
+
+    def encode(self, data, *args, **kwargs):
+        """encodes the given data to a binary string. The given data **must**
+        be a numpy array (or an object that can be converted to a numpy array)
+        of a non-object and non-structured dtype
+
+        :param data: (sequence[str, obj]) a sequence of two elements where the
+                     first item is the encoding format of the second item object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object"""
+        format = 'ndarray'
+        if len(data[0]):
+            format += '_%s' % data[0]
+        array = numpy.array(data[1], copy=False, order='C')
+        if array.dtype.hasobject or array.dtype.fields is not None:
+            raise TypeError('Cannot encode arrays of %s' % array.dtype)
+        header = '%s %s' % (array.dtype.str,
+                            ','.join(str(n) for n in array.shape))
+        # pad the header (ended by a newline) so that the data is aligned
+        size = -(-(len(header) + 1) // self.Alignment) * self.Alignment
+        header = header.ljust(size - 1) + '\n'
+        return format, header + array.tostring()
+
+    def decode(self, data, *args, **kwargs):
+        """decodes the given data from a binary string.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where the
+                     first item is the encoding format of the second item object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object"""
+        if not data[0].startswith('ndarray'):
+            return data
+        format = data[0].partition('_')[2]
+        buf = data[1]
+        offset = buf[:256].find('\n') + 1
+        if offset == 0:
+            raise ValueError('Invalid ndarray header')
+        dtype, shape = buf[:offset].split(' ', 1)
+        shape = tuple(int(n) for n in shape.split(',') if n.strip())
+        array = numpy.frombuffer(buf, dtype=dtype, offset=offset)
+        return format, array.reshape(shape)
+
+
 class FunctionCodec(Codec):
     """A generic function codec"""
 
@@ -846,6 +969,7 @@ class CodecFactory(Singleton, Logger):
         'bz2': BZ2Codec,
         'zip': ZIPCodec,
         'pickle': PickleCodec,
+        'ndarray': NDArrayCodec,
         'plot': PlotCodec,
         'VIDEO_IMAGE': VideoImageCodec,  # deprecated
         'videoimage': VideoImageCodec,
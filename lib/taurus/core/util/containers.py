@@ -240,6 +240,30 @@ class CaselessList(list):
         return CaselessList(list.__rmul__(self, item))
 
 
+# memo of the normalized (lower case) keys of the caseless containers: a
+# lookup in it is cheaper than lowering the key (which creates a new string
+# whose hash has to be computed again)
+_caselessKeys = {}
+
+#: maximum number of keys in the memo (it is cleared when reached)
+CASELESS_KEYS_MAX = 100000
+
+
+def _caseless(key):
+    """returns the (interned, if possible) lower case version of key"""
+    try:
+        return _caselessKeys[key]
+    except KeyError:
+        pass
+    lkey = key.lower()
+    if type(lkey) is str:
+        lkey = intern(lkey)
+    if len(_caselessKeys) >= CASELESS_KEYS_MAX:
+        _caselessKeys.clear()
+    _caselessKeys[key] = lkey
+    return lkey
+
+
 class CaselessDict(dict):
     """A case insensitive dictionary. Use this class as a normal dictionary.
     The keys must be strings"""
@@ -249,49 +273,65 @@ class CaselessDict(dict):
             # Doesn't do keyword args
             if isinstance(other, dict):
                 for k, v in other.items():
-                    dict.__setitem__(self, k.lower(), v)
+                    dict.__setitem__(self, _caseless(k), v)
             else:
                 for k, v in other:
-                    dict.__setitem__(self, k.lower(), v)
+                    dict.__setitem__(self, _caseless(k), v)
 
     def __getitem__(self, key):
-        return dict.__getitem__(self, key.lower())
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        return dict.__getitem__(self, key)
 
     def __setitem__(self, key, value):
-        dict.__setitem__(self, key.lower(), value)
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        dict.__setitem__(self, key, value)
 
     def __contains__(self, key):
-        return dict.__contains__(self, key.lower())
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        return dict.__contains__(self, key)
 
     def has_key(self, key):
         """overwritten from :meth:`dict.has_key`"""
-        return dict.has_key(self, key.lower())
+        return dict.has_key(self, _caseless(key))
 
     def get(self, key, def_val=None):
         """overwritten from :meth:`dict.get`"""
-        return dict.get(self, key.lower(), def_val)
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        return dict.get(self, key, def_val)
 
     def setdefault(self, key, def_val=None):
         """overwritten from :meth:`dict.setdefault`"""
-        return dict.setdefault(self, key.lower(), def_val)
+        return dict.setdefault(self, _caseless(key), def_val)
 
     def update(self, other):
         """overwritten from :meth:`dict.update`"""
         for k, v in other.items():
-            dict.__setitem__(self, k.lower(), v)
+            dict.__setitem__(self, _caseless(k), v)
 
     def fromkeys(self, iterable, value=None):
         d = CaselessDict()
         for k in iterable:
-            dict.__setitem__(d, k.lower(), value)
+            dict.__setitem__(d, _caseless(k), value)
         return d
 
     def pop(self, key, def_val=None):
         """overwritten from :meth:`dict.pop`"""
-        return dict.pop(self, key.lower(), def_val)
+        return dict.pop(self, _caseless(key), def_val)
 
     def __delitem__(self, k):
-        dict.__delitem__(self, k.lower())
+        dict.__delitem__(self, _caseless(k))
 
 
 class CaselessWeakValueDict(weakref.WeakValueDictionary):
@@ -302,49 +342,65 @@ class CaselessWeakValueDict(weakref.WeakValueDictionary):
             # Doesn't do keyword args
             if isinstance(other, dict):
                 for k, v in other.items():
-                    weakref.WeakValueDictionary.__setitem__(self, k.lower(), v)
+                    weakref.WeakValueDictionary.__setitem__(self, _caseless(k), v)
             else:
                 for k, v in other:
-                    weakref.WeakValueDictionary.__setitem__(self, k.lower(), v)
+                    weakref.WeakValueDictionary.__setitem__(self, _caseless(k), v)
 
     def __getitem__(self, key):
-        return weakref.WeakValueDictionary.__getitem__(self, key.lower())
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        return weakref.WeakValueDictionary.__getitem__(self, key)
 
     def __setitem__(self, key, value):
-        weakref.WeakValueDictionary.__setitem__(self, key.lower(), value)
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        weakref.WeakValueDictionary.__setitem__(self, key, value)
 
     def __contains__(self, key):
-        return weakref.WeakValueDictionary.__contains__(self, key.lower())
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        return weakref.WeakValueDictionary.__contains__(self, key)
 
     def has_key(self, key):
         """overwritten from :meth:`weakref.WeakValueDictionary.has_key`"""
-        return weakref.WeakValueDictionary.has_key(self, key.lower())
+        return weakref.WeakValueDictionary.has_key(self, _caseless(key))
 
     def get(self, key, def_val=None):
         """overwritten from :meth:`weakref.WeakValueDictionary.get`"""
-        return weakref.WeakValueDictionary.get(self, key.lower(), def_val)
+        try:
+            key = _caselessKeys[key]
+        except KeyError:
+            key = _caseless(key)
+        return weakref.WeakValueDictionary.get(self, key, def_val)
 
     def setdefault(self, key, def_val=None):
         """overwritten from :meth:`weakref.WeakValueDictionary.setdefault`"""
-        return weakref.WeakValueDictionary.setdefault(self, key.lower(), def_val)
+        return weakref.WeakValueDictionary.setdefault(self, _caseless(key), def_val)
 
     def update(self, other):
         """overwritten from :meth:`weakref.WeakValueDictionary.update`"""
         for k, v in other.items():
-            weakref.WeakValueDictionary.__setitem__(self, k.lower(), v)
+            weakref.WeakValueDictionary.__setitem__(self, _caseless(k), v)
 
     def fromkeys(self, iterable, value=None):
         d = CaselessWeakValueDict()
         for k in iterable:
-            weakref.WeakValueDictionary.__setitem__(d, k.lower(), value)
+            weakref.WeakValueDictionary.__setitem__(d, _caseless(k), value)
         return d
 
     def pop(self, key, def_val=None):
         """overwritten from :meth:`weakref.WeakValueDictionary.pop`"""
-        return weakref.WeakValueDictionary.pop(self, key.lower(), def_val)
+        return weakref.WeakValueDictionary.pop(self, _caseless(key), def_val)
 
     def __delitem__(self, k):
-        weakref.WeakValueDictionary.__delitem__(self, k.lower())
+        weakref.WeakValueDictionary.__delitem__(self, _caseless(k))
 
 
 # {{{ http://code.activestate.com/recipes/576642/ (r10)
@@ -1026,7 +1082,7 @@ class CaselessDefaultDict(defaultdict_fromkey, CaselessDict):
     """
 
     def __getitem__(self, key):
-        return defaultdict_fromkey.__getitem__(self, key.lower())
+        return defaultdict_fromkey.__getitem__(self, _caseless(key))
     pass
 
 
@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides :class:`CurveStats`, which computes descriptive
+statistics of x-y data (e.g. the data of a curve) over arbitrary windows
+without rescanning the data.
+
+The statistics are computed from running aggregates (prefix sums of the
+count, sum, sum of squares and integral of the values, and the minimum and
+maximum of blocks of values) which are updated incrementally when data is
+appended or discarded, as happens with the history buffers of a trend::
+
+    >>> stats = CurveStats()
+    >>> stats.sync(x, y)            # the first time, all the data is processed
+    >>> stats.getStats(limits=(x[10], x[20]))['mean']
+    >>> stats.sync(newx, newy, appended=1, discarded=1)  # only the changes
+"""
+
+__all__ = ["CurveStats"]
+
+__docformat__ = "restructuredtext"
+
+import numpy
+
+
+class CurveStats(object):
+    """Running statistics of x-y data.
+
+    Windows defined by x limits are resolved by bisection when the abscissas
+    are sorted (otherwise the window is computed by masking all the data).
+    """
+
+    #: number of points in each of the blocks for which the minimum and the
+    #: maximum are stored
+    BlockSize = 256
+
+    def __init__(self, x=None, y=None):
+        """
+        :param x: (sequence<float> or None) abscissas
+        :param y: (sequence<float> or None) ordinates (same length as x)
+        """
+        self.reset(x, y)
+
+    def __len__(self):
+        return self._end - self._start
+
+    def reset(self, x=None, y=None):
+        """Discards all the data and, optionally, sets new data
+
+        :param x: (sequence<float> or None) abscissas
+        :param y: (sequence<float> or None) ordinates (same length as x)
+        """
+        self._start = 0
+        self._end = 0
+        self._capacity = 0
+        self._ref = None
+        self._sorted = True
+        self._x = self._y = numpy.zeros(0)
+        # prefix arrays: the item k contains the aggregate of [0,k)
+        self._count = self._sum = self._sum2 = numpy.zeros(1)
+        # the item k contains the integral from point 0 to point k (the
+        # invalid points are skipped, i.e. the gaps are bridged)
+        self._integral = numpy.zeros(1)
+        # absolute index of the last valid point (-1: none)
+        self._lastValid = -1
+        # absolute indices of the min and max of each block (-1: none)
+        self._blockMin = self._blockMax = numpy.zeros(0, dtype=int)
+        if x is not None:
+            self.append(x, y)
+
+    def isSorted(self):
+        """Whether the abscissas are sorted in ascending order
+
+        :return: (bool)
+        """
+        return self._sorted
+
+    def _grow(self, n):
+        """makes room for n more points, compacting or growing the arrays"""
+        needed = self._end + n
+        if needed <= self._capacity:
+            return
+        if self._start > 0:
+            # compact: rebuild from the live data
+            x = self._x[self._start:self._end].copy()
+            y = self._y[self._start:self._end].copy()
+            capacity = max(2 * (len(x) + n), self.BlockSize)
+            self.reset()
+            self._allocate(capacity)
+            self.append(x, y)
+            return
+        self._allocate(max(2 * needed, self.BlockSize))
+
+    def _allocate(self, capacity):
+        end = self._end
+        nblocks = capacity // self.BlockSize + 1
+
+        def resized(a, size, fill=0):
+            r = numpy.empty(size, dtype=a.dtype)
+            r[:len(a)] = a
+            r[len(a):] = fill
+            return r
+        self._x = resized(self._x[:end], capacity)
+        self._y = resized(self._y[:end], capacity)
+        self._count = resized(self._count[:end + 1], capacity + 1)
+        self._sum = resized(self._sum[:end + 1], capacity + 1)
+        self._sum2 = resized(self._sum2[:end + 1], capacity + 1)
+        self._integral = resized(self._integral[:end + 1], capacity + 1)
+        self._blockMin = resized(self._blockMin, nblocks, -1)
+        self._blockMax = resized(self._blockMax, nblocks, -1)
+        self._capacity = capacity
+
+    def append(self, x, y):
+        """Appends data points
+
+        :param x: (float or sequence<float>) abscissas
+        :param y: (float or sequence<float>) ordinates (same length as x)
+        """
+        x = numpy.asarray(x, dtype='d').ravel()
+        y = numpy.asarray(y, dtype='d').ravel()
+        if x.shape != y.shape:
+            raise ValueError('x and y lengths differ')
+        k = len(x)
+        if k == 0:
+            return
+        self._grow(k)
+        e = self._end
+        if self._sorted:
+            if e > self._start and x[0] < self._x[e - 1]:
+                self._sorted = False
+            elif k > 1 and numpy.any(x[1:] < x[:-1]):
+                self._sorted = False
+        valid = ~numpy.isnan(x + y)
+        if self._ref is None and valid.any():
+            # use a reference value to avoid loss of precision in variances
+            self._ref = y[valid][0]
+        ref = self._ref or 0.
+        yr = numpy.where(valid, y - ref, 0.)
+        self._x[e:e + k] = x
+        self._y[e:e + k] = y
+        self._count[e + 1:e + k + 1] = self._count[e] + numpy.cumsum(valid)
+        self._sum[e + 1:e + k + 1] = self._sum[e] + numpy.cumsum(yr)
+        self._sum2[e + 1:e + k + 1] = self._sum2[e] + numpy.cumsum(yr * yr)
+        # trapezoidal integral over the valid points (as if the invalid
+        # ones were masked out)
+        steps = numpy.zeros(k)
+        cur = e + numpy.flatnonzero(valid)
+        if len(cur):
+            # (the first valid point ever starts the integral)
+            first = self._lastValid if self._lastValid >= 0 else cur[0]
+            prev = numpy.concatenate(([first], cur[:-1]))
+            steps[cur - e] = 0.5 * (self._y[cur] + self._y[prev]) * \
+                (self._x[cur] - self._x[prev])
+            self._lastValid = cur[-1]
+        base = self._integral[e - 1] if e > 0 else 0.
+        self._integral[e:e + k] = base + numpy.cumsum(steps)
+        self._end = e + k
+        self._updateBlocks(e, self._end)
+
+    def _validValues(self, i0, i1, fill):
+        """returns the y values in [i0,i1) with invalid ones replaced"""
+        y = self._y[i0:i1]
+        return numpy.where(numpy.isnan(self._x[i0:i1] + y), fill, y)
+
+    def _updateBlocks(self, i0, i1):
+        """recomputes the min/max of the blocks containing [i0,i1)"""
+        B = self.BlockSize
+        b0, b1 = i0 // B, (i1 - 1) // B + 1
+        lo, hi = b0 * B, min(b1 * B, self._end)
+        pad = b1 * B - hi
+        for fill, blocks, argfunc in ((numpy.inf, self._blockMin, numpy.argmin),
+                                      (-numpy.inf, self._blockMax, numpy.argmax)):
+            values = self._validValues(lo, hi, fill)
+            if pad:
+                values = numpy.concatenate((values, numpy.repeat(fill, pad)))
+            values = values.reshape(b1 - b0, B)
+            idx = argfunc(values, axis=1)
+            found = values[numpy.arange(b1 - b0), idx] != fill
+            blocks[b0:b1] = numpy.where(found, lo + numpy.arange(b1 - b0) * B
+                                        + idx, -1)
+
+    def discard(self, n):
+        """Discards the n oldest data points
+
+        :param n: (int) number of points to discard
+        """
+        self._start = min(self._start + max(n, 0), self._end)
+        if self._start == self._end:
+            self.reset()
+
+    def sync(self, x, y, appended=None, discarded=None):
+        """Updates the statistics so that they correspond to the given data.
+
+        If the caller knows how the data changed since the previous call
+        (i.e., how many points were discarded from the beginning and how many
+        were appended at the end, as happens with the history buffers of a
+        trend), only the changes are processed. Otherwise (or if the counts
+        are not consistent with the length of the data), all the data is
+        processed again.
+
+        :param x: (numpy.ndarray) abscissas
+        :param y: (numpy.ndarray) ordinates (same length as x)
+        :param appended: (int or None) number of points appended at the end
+                         since the previous call. None means unknown
+        :param discarded: (int or None) number of points discarded from the
+                          beginning since the previous call. None means
+                          unknown
+        """
+        x = numpy.asarray(x, dtype='d').ravel()
+        y = numpy.asarray(y, dtype='d').ravel()
+        if appended is None or discarded is None:
+            self.reset(x, y)
+            return
+        m, n = len(x), len(self)
+        if n == 0 or discarded < 0 or appended < 0 or \
+                discarded > n or n - discarded + appended != m:
+            self.reset(x, y)
+            return
+        self.discard(discarded)
+        if appended:
+            self.append(x[m - appended:], y[m - appended:])
+
+    def _window(self, limits, inclusive, imin, imax):
+        """returns the absolute index range for the given window"""
+        n = len(self)
+        i0 = self._start + (0 if imin is None else min(max(imin, 0), n))
+        i1 = self._start + (n if imax is None else min(max(imax, 0), n))
+        if limits is not None and i1 > i0:
+            xmin, xmax = limits
+            xs = self._x[i0:i1]
+            if xmax is None:
+                xmax = numpy.inf
+            if xmin is None:
+                xmin = -numpy.inf
+            lo = numpy.searchsorted(xs, xmin, 'left' if inclusive[0] else
+                                    'right')
+            hi = numpy.searchsorted(xs, xmax, 'right' if inclusive[1] else
+                                    'left')
+            i0, i1 = i0 + lo, i0 + max(lo, hi)
+        return i0, i1
+
+    def _extreme(self, i0, i1, blocks, fill, argfunc):
+        """returns the absolute index of the min or max in [i0,i1)"""
+        B = self.BlockSize
+        b0, b1 = -(-i0 // B), i1 // B  # blocks fully contained in [i0,i1)
+        if b1 <= b0:
+            candidates = [i0 + argfunc(self._validValues(i0, i1, fill))]
+        else:
+            candidates = []
+            if i0 < b0 * B:
+                candidates.append(
+                    i0 + argfunc(self._validValues(i0, b0 * B, fill)))
+            inner = blocks[b0:b1]
+            inner = inner[inner >= 0]
+            if len(inner):
+                candidates.append(inner[argfunc(self._y[inner])])
+            if b1 * B < i1:
+                candidates.append(
+                    b1 * B + argfunc(self._validValues(b1 * B, i1, fill)))
+        candidates = [i for i in candidates
+                      if not numpy.isnan(self._x[i] + self._y[i])]
+        if not candidates:
+            return None
+        candidates = numpy.array(candidates)
+        return candidates[argfunc(self._y[candidates])]
+
+    def getStats(self, limits=None, inclusive=(True, True), imin=None,
+                 imax=None, ignorenans=True):
+        """Returns a dict containing several descriptive statistics of a
+        region of the data. The keys of the returned dictionary correspond
+        to:
+
+            - 'x' : the abscissas for the considered points (numpy.array)
+            - 'y' : the ordinates for the considered points (numpy.array)
+            - 'points': number of considered points (int)
+            - 'min' : (x,y) pair of the minimum of the curve (float,float)
+            - 'max' : (x,y) pair of the maximum of the curve (float,float)
+            - 'mean' : arithmetic average of y (float)
+            - 'std' : (biased) standard deviation of y (float)
+            - 'rms' : root mean square of y (float)
+            - 'integral' : integral of y over x using the trapezoidal rule
+              (float)
+
+        Note that some of the values may be None if that cannot be computed.
+
+        :param limits: (None or tuple<float,float>) tuple containing (min,max)
+                       limits. Points whose abscissa is outside of these
+                       limits are ignored. If None is passed (or if any of the
+                       limits is None), the limit is not enforced
+        :param inclusive: (tuple<bool,bool>) whether values exactly equal to
+                          the lower or upper limits are included
+        :param imin: (int) lowest index to be considered. If None is given,
+                     the limit is not enforced
+        :param imax: (int) highest index to be considered. If None is given,
+                     the limit is not enforced
+        :param ignorenans: (bool) if True (default), the points with NaN
+                           values are ignored
+
+        :return: (dict) A dict containing the stats.
+        """
+        if not ignorenans or not self._sorted:
+            return self._getStatsByMasking(limits, inclusive, imin, imax,
+                                           ignorenans)
+        i0, i1 = self._window(limits, inclusive, imin, imax)
+        x, y = self._x[i0:i1], self._y[i0:i1]
+        points = int(self._count[i1] - self._count[i0])
+        if points < len(x):
+            mask = ~numpy.isnan(x + y)
+            x, y = x[mask], y[mask]
+        else:
+            x, y = x.copy(), y.copy()
+        ret = {'x': x, 'y': y, 'points': points, 'min': None, 'max': None,
+               'mean': None, 'std': None, 'rms': None, 'integral': None}
+        if points > 0:
+            ref = self._ref or 0.
+            s1 = (self._sum[i1] - self._sum[i0]) / points
+            s2 = (self._sum2[i1] - self._sum2[i0]) / points
+            mean = ref + s1
+            var = max(s2 - s1 * s1, 0.)
+            imin_ = self._extreme(i0, i1, self._blockMin, numpy.inf,
+                                  numpy.argmin)
+            imax_ = self._extreme(i0, i1, self._blockMax, -numpy.inf,
+                                  numpy.argmax)
+            ret.update({'min': (self._x[imin_], self._y[imin_]),
+                        'max': (self._x[imax_], self._y[imax_]),
+                        'mean': mean,
+                        'std': numpy.sqrt(var),
+                        'rms': numpy.sqrt(var + mean * mean),
+                        'integral': self._integral[i1 - 1] -
+                        self._integral[self._firstValid(i0, i1)]})
+        return ret
+
+    def _firstValid(self, i0, i1):
+        """returns the absolute index of the first valid point in [i0,i1)"""
+        if self._count[i0 + 1] > self._count[i0]:
+            return i0
+        return i0 + numpy.searchsorted(self._count[i0 + 1:i1 + 1],
+                                       self._count[i0] + 1)
+
+    def _getStatsByMasking(self, limits, inclusive, imin, imax, ignorenans):
+        """computes the stats from the data (for unsorted abscissas or when
+        NaNs are not to be ignored)"""
+        n = len(self)
+        i0 = self._start + (0 if imin is None else min(max(imin, 0), n))
+        i1 = self._start + (n if imax is None else min(max(imax, 0), n))
+        x, y = self._x[i0:i1], self._y[i0:i1]
+        if limits is not None:
+            xmin, xmax = limits
+            mask = numpy.ones(x.shape, dtype=bool)
+            if xmin is not None:
+                mask &= (x >= xmin) if inclusive[0] else (x > xmin)
+            if xmax is not None:
+                mask &= (x <= xmax) if inclusive[1] else (x < xmax)
+            x, y = x[mask], y[mask]
+        if ignorenans:
+            mask = ~numpy.isnan(x + y)
+            x, y = x[mask], y[mask]
+        else:
+            x, y = x.copy(), y.copy()
+        ret = {'x': x, 'y': y, 'points': x.size, 'min': None, 'max': None,
+               'mean': None, 'std': None, 'rms': None, 'integral': None}
+        if x.size > 0:
+            argmin = y.argmin()
+            argmax = y.argmax()
+            ret.update({'min': (x[argmin], y[argmin]),
+                        'max': (x[argmax], y[argmax]),
+                        'mean': y.mean(),
+                        'std': y.std(),
+                        'rms': numpy.sqrt(numpy.mean(y ** 2)),
+                        'integral': numpy.trapz(y, x)})
+        return ret
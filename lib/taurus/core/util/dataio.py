@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides functions for exporting and importing sets of x-y data
+(e.g. the curves of a plot) to and from files without building intermediate
+representations of the whole data in memory.
+
+Three formats are supported:
+
+- ``ascii``: tab-separated columns (with ``#``-commented header lines) written
+  in chunks. All the sets must share the same abscissas (a single set can
+  always be written).
+- ``npz``: the numpy zip archive format (see :func:`numpy.savez`)
+- ``raw``: a columnar binary format consisting of a small text header followed
+  by the raw (little-endian float64) contents of each column. Files in this
+  format can be memory-mapped when importing.
+
+Example::
+
+    >>> from taurus.core.util.dataio import exportData, importData
+    >>> x = numpy.arange(1e6)
+    >>> exportData('/tmp/data.raw', {'a': (x, x ** 2), 'b': (x, -x)})
+    >>> for rawdata in importData('/tmp/data.raw'):
+    ...     print rawdata['title'], rawdata['y'][:3]
+    a [ 0.  1.  4.]
+    b [ 0. -1. -2.]
+"""
+
+__all__ = ["ASCII", "NPZ", "RAW", "DEFAULT_CHUNK_SIZE", "getFormatFromFileName",
+           "exportData", "importData", "writeAscii", "writeNpz", "writeRaw",
+           "readAscii", "readNpz", "readRaw", "readRawHeader"]
+
+__docformat__ = "restructuredtext"
+
+import os
+import json
+from datetime import datetime
+
+import numpy
+
+#: ascii format (tab-separated columns)
+ASCII = 'ascii'
+#: numpy zip archive format
+NPZ = 'npz'
+#: memory-mappable columnar binary format
+RAW = 'raw'
+
+#: number of rows written at once
+DEFAULT_CHUNK_SIZE = 10000
+
+_RAW_MAGIC = 'TAURUSRAW'
+_RAW_VERSION = 1
+_RAW_DTYPE = numpy.dtype('<f8')
+_RAW_ALIGNMENT = 16
+
+_EXTENSIONS = {'.npz': NPZ, '.raw': RAW}
+
+
+def getFormatFromFileName(fname):
+    """Returns the format corresponding to the extension of the given file
+    name (ascii is assumed for unknown extensions)
+
+    :param fname: (str) file name
+
+    :return: (str) one of :obj:`ASCII`, :obj:`NPZ` or :obj:`RAW`
+    """
+    ext = os.path.splitext(str(fname))[1].lower()
+    return _EXTENSIONS.get(ext, ASCII)
+
+
+def _asArrays(datadict, sortedNames):
+    if sortedNames is None:
+        sortedNames = sorted(datadict.keys())
+    sets = []
+    for name in sortedNames:
+        x, y = datadict[name]
+        y = numpy.asarray(y)
+        if x is not None:
+            x = numpy.asarray(x)
+            if x.shape != y.shape:
+                raise ValueError('x and y shapes differ for "%s"' % name)
+        sets.append((name, x, y))
+    return sets
+
+
+def exportData(fname, datadict, sortedNames=None, fmt=None, xIsTime=False,
+               chunksize=DEFAULT_CHUNK_SIZE, snapshotTime=None):
+    """Writes the given data sets to a file
+
+    :param fname: (str) output file name
+    :param datadict: (dict<str,tuple>) data sets as ``{name: (x, y)}``, where
+                     x and y are sequences of the same length (x can be None)
+    :param sortedNames: (list<str> or None) the names of the sets to be
+                        exported, in order. If None, all the sets are exported
+                        sorted by name
+    :param fmt: (str or None) one of :obj:`ASCII`, :obj:`NPZ` or :obj:`RAW`.
+                If None, it is guessed from the file name extension
+    :param xIsTime: (bool) whether the abscissas are timestamps
+    :param chunksize: (int) number of rows written at once (ascii and raw)
+    :param snapshotTime: (datetime or None) time to be stored in the header
+                         (now if None)
+    """
+    if fmt is None:
+        fmt = getFormatFromFileName(fname)
+    if snapshotTime is None:
+        snapshotTime = datetime.now()
+    if fmt == ASCII:
+        with open(fname, 'w') as f:
+            writeAscii(f, datadict, sortedNames=sortedNames, xIsTime=xIsTime,
+                       chunksize=chunksize, snapshotTime=snapshotTime)
+    elif fmt == NPZ:
+        writeNpz(fname, datadict, sortedNames=sortedNames, xIsTime=xIsTime,
+                 snapshotTime=snapshotTime)
+    elif fmt == RAW:
+        with open(fname, 'wb') as f:
+            writeRaw(f, datadict, sortedNames=sortedNames, xIsTime=xIsTime,
+                     chunksize=chunksize, snapshotTime=snapshotTime)
+    else:
+        raise ValueError('Unsupported format "%s"' % fmt)
+
+
+def writeAscii(f, datadict, sortedNames=None, xIsTime=False,
+               chunksize=DEFAULT_CHUNK_SIZE, snapshotTime=None):
+    """Writes the data sets to a file object as tab-separated columns (the
+    same layout used by :class:`taurus.qt.qtgui.panel.QDataExportDialog`).
+    The first column contains the abscissas, which must be the same for all
+    the sets.
+
+    :param f: (file) output file object (opened for writing text)
+
+    See :func:`exportData` for the rest of parameters
+    """
+    sets = _asArrays(datadict, sortedNames)
+    if not sets:
+        return
+    if snapshotTime is None:
+        snapshotTime = datetime.now()
+    _, x, _ = sets[0]
+    for name, xi, _ in sets[1:]:
+        if not numpy.array_equal(x, xi):
+            raise ValueError('Cannot export "%s" in the same ascii file: '
+                             'all sets must have the same abscissas' % name)
+    if len(sets) == 1:
+        f.write('# DATASET= "%s"\n' % sets[0][0])
+    else:
+        f.write('# DATASET=  "abscissa"%s\n' %
+                ''.join([' , "%s"' % name for name, _, _ in sets]))
+    f.write('# SNAPSHOT_TIME= %s\n' % snapshotTime.isoformat('_'))
+    ys = [y for _, _, y in sets]
+    n = ys[0].size
+    if x is None:
+        x = numpy.arange(n)
+    for start in xrange(0, n, chunksize):
+        stop = start + chunksize
+        ychunk = numpy.column_stack([y[start:stop] for y in ys])
+        if xIsTime:
+            lines = []
+            for xv, row in zip(x[start:stop], ychunk):
+                t = datetime.fromtimestamp(xv).isoformat('_')
+                lines.append('\t'.join([t] + ['%r' % v for v in row]))
+            f.write('\n'.join(lines) + '\n')
+        else:
+            numpy.savetxt(f, numpy.column_stack((x[start:stop], ychunk)),
+                          fmt='%r', delimiter='\t')
+
+
+def writeNpz(fname, datadict, sortedNames=None, xIsTime=False,
+             snapshotTime=None, compressed=False):
+    """Writes the data sets in numpy zip archive format. For each set, the
+    archive contains the arrays ``x<i>`` and ``y<i>`` (``<i>`` being the set
+    index) and the set names are stored in the ``names`` array.
+
+    :param fname: (str or file) output file name or file object
+    :param compressed: (bool) whether to compress the archive
+
+    See :func:`exportData` for the rest of parameters
+    """
+    sets = _asArrays(datadict, sortedNames)
+    if snapshotTime is None:
+        snapshotTime = datetime.now()
+    arrays = dict(names=numpy.array([name for name, _, _ in sets]),
+                  snapshot_time=numpy.array(snapshotTime.isoformat('_')),
+                  x_is_time=numpy.array(bool(xIsTime)))
+    for i, (_, x, y) in enumerate(sets):
+        if x is not None:
+            arrays['x%i' % i] = x
+        arrays['y%i' % i] = y
+    if compressed:
+        numpy.savez_compressed(fname, **arrays)
+    else:
+        numpy.savez(fname, **arrays)
+
+
+def writeRaw(f, datadict, sortedNames=None, xIsTime=False,
+             chunksize=DEFAULT_CHUNK_SIZE, snapshotTime=None):
+    """Writes the data sets in the raw columnar format: a header line with
+    the format signature and version, a json header describing the sets, and
+    the raw contents of each column (converted to little-endian float64),
+    aligned to 16 bytes.
+
+    :param f: (file) output file object (opened for writing in binary mode)
+
+    See :func:`exportData` for the rest of parameters
+    """
+    sets = _asArrays(datadict, sortedNames)
+    if snapshotTime is None:
+        snapshotTime = datetime.now()
+    columns = []
+    datasets = []
+    offset = 0
+    for name, x, y in sets:
+        d = dict(name=name, x=None)
+        for key, arr in (('x', x), ('y', y)):
+            if arr is None:
+                continue
+            arr = arr.ravel()
+            d[key] = [offset, arr.size]
+            columns.append(arr)
+            offset += arr.size * _RAW_DTYPE.itemsize
+        datasets.append(d)
+    header = json.dumps(dict(datasets=datasets, dtype=_RAW_DTYPE.str,
+                             snapshot_time=snapshotTime.isoformat('_'),
+                             x_is_time=bool(xIsTime)))
+    header = '%s %i\n%s\n' % (_RAW_MAGIC, _RAW_VERSION, header)
+    padding = -(len(header) + 1) % _RAW_ALIGNMENT
+    f.write(header + ' ' * padding + '\n')
+    for arr in columns:
+        for start in xrange(0, arr.size, chunksize):
+            chunk = arr[start:start + chunksize].astype(_RAW_DTYPE)
+            chunk.tofile(f)
+
+
+def importData(fname, fmt=None, xcol=None, mmap=True, **kwargs):
+    """Reads data sets from a file. Returns a list of "rawdata" dictionaries
+    (see :meth:`taurus.qt.qtgui.plot.TaurusPlot.attachRawData`), each with
+    "title", "x" and "y" keys.
+
+    :param fname: (str) input file name
+    :param fmt: (str or None) one of :obj:`ASCII`, :obj:`NPZ` or :obj:`RAW`.
+                If None, it is guessed from the file name extension (and from
+                the file signature)
+    :param xcol: (int or None) (ascii only) index of the column containing
+                 the abscissas. See :func:`readAscii`
+    :param mmap: (bool) (raw only) if True, the arrays are memory-mapped
+                 instead of being read into memory
+    :param kwargs: (ascii only) keyword arguments passed to
+                   :func:`numpy.loadtxt`
+
+    :return: (list<dict>)
+    """
+    if fmt is None:
+        fmt = getFormatFromFileName(fname)
+        if fmt == ASCII and _isRaw(fname):
+            fmt = RAW
+    if fmt == ASCII:
+        return readAscii(fname, xcol=xcol, **kwargs)
+    elif fmt == NPZ:
+        return readNpz(fname)
+    elif fmt == RAW:
+        return readRaw(fname, mmap=mmap)
+    raise ValueError('Unsupported format "%s"' % fmt)
+
+
+def _isRaw(fname):
+    try:
+        with open(fname, 'rb') as f:
+            return f.read(len(_RAW_MAGIC)) == _RAW_MAGIC
+    except IOError:
+        return False
+
+
+def readAscii(fname, xcol=None, **kwargs):
+    """Reads columns from an ascii file using :func:`numpy.loadtxt`. Each
+    column is returned as an independent set (except for the one whose index
+    is xcol, which is used as abscissas)
+
+    :param fname: (str) input file name
+    :param xcol: (int or None) index of the column (starting at 0) containing
+                 the abscissas. If None, the abscissas are not set
+    :param kwargs: keyword arguments passed to :func:`numpy.loadtxt`
+
+    :return: (list<dict>) see :func:`importData`
+    """
+    M = numpy.loadtxt(fname, **kwargs)
+    if len(M.shape) == 1:
+        # make sure we are dealing with a 2D matrix even if it is just
+        # a column
+        M = M.reshape(M.size, 1)
+    x = None if xcol is None else M[:, xcol]
+    ret = []
+    for col in xrange(M.shape[1]):
+        if col == xcol:
+            continue
+        ret.append({"title": "%s[%i]" % (os.path.basename(fname), col),
+                    "x": x, "y": M[:, col]})
+    return ret
+
+
+def readNpz(fname):
+    """Reads the sets from a file written by :func:`writeNpz`
+
+    :param fname: (str) input file name
+
+    :return: (list<dict>) see :func:`importData`
+    """
+    ret = []
+    npz = numpy.load(fname)
+    try:
+        for i, name in enumerate(npz['names']):
+            x = npz['x%i' % i] if 'x%i' % i in npz.files else None
+            ret.append({"title": str(name), "x": x, "y": npz['y%i' % i]})
+    finally:
+        npz.close()
+    return ret
+
+
+def readRawHeader(fname):
+    """Returns the header of a file in raw format and the offset at which
+    the data starts
+
+    :param fname: (str) input file name
+
+    :return: (tuple<dict,int>) header and data offset
+    """
+    with open(fname, 'rb') as f:
+        signature = f.readline().split()
+        if len(signature) != 2 or signature[0] != _RAW_MAGIC:
+            raise ValueError('"%s" is not a valid raw data file' % fname)
+        if int(signature[1]) > _RAW_VERSION:
+            raise ValueError('Unsupported raw data version (%s)' %
+                             signature[1])
+        header = json.loads(f.readline())
+        f.readline()  # padding
+        return header, f.tell()
+
+
+def readRaw(fname, mmap=True):
+    """Reads the sets from a file written by :func:`writeRaw`
+
+    :param fname: (str) input file name
+    :param mmap: (bool) if True, the returned arrays are read-only
+                 memory-mapped views of the file
+
+    :return: (list<dict>) see :func:`importData`
+    """
+    header, dataoffset = readRawHeader(fname)
+    dtype = numpy.dtype(str(header['dtype']))
+
+    def _column(desc, f):
+        if desc is None:
+            return None
+        offset, size = desc
+        if mmap:
+            if size == 0:
+                return numpy.zeros(0, dtype=dtype)
+            return numpy.memmap(fname, dtype=dtype, mode='r',
+                                offset=dataoffset + offset, shape=(size,))
+        f.seek(dataoffset + offset)
+        return numpy.fromfile(f, dtype=dtype, count=size)
+
+    ret = []
+    with open(fname, 'rb') as f:
+        for d in header['datasets']:
+            ret.append({"title": d['name'], "x": _column(d['x'], f),
+                        "y": _column(d['y'], f)})
+    return ret
@@ -27,8 +27,8 @@
 :mod:`logging` system."""
 
 __all__ = ["LogIt", "TraceIt", "DebugIt", "InfoIt", "WarnIt", "ErrorIt",
-           "CriticalIt", "MemoryLogHandler", "LogExceptHook", "Logger",
-           "LogFilter",
+           "CriticalIt", "MemoryLogHandler", "AsyncLogHandler",
+           "LogExceptHook", "Logger", "LogFilter", "LogRateLimitFilter",
            "_log", "trace", "debug", "info", "warning", "error", "fatal",
            "critical", "deprecated", "deprecation_decorator",
            "taurus4_deprecation"]
@@ -44,6 +44,7 @@ import traceback
 import inspect
 import threading
 import functools
+import Queue
 
 from object import Object
 from wrap import wraps
@@ -383,6 +384,153 @@ class MemoryLogHandler(list, logging.handlers.BufferingHandler):
         logging.handlers.BufferingHandler.close(self)
 
 
+class AsyncLogHandler(logging.Handler):
+    """A log handler that passes the records to other handlers from a
+    dedicated thread, so that the thread which logs does not wait for
+    formatting or I/O. The records are stored in a queue of limited capacity
+    (records arriving when the queue is full are discarded and counted in
+    :attr:`dropped`).
+
+    :param handlers: (sequence<logging.Handler>) the handlers to which the
+                     records are passed
+    :param capacity: (int) maximum number of records waiting in the queue"""
+
+    def __init__(self, handlers=(), capacity=10000):
+        logging.Handler.__init__(self)
+        self.handlers = list(handlers)
+        self.dropped = 0
+        self._queue = Queue.Queue(capacity)
+        self._thread = threading.Thread(name=self.__class__.__name__,
+                                        target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def addHandler(self, handler):
+        """Adds a handler to which records are passed
+
+           :param handler: (logging.Handler) the handler
+        """
+        if handler not in self.handlers:
+            self.handlers.append(handler)
+
+    def removeHandler(self, handler):
+        """Removes the given handler
+
+           :param handler: (logging.Handler) the handler
+        """
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+
+    def emit(self, record):
+        """Queues the record (see :meth:`logging.Handler.emit`)"""
+        try:
+            self._queue.put_nowait(record)
+        except Queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                for handler in list(self.handlers):
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            except Exception:
+                self.handleError(record)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Waits until all queued records have been handled and flushes the
+        handlers"""
+        if threading.current_thread() is not self._thread and \
+                self._thread.is_alive():
+            self._queue.join()
+        for handler in self.handlers:
+            handler.flush()
+
+    sync = flush
+
+    def close(self):
+        """Handles the remaining records and stops the dispatching thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            if threading.current_thread() is not self._thread:
+                self._thread.join()
+        logging.Handler.close(self)
+
+
+class LogRateLimitFilter(logging.Filter):
+    """A log filter that rejects records identical to a previously accepted
+    one (same logger, level, call site, message and arguments) if they arrive
+    less than *period* seconds after it. The number of rejected records is
+    noted in the message of the next accepted one.
+
+    :param period: (float) minimum time (in seconds) between identical
+                   records"""
+
+    #: maximum number of different records remembered
+    MaxEntries = 1000
+
+    def __init__(self, period):
+        logging.Filter.__init__(self)
+        self.period = period
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def _key(self, record):
+        msg = record.msg
+        if not isinstance(msg, basestring):
+            # e.g. a lazily formatted traceback: use the call site only
+            msg = type(msg)
+        key = (record.name, record.levelno, record.pathname, record.lineno,
+               msg, record.args)
+        try:
+            hash(key)
+        except TypeError:
+            key = key[:-1] + (repr(record.args),)
+        return key
+
+    def filter(self, record):
+        key = self._key(record)
+        now = record.created
+        with self._lock:
+            entry = self._last.get(key)
+            if entry is not None and now - entry[0] < self.period:
+                entry[1] += 1
+                return False
+            if len(self._last) >= self.MaxEntries:
+                self._last = dict((k, v) for k, v in self._last.iteritems()
+                                  if now - v[0] < self.period)
+            self._last[key] = [now, 0]
+        if entry is not None and entry[1]:
+            record.msg = _LazyMessage(_suppressedNote, record.msg, entry[1])
+        return True
+
+
+class _LazyMessage(object):
+    """A log message which is formatted only if it is needed (i.e., when a
+    handler converts it to a string)"""
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._func(*self._args)
+            # release the references (e.g. to traceback frames)
+            self._func = self._args = None
+        return self._text
+
+
+def _suppressedNote(msg, n):
+    return '%s [%d identical record(s) suppressed]' % (msg, n)
+
+
 class LogExceptHook(BaseExceptHook):
     """A callable class that acts as an excepthook that logs the exception in
     the python logging system.
@@ -431,6 +579,15 @@ class _Logger(logging.Logger):
             break
         return rv
 
+    def handle(self, record):
+        """Reimplemented from :meth:`logging.Logger.handle` to apply the rate
+        limit (see :meth:`Logger.setLogRateLimit`)"""
+        rate_limit_filter = Logger.rate_limit_filter
+        if rate_limit_filter is not None and \
+                not rate_limit_filter.filter(record):
+            return
+        logging.Logger.handle(self, record)
+
 
 class Logger(Object):
     """The taurus logger class. All taurus pertinent classes should inherit
@@ -482,6 +639,13 @@ class Logger(Object):
     #: the main stream handler
     stream_handler = None
 
+    #: the handler dispatching the root records asynchronously (None if
+    #: asynchronous log output is disabled)
+    async_handler = None
+
+    #: the filter applying the rate limit (None if disabled)
+    rate_limit_filter = None
+
     def __init__(self, name='', parent=None, format=None):
         """The Logger constructor
 
@@ -542,8 +706,80 @@ class Logger(Object):
             Logger.root_inited = True
         finally:
             cls.root_init_lock.release()
+        try:
+            from taurus import tauruscustomsettings
+        except ImportError:
+            pass
+        else:
+            if getattr(tauruscustomsettings, 'ASYNC_LOG_OUTPUT', False):
+                cls.setAsyncLogOutput(True)
+            cls.setLogRateLimit(getattr(tauruscustomsettings,
+                                        'LOG_RATE_LIMIT', 0))
         return root_logger
 
+    @classmethod
+    def _getRootHandlerOwner(cls):
+        """returns the object to which the root handlers are attached"""
+        root_logger = cls.initRoot()
+        return cls.async_handler or root_logger
+
+    @classmethod
+    def setAsyncLogOutput(cls, enable):
+        """Enables/disables the asynchronous log output. When enabled, the
+           handlers of the root logger are moved behind an
+           :class:`AsyncLogHandler`, so that the threads which log do not
+           wait for the records to be formatted and written.
+
+           :param enable: (bool) whether to enable the asynchronous output
+        """
+        root_logger = cls.initRoot()
+        if bool(enable) == (cls.async_handler is not None):
+            return
+        if enable:
+            handlers = list(root_logger.handlers)
+            async_handler = AsyncLogHandler(handlers)
+            for h in handlers:
+                root_logger.removeHandler(h)
+            root_logger.addHandler(async_handler)
+            cls.async_handler = async_handler
+        else:
+            async_handler, cls.async_handler = cls.async_handler, None
+            root_logger.removeHandler(async_handler)
+            async_handler.close()
+            for h in async_handler.handlers:
+                root_logger.addHandler(h)
+
+    @classmethod
+    def isAsyncLogOutput(cls):
+        """Returns whether the asynchronous log output is enabled
+
+           :return: (bool)
+        """
+        return cls.async_handler is not None
+
+    @classmethod
+    def setLogRateLimit(cls, period):
+        """Sets the minimum time between identical records (see
+           :class:`LogRateLimitFilter`)
+
+           :param period: (float) time in seconds. Use 0 to disable the rate
+                          limit
+        """
+        if period > 0:
+            cls.rate_limit_filter = LogRateLimitFilter(period)
+        else:
+            cls.rate_limit_filter = None
+
+    @classmethod
+    def getLogRateLimit(cls):
+        """Returns the minimum time between identical records
+
+           :return: (float) time in seconds (0 if the rate limit is disabled)
+        """
+        if cls.rate_limit_filter is None:
+            return 0
+        return cls.rate_limit_filter.period
+
     @classmethod
     def addRootLogHandler(cls, h):
         """Adds a new handler to the root logger
@@ -551,7 +787,7 @@ class Logger(Object):
            :param h: (logging.Handler) the new log handler
         """
         h.setFormatter(cls.getLogFormat())
-        cls.initRoot().addHandler(h)
+        cls._getRootHandlerOwner().addHandler(h)
 
     @classmethod
     def removeRootLogHandler(cls, h):
@@ -559,21 +795,21 @@ class Logger(Object):
 
            :param h: (logging.Handler) the handler to be removed
         """
-        cls.initRoot().removeHandler(h)
+        cls._getRootHandlerOwner().removeHandler(h)
 
     @classmethod
     def enableLogOutput(cls):
         """Enables the :class:`logging.StreamHandler` which dumps log records,
            by default, to the stderr.
         """
-        cls.initRoot().addHandler(cls.stream_handler)
+        cls._getRootHandlerOwner().addHandler(cls.stream_handler)
 
     @classmethod
     def disableLogOutput(cls):
         """Disables the :class:`logging.StreamHandler` which dumps log records,
            by default, to the stderr.
         """
-        cls.initRoot().removeHandler(cls.stream_handler)
+        cls._getRootHandlerOwner().removeHandler(cls.stream_handler)
 
     @classmethod
     def setLogLevel(cls, level):
@@ -600,7 +836,10 @@ class Logger(Object):
         """
         cls.log_format = logging.Formatter(format)
         root_logger = cls.initRoot()
-        for h in root_logger.handlers:
+        handlers = list(root_logger.handlers)
+        if cls.async_handler is not None:
+            handlers += cls.async_handler.handlers
+        for h in handlers:
             h.setFormatter(cls.log_format)
 
     @classmethod
@@ -726,20 +965,48 @@ class Logger(Object):
         """
         self.log_obj.log(self.Trace, msg, *args, **kw)
 
+    def isLogLevelEnabled(self, level):
+        """Returns whether a record of the given level logged by this object
+           would be accepted by any handler (taking into account the level of
+           the loggers and of the handlers)
+
+           :param level: (int) the record level
+
+           :return: (bool)
+        """
+        logger = self.log_obj
+        if not logger.isEnabledFor(level):
+            return False
+        while logger is not None:
+            for handler in logger.handlers:
+                if level >= handler.level:
+                    return True
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        return False
+
     def traceback(self, level=Trace, extended=True):
         """Log the usual traceback information, followed by a listing of all the
            local variables in each frame.
 
+           The traceback is only formatted and logged if the level is enabled
+           (see :meth:`isLogLevelEnabled`).
+
            :param level: (int) the log level assigned to the traceback record
            :param extended: (bool) if True, the log record message will have multiple lines
 
-           :return: (str) The traceback string representation
+           :return: (str) The traceback string representation (or an empty
+                    string if the level is not enabled)
         """
-        out = traceback.format_exc()
-        if extended:
-            out += "\n"
-            out += self._format_trace()
-
+        if not self.isLogLevelEnabled(level):
+            return ''
+        exc_info = sys.exc_info()
+        try:
+            out = self._format_exc(exc_info, extended)
+        finally:
+            # do not keep the traceback frames alive
+            del exc_info
         self.log_obj.log(level, out)
         return out
 
@@ -747,16 +1014,40 @@ class Logger(Object):
         """Log the usual stack information, followed by a listing of all the
            local variables in each frame.
 
+           The stack is only formatted and logged if the level is enabled
+           (see :meth:`isLogLevelEnabled`).
+
            :param target: (int) the log level assigned to the record
 
-           :return: (str) The stack string representation
+           :return: (str) The stack string representation (or an empty
+                    string if the level is not enabled)
         """
-        out = self._format_stack()
+        if not self.isLogLevelEnabled(target):
+            return ''
+        stack_func = functools.partial(inspect.getouterframes,
+                                       sys._getframe(1))
+        try:
+            out = self._format_stack(stack_func)
+        finally:
+            # do not keep the caller frames alive
+            del stack_func
         self.log_obj.log(target, out)
         return out
 
-    def _format_trace(self):
-        return self._format_stack(inspect.trace)
+    def _format_exc(self, exc_info, extended=True):
+        out = "".join(traceback.format_exception(*exc_info))
+        if extended:
+            out += "\n"
+            out += self._format_trace(exc_info[2])
+        return out
+
+    def _format_trace(self, tb=None):
+        if tb is None:
+            tb = sys.exc_info()[2]
+        if tb is None:
+            return ''
+        return self._format_stack(
+            lambda context: inspect.getinnerframes(tb, context))
 
     def _format_stack(self, stack_func=inspect.stack):
         line_count = 3
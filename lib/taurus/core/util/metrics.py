@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""A lightweight registry of runtime metrics (counters, latency histograms
+and gauges) of the taurus core: events fired by each attribute and the time
+spent in their listeners, events received from Tango and dropped, polling
+latencies and the jobs of the thread pools.
+
+The registry is disabled by default (see the `METRICS_ENABLED` custom
+setting), in which case the instrumented code only checks the
+:attr:`MetricsRegistry.enabled` flag. Once enabled, it can be queried::
+
+    from taurus.core.util.metrics import MetricsRegistry
+    m = MetricsRegistry()
+    m.enable()
+    ...
+    print m.top('events', 10)  # the 10 attributes firing more events
+    print m.format()           # all the metrics as text
+    m.export('/tmp/taurus_metrics.txt')
+
+The metrics are updated without locks: under heavy contention a few
+increments may be lost, but the instrumented threads never block on the
+registry.
+"""
+
+__all__ = ["MetricsRegistry", "Histogram", "main"]
+
+__docformat__ = "restructuredtext"
+
+import bisect
+import time
+
+from .singleton import Singleton
+from .log import Logger
+
+
+class Histogram(object):
+    """Count, total, max and distribution of measured durations (in seconds).
+    The buckets are decades from 10us to 1s (plus a last one for longer
+    durations)"""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    #: upper bounds of the buckets (s)
+    Bounds = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.)
+
+    #: labels of the buckets
+    Labels = ('<10us', '<100us', '<1ms', '<10ms', '<100ms', '<1s', '>=1s')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.
+        self.max = 0.
+        self.buckets = [0] * (len(self.Bounds) + 1)
+
+    def add(self, value):
+        """Adds a measured duration (s)"""
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.buckets[bisect.bisect_right(self.Bounds, value)] += 1
+
+    def mean(self):
+        """Returns the mean duration (s)"""
+        return self.total / self.count if self.count else 0.
+
+    def toDict(self):
+        """Returns a dictionary with the count, total, mean and max (s) and
+        the bucket counts"""
+        return dict(count=self.count, total=self.total, mean=self.mean(),
+                    max=self.max, buckets=dict(zip(self.Labels, self.buckets)))
+
+
+class MetricsRegistry(Singleton, Logger):
+    """Singleton registry of runtime metrics. Each metric (e.g. "events") is
+    a dictionary of values per key (e.g. per attribute name) that can be a
+    counter (see :meth:`count`), a :class:`Histogram` of durations (see
+    :meth:`observe`) or a gauge, for which the last and the maximum values
+    are kept (see :meth:`setGauge`).
+
+    The instrumented code must check :attr:`enabled` before updating the
+    metrics (the update methods do not check it)
+    """
+
+    #: whether the metrics are being recorded. Do not set it directly (use
+    #: :meth:`enable` or :meth:`disable` instead)
+    enabled = False
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization."""
+        import taurus.tauruscustomsettings
+        name = self.__class__.__name__
+        self.call__init__(Logger, name)
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._start = time.time()
+        self._exportFile = None
+        if getattr(taurus.tauruscustomsettings, 'METRICS_ENABLED', False):
+            self.enable()
+        fname = getattr(taurus.tauruscustomsettings, 'METRICS_EXPORT_FILE',
+                        None)
+        if fname:
+            self.exportAtExit(fname)
+
+    def enable(self):
+        """Starts recording the metrics"""
+        MetricsRegistry.enabled = True
+
+    def disable(self):
+        """Stops recording the metrics (the recorded ones are kept)"""
+        MetricsRegistry.enabled = False
+
+    def isEnabled(self):
+        """Returns whether the metrics are being recorded
+
+        :return: (bool)
+        """
+        return self.enabled
+
+    def reset(self):
+        """Discards all the recorded metrics"""
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._start = time.time()
+
+    def count(self, name, key, n=1):
+        """Increments a counter
+
+        :param name: (str) metric name (e.g. "events")
+        :param key: (str) the key (e.g. the attribute full name)
+        :param n: (int) the increment
+        """
+        d = self._counters.get(name)
+        if d is None:
+            d = self._counters.setdefault(name, {})
+        d[key] = d.get(key, 0) + n
+
+    def observe(self, name, key, duration):
+        """Adds a duration to a histogram
+
+        :param name: (str) metric name (e.g. "poll")
+        :param key: (str) the key (e.g. the device full name)
+        :param duration: (float) the duration (s)
+        """
+        d = self._histograms.get(name)
+        if d is None:
+            d = self._histograms.setdefault(name, {})
+        h = d.get(key)
+        if h is None:
+            h = d.setdefault(key, Histogram())
+        h.add(duration)
+
+    def setGauge(self, name, key, value):
+        """Sets the value of a gauge
+
+        :param name: (str) metric name (e.g. "queue")
+        :param key: (str) the key (e.g. the thread pool name)
+        :param value: (float) the value
+        """
+        d = self._gauges.get(name)
+        if d is None:
+            d = self._gauges.setdefault(name, {})
+        g = d.get(key)
+        if g is None:
+            d[key] = [value, value]
+        else:
+            g[0] = value
+            if value > g[1]:
+                g[1] = value
+
+    def getNames(self):
+        """Returns the names of the recorded metrics
+
+        :return: (list<str>)
+        """
+        return sorted(set(self._counters) | set(self._histograms) |
+                      set(self._gauges))
+
+    def get(self, name):
+        """Returns the values of a metric
+
+        :param name: (str) metric name
+
+        :return: (dict) key -> value, where the value is an int for the
+                 counters, a dictionary (see :meth:`Histogram.toDict`) for
+                 the histograms and a dictionary with the last and max
+                 values for the gauges
+        """
+        if name in self._counters:
+            return dict(self._counters[name])
+        if name in self._histograms:
+            return dict((k, h.toDict())
+                        for k, h in self._histograms[name].items())
+        if name in self._gauges:
+            return dict((k, dict(last=g[0], max=g[1]))
+                        for k, g in self._gauges[name].items())
+        return {}
+
+    def getAll(self):
+        """Returns all the metrics
+
+        :return: (dict) metric name -> values (see :meth:`get`)
+        """
+        return dict((name, self.get(name)) for name in self.getNames())
+
+    def top(self, name, n=10):
+        """Returns the keys with the highest values of a metric: the counts
+        for the counters, the total times for the histograms and the maximum
+        values for the gauges
+
+        :param name: (str) metric name
+        :param n: (int) number of keys (None for all)
+
+        :return: (list<tuple>) (key, value) sorted by decreasing value
+        """
+        if name in self._counters:
+            items = self._counters[name].items()
+        elif name in self._histograms:
+            items = [(k, h.total) for k, h in self._histograms[name].items()]
+        else:
+            items = [(k, g[1]) for k, g in self._gauges.get(name, {}).items()]
+        items = sorted(items, key=lambda item: item[1], reverse=True)
+        return items[:n]
+
+    def format(self, n=None):
+        """Returns the metrics as text, sorted as in :meth:`top`
+
+        :param n: (int) maximum number of keys per metric (None for all)
+
+        :return: (str)
+        """
+        elapsed = time.time() - self._start
+        lines = ['# taurus metrics (%.1f s, %s)' %
+                 (elapsed, time.strftime('%Y-%m-%d %H:%M:%S'))]
+        for name in self.getNames():
+            lines.append('')
+            if name in self._counters:
+                lines.append('[%s] count rate(/s)' % name)
+                for key, value in self.top(name, n):
+                    lines.append('%s %d %.2f' % (key, value,
+                                                 value / elapsed))
+            elif name in self._histograms:
+                lines.append('[%s] count mean(ms) max(ms) total(s) %s' %
+                             (name, ' '.join(Histogram.Labels)))
+                hists = self._histograms[name]
+                for key, _ in self.top(name, n):
+                    h = hists[key]
+                    lines.append('%s %d %.3f %.3f %.3f %s' % (
+                        key, h.count, 1e3 * h.mean(), 1e3 * h.max, h.total,
+                        ' '.join(str(b) for b in h.buckets)))
+            else:
+                lines.append('[%s] last max' % name)
+                gauges = self._gauges[name]
+                for key, _ in self.top(name, n):
+                    lines.append('%s %g %g' % (key, gauges[key][0],
+                                               gauges[key][1]))
+        return '\n'.join(lines) + '\n'
+
+    def export(self, fname, n=None):
+        """Writes the metrics (see :meth:`format`) to a text file
+
+        :param fname: (str) the file name
+        :param n: (int) maximum number of keys per metric (None for all)
+        """
+        with open(fname, 'w') as f:
+            f.write(self.format(n))
+
+    def exportAtExit(self, fname):
+        """Exports the metrics to the given file when the program exits
+
+        :param fname: (str) the file name (None for not exporting)
+        """
+        if self._exportFile is None and fname is not None:
+            import atexit
+            atexit.register(self._exportAtExit)
+        self._exportFile = fname
+
+    def _exportAtExit(self):
+        if self._exportFile is not None:
+            try:
+                self.export(self._exportFile)
+            except Exception:
+                self.warning('Cannot export the metrics to %s',
+                             self._exportFile)
+
+
+def main():
+    import optparse
+    import taurus
+    # the registry of the taurus module (not of __main__, if run as script)
+    from taurus.core.util.metrics import MetricsRegistry
+
+    parser = optparse.OptionParser(
+        usage='%prog [options] model [model ...]',
+        description='Listens to the given attributes for a while and prints '
+                    'the taurus metrics (events per attribute, time spent in '
+                    'the listeners, polling, thread pools...)')
+    parser.add_option('--duration', type='float', default=10.,
+                      help='listening time (s) [default: %default]')
+    parser.add_option('--top', type='int', default=20,
+                      help='maximum number of keys per metric '
+                           '[default: %default]')
+    parser.add_option('--output', help='write the metrics to a text file')
+    options, args = parser.parse_args()
+    if not args:
+        parser.error('no models given')
+
+    metrics = MetricsRegistry()
+    metrics.reset()
+    metrics.enable()
+
+    def listener(src, evt_type, evt_value):
+        pass
+
+    attrs = [taurus.Attribute(name) for name in args]
+    for a in attrs:
+        a.addListener(listener)
+    try:
+        time.sleep(options.duration)
+    except KeyboardInterrupt:
+        pass
+    for a in attrs:
+        a.removeListener(listener)
+    metrics.disable()
+    if options.output:
+        metrics.export(options.output, options.top)
+    else:
+        print metrics.format(options.top)
+
+
+if __name__ == '__main__':
+    main()
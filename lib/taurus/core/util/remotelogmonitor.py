@@ -28,16 +28,23 @@
 from __future__ import print_function
 from __future__ import with_statement
 
-__all__ = ["LogRecordStreamHandler", "LogRecordSocketReceiver", "log"]
+__all__ = ["LogRecordStreamHandler", "LogRecordSocketReceiver",
+           "LogRecordSelectorReceiver", "log"]
 
 import time
+import errno
+import select
 import socket
-import pickle
 import logging
 import logging.handlers
 import struct
 import weakref
 
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
 try:
     import socketserver
 except:
@@ -57,13 +64,14 @@ class LogRecordStreamHandler(socketserver.StreamRequestHandler):
         self.hostName = self.server.hostName
         self.server.registerHandler(self)
         while not stop:
-            chunk = self.connection.recv(4)
+            # rfile.read loops until the requested size is read
+            chunk = self.rfile.read(4)
             if len(chunk) < 4:
                 break
             slen = struct.unpack('>L', chunk)[0]
-            chunk = self.connection.recv(slen)
-            while len(chunk) < slen:
-                chunk = chunk + self.connection.recv(slen - len(chunk))
+            chunk = self.rfile.read(slen)
+            if len(chunk) < slen:
+                break
             obj = self.unPickle(chunk)
             record = self.makeLogRecord(obj)
             self.handleLogRecord(record)
@@ -145,6 +153,193 @@ class LogRecordSocketReceiver(socketserver.ThreadingTCPServer):
         self.socket.close()
 
 
+class _Connection(object):
+    """a sender connection of :class:`LogRecordSelectorReceiver`"""
+
+    def __init__(self, sock, address, bufsize):
+        self.sock = sock
+        self.address = address
+        self.buf = bytearray(bufsize)
+        self.start = 0  # start of the unprocessed data
+        self.end = 0  # end of the received data
+
+
+class LogRecordSelectorReceiver(object):
+    """
+    TCP socket-based logging receiver (for :class:`logging.SocketHandler`
+    senders) which serves all the connections from a single thread.
+
+    The data is received in a reusable buffer per connection, the records are
+    optionally filtered by name and level, and they are passed in batches to
+    :meth:`handleLogRecords` (by default, to the logger given as the `logger`
+    keyword argument or to the logger of the record name).
+    """
+
+    allow_reuse_address = True
+
+    #: initial size of the receive buffer of each connection
+    BufferSize = 64 * 1024
+
+    #: maximum size of a record. Connections sending bigger ones are closed
+    MaxRecordSize = 64 * 1024 * 1024
+
+    #: maximum number of records passed to :meth:`handleLogRecords` at once
+    BatchSize = 1000
+
+    def __init__(self, host='localhost',
+                 port=logging.handlers.DEFAULT_TCP_LOGGING_PORT,
+                 name=None, level=None, **kwargs):
+        """
+        :param host: (str) host name or address to listen to
+        :param port: (int) port to listen to (0 for any free port, see
+                     :attr:`port`)
+        :param name: (str) if given, only the records of the logger with
+                     this name are accepted
+        :param level: (int) if given, only the records with this level or
+                      higher are accepted
+        :param kwargs: extra data, available as the :attr:`data` dictionary
+        """
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if self.allow_reuse_address:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen(socket.SOMAXCONN)
+        self.socket.setblocking(0)
+        try:
+            self.hostName = socket.gethostbyaddr(host)[0]
+        except socket.error:
+            self.hostName = host
+        self.port = self.socket.getsockname()[1]
+        self.name = name
+        self.level = level
+        # the name is looked for in the pickled data before unpickling it
+        self._rawName = None
+        if name is not None:
+            try:
+                self._rawName = str(name).encode('ascii')
+            except (UnicodeError, UnicodeEncodeError):
+                pass
+        self.timeout = 1
+        self.data = kwargs
+        self._connections = {}
+        self._stop = 0
+        self._stopped = 0
+
+    def serve_until_stopped(self):
+        """Serves the connections until :meth:`stop` is called"""
+        self._stopped = 0
+        while not self._stop:
+            socks = [self.socket] + list(self._connections)
+            try:
+                rd, _, _ = select.select(socks, [], [], self.timeout)
+            except select.error as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+            records = []
+            for sock in rd:
+                if sock is self.socket:
+                    self._accept()
+                else:
+                    self._read(self._connections[sock], records)
+                if len(records) >= self.BatchSize:
+                    self.handleLogRecords(records)
+                    records = []
+            if records:
+                self.handleLogRecords(records)
+        for sock in list(self._connections):
+            self._close(sock)
+        self.socket.close()
+        self._stopped = 1
+
+    def _accept(self):
+        try:
+            sock, address = self.socket.accept()
+        except socket.error:
+            return
+        sock.setblocking(0)
+        self._connections[sock] = _Connection(sock, address, self.BufferSize)
+
+    def _close(self, sock):
+        self._connections.pop(sock, None)
+        try:
+            sock.close()
+        except socket.error:
+            pass
+
+    def _read(self, conn, records):
+        buf = conn.buf
+        if conn.end == len(buf):
+            if conn.start:
+                # reuse the buffer: move the unprocessed data to its start
+                n = conn.end - conn.start
+                buf[:n] = buf[conn.start:conn.end]
+                conn.start, conn.end = 0, n
+            else:
+                buf.extend(bytearray(len(buf)))
+        try:
+            n = conn.sock.recv_into(memoryview(buf)[conn.end:])
+        except socket.error as e:
+            if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return
+            n = 0
+        if not n:
+            self._close(conn.sock)
+            return
+        conn.end += n
+        start, end = conn.start, conn.end
+        while end - start >= 4:
+            slen = struct.unpack_from('>L', buf, start)[0]
+            if slen > self.MaxRecordSize:
+                self._close(conn.sock)
+                return
+            if end - start - 4 < slen:
+                if slen + 4 > len(buf):
+                    buf.extend(bytearray(slen + 4 - len(buf)))
+                break
+            start += 4
+            record = self.makeLogRecord(buf, start, slen, conn)
+            start += slen
+            if record is not None:
+                records.append(record)
+        if start == end:
+            start = end = 0
+        conn.start, conn.end = start, end
+
+    def makeLogRecord(self, buf, start, size, conn):
+        """Returns the log record for the data at the given position of the
+        buffer, or None if it is filtered out"""
+        raw = bytes(buf[start:start + size])
+        if self._rawName is not None and self._rawName not in raw:
+            return None
+        record = logging.makeLogRecord(pickle.loads(raw))
+        if self.level is not None and record.levelno < self.level:
+            return None
+        if self.name is not None and record.name != self.name:
+            return None
+        if not hasattr(record, 'hostName'):
+            record.hostName = self.hostName
+        return record
+
+    def handleLogRecords(self, records):
+        """Handles a batch of records. Reimplement it for processing the
+        records in a different way
+
+        :param records: (list<logging.LogRecord>) the records
+        """
+        logger = self.data.get("logger")
+        for record in records:
+            lg = logger or logging.getLogger(record.name)
+            if lg.isEnabledFor(record.levelno):
+                lg.handle(record)
+
+    def stop(self):
+        """Stops serving (and waits until it is done)"""
+        self._stop = True
+        while not self._stopped:
+            time.sleep(0.1)
+
+
 class LogNameFilter(logging.Filter):
 
     def __init__(self, name=None):
@@ -161,14 +356,11 @@ def log(host, port, name=None, level=None):
     local_logger_name = "RemoteLogger.%s.%d" % (host, port)
     local_logger = logging.getLogger(local_logger_name)
 
-    if name is not None:
-        local_logger.addFilter(LogNameFilter(name=name))
-
     if level is not None:
         local_logger.setLevel(level)
 
-    tcpserver = LogRecordSocketReceiver(host=host, port=port,
-                                        logger=local_logger)
+    tcpserver = LogRecordSelectorReceiver(host=host, port=port, name=name,
+                                          level=level, logger=local_logger)
     msg = "logging for '%s' on port %d" % (host, port)
     if name is not None:
         msg += " for " + name
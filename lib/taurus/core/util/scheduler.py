@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Scheduling of calls in a background thread.
+
+A :class:`Scheduler` runs the calls scheduled on it, at the given times and
+in a single daemon thread (started when the first call is scheduled and
+stopped at exit)::
+
+    from taurus.core.util.scheduler import Scheduler
+    scheduler = Scheduler('MyScheduler')
+    call = scheduler.schedule(time.time() + 1, obj.method, arg)
+    ...
+    scheduler.cancel(call)
+
+Calls with the same time are run in the order in which they were scheduled
+(e.g., passing 0 as time queues the calls to be run as soon as possible).
+"""
+
+__all__ = ["Scheduler"]
+
+__docformat__ = 'restructuredtext'
+
+import atexit
+import heapq
+import itertools
+import threading
+import time
+
+from .log import Logger
+
+
+class Scheduler(Logger):
+    """Runs scheduled calls in a background thread"""
+
+    def __init__(self, name, setup=None):
+        """
+        :param name: (str) the name of the thread (and of the logger)
+        :param setup: (callable or None) called (without arguments) in the
+                      thread before running any scheduled call
+        """
+        Logger.__init__(self, name)
+        self._name = name
+        self._setup = setup
+        # heap of [time, sequence, callable, args] entries (the callable of
+        # the cancelled entries is set to None)
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def schedule(self, t, method, *args):
+        """Schedules a call of `method(*args)` at the given time
+
+        :param t: (float) the time (as returned by :func:`time.time`)
+        :param method: (callable) the method to be called
+        :param args: the arguments for the method
+
+        :return: (object) the scheduled call (see :meth:`cancel`)
+        """
+        entry = [t, next(self._sequence), method, args]
+        with self._condition:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(name=self._name,
+                                                target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+                atexit.register(self.stop)
+            self._condition.notify()
+        return entry
+
+    def cancel(self, call):
+        """Cancels a scheduled call (nothing is done if it already ran)
+
+        :param call: (object) the scheduled call, as returned by
+                     :meth:`schedule`
+        """
+        with self._condition:
+            call[2] = call[3] = None
+
+    def pending(self):
+        """Returns the number of pending calls
+
+        :return: (int)
+        """
+        with self._condition:
+            return sum(1 for e in self._heap if e[2] is not None)
+
+    def stop(self):
+        """Stops the thread (the pending calls are not run)"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(1)
+
+    def _next(self):
+        """waits for the next due call and returns it (or returns None if
+        the scheduler is stopped)"""
+        heap = self._heap
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+                while heap and heap[0][2] is None:
+                    heapq.heappop(heap)
+                if not heap:
+                    self._condition.wait()
+                    continue
+                delay = heap[0][0] - time.time()
+                if delay <= 0:
+                    entry = heapq.heappop(heap)
+                    method, args = entry[2], entry[3]
+                    entry[2] = entry[3] = None
+                    return method, args
+                self._condition.wait(delay)
+
+    def _run(self):
+        if self._setup is not None:
+            self._setup()
+        while True:
+            call = self._next()
+            if call is None:
+                return
+            method, args = call
+            try:
+                method(*args)
+            except Exception:
+                self.warning('Error in scheduled call to %s', method)
+                self.debug('Details:', exc_info=1)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.archiving"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy
+from taurus.test import insertTest
+from taurus.core.util.archiving import (IntervalSet, ArchivingBackfill,
+                                        SQLiteArchivingReader)
+
+
+@insertTest(helper_name='missing', added=[], interval=(0, 10),
+            expected=[(0, 10)])
+@insertTest(helper_name='missing', added=[(2, 4)], interval=(0, 10),
+            expected=[(0, 2), (4, 10)])
+@insertTest(helper_name='missing', added=[(2, 4), (3, 6), (8, 12)],
+            interval=(0, 10), expected=[(0, 2), (6, 8)])
+@insertTest(helper_name='missing', added=[(0, 5), (5, 10)], interval=(1, 9),
+            expected=[])
+@insertTest(helper_name='missing', added=[(-5, 1)], interval=(0, 10),
+            expected=[(1, 10)])
+class IntervalSetTest(unittest.TestCase):
+    '''TestCase for IntervalSet'''
+
+    def missing(self, added=None, interval=None, expected=None):
+        '''Check the intervals reported as missing'''
+        intervals = IntervalSet()
+        for s, e in added:
+            intervals.add(s, e)
+        self.assertEqual(intervals.missing(*interval), expected)
+
+    def test_merge(self):
+        '''Check that overlapping and contiguous intervals get merged'''
+        intervals = IntervalSet()
+        intervals.add(0, 1)
+        intervals.add(2, 3)
+        intervals.add(1, 2)
+        self.assertEqual(list(intervals), [(0, 3)])
+
+
+class ArchivingBackfillTest(unittest.TestCase):
+    '''TestCase for ArchivingBackfill with a SQLite reader'''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.reader = SQLiteArchivingReader(
+            os.path.join(self.tmpdir, 'archive.db'))
+        self.t = numpy.arange(100.)
+        self.reader.insert('a', self.t, 2 * self.t)
+        self.received = []
+        self.event = threading.Event()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _callback(self, model, t, v):
+        self.received.append((model, t, v))
+        self.event.set()
+
+    def _waitData(self):
+        self.assertTrue(self.event.wait(5), 'No data received')
+        self.event.clear()
+
+    def test_reader(self):
+        '''Check the values read from SQLite'''
+        t, v = self.reader.getValues('a', 10, 20)
+        numpy.testing.assert_array_equal(t, self.t[10:20])
+        numpy.testing.assert_array_equal(v, 2 * self.t[10:20])
+        self.assertTrue(self.reader.isArchived('a'))
+        self.assertFalse(self.reader.isArchived('b'))
+        t, v = self.reader.getValues('b', 10, 20)
+        self.assertEqual(len(t), 0)
+
+    def test_request(self):
+        '''Check that only the missing intervals are requested'''
+        backfill = ArchivingBackfill(self.reader, self._callback)
+        self.assertEqual(backfill.request('a', 50, 60), [(50, 60)])
+        self._waitData()
+        # already requested
+        self.assertEqual(backfill.request('a', 52, 58), [])
+        # partially requested
+        self.assertEqual(backfill.request('a', 40, 60), [(40, 50)])
+        self._waitData()
+        model, t, v = self.received[-1]
+        self.assertEqual(model, 'a')
+        numpy.testing.assert_array_equal(t, self.t[40:50])
+        # after clearing, the intervals are requested again
+        backfill.clear('a')
+        self.assertEqual(backfill.request('a', 40, 60), [(40, 60)])
+        self._waitData()
+
+    def test_clearWhileFetching(self):
+        '''Check that a fetch finishing after a clear does not undo it'''
+        reader = _SlowReader(self.reader)
+        backfill = ArchivingBackfill(reader, self._callback)
+        backfill.request('a', 50, 60)
+        self.assertTrue(reader.entered.wait(5))
+        backfill.clear('a')
+        reader.release.set()
+        time.sleep(.2)
+        # the (outdated) "not archived" answer has been forgotten
+        self.assertEqual(backfill.request('a', 50, 60), [(50, 60)])
+        self._waitData()
+        self.assertEqual(reader.calls, 2)
+
+
+class _SlowReader(object):
+    """a reader whose first isArchived call waits to be released and
+    (wrongly) returns False"""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def isArchived(self, model):
+        self.calls += 1
+        if self.calls > 1:
+            return self.reader.isArchived(model)
+        self.entered.set()
+        self.release.wait(5)
+        return False
+
+    def getValues(self, model, start, end):
+        return self.reader.getValues(model, start, end)
+
+
+if __name__ == '__main__':
+    unittest.main()
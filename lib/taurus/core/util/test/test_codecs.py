@@ -49,6 +49,13 @@ import numpy
             '\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01' +
             '\x01\x01\x01\x01\x01\x01\x01\x01',
             expected=numpy.ones((2, 2, 3), dtype='uint8'))
+@insertTest(helper_name='encDec', cname='ndarray',
+            data=numpy.arange(12, dtype='int16').reshape(3, 4))
+@insertTest(helper_name='encDec', cname='zip_ndarray',
+            data=numpy.linspace(0, 1, 1000))
+@insertTest(helper_name='encDec', cname='bz2_ndarray',
+            data=numpy.ones((2, 3, 4), dtype='>u4'))
+@insertTest(helper_name='encDec', cname='ndarray', data=numpy.float32(1.5))
 class CodecTest(unittest.TestCase):
     '''TestCase for checking codecs'''
 
@@ -89,5 +96,52 @@ class CodecTest(unittest.TestCase):
             self.assertTrue(equal, msg)
         return fmt, dec
 
+    def test_ndarray_dtype_shape(self):
+        '''Check that the ndarray codec preserves dtype and shape'''
+        cf = CodecFactory()
+        data = numpy.asfortranarray(numpy.arange(6, dtype='>f4').reshape(2, 3))
+        fmt, enc = cf.encode('zip_ndarray', ('', data))
+        dec = cf.decode((fmt, enc))
+        self.assertEqual(dec.dtype, data.dtype)
+        self.assertEqual(dec.shape, data.shape)
+        self.assertTrue(numpy.all(dec == data))
+
+    def test_ndarray_object(self):
+        '''Check that arrays of objects cannot be encoded as ndarray'''
+        codec = CodecFactory().getCodec('ndarray')
+        data = numpy.array([None, 'a'], dtype=object)
+        self.assertRaises(TypeError, codec.encode, ('', data))
+
+    def test_ndarray_structured(self):
+        '''Check that structured arrays cannot be encoded as ndarray'''
+        codec = CodecFactory().getCodec('ndarray')
+        data = numpy.zeros(3, dtype=[('a', 'i2'), ('b', 'u1')])
+        self.assertRaises(TypeError, codec.encode, ('', data))
+
+    def test_compression_level(self):
+        '''Check that the compression level can be set'''
+        codec = CodecFactory().getCodec('zip')
+        level = codec.getLevel()
+        data = 'Hello world\n' * 1000
+        try:
+            codec.setLevel(1)
+            self.assertEqual(codec.getLevel(), 1)
+            fmt, enc = codec.encode(('', data))
+            self.assertEqual(codec.decode((fmt, enc))[1], data)
+        finally:
+            codec.setLevel(level)
+
+    def test_json_ensure_ascii(self):
+        '''Check the ensure_ascii decoding of json'''
+        cf = CodecFactory()
+        data = {'a': [u'b', 1], 'c': [1.5, 2]}
+        fmt, enc = cf.encode('json', ('', data))
+        dec = cf.decode((fmt, enc), ensure_ascii=True)
+        self.assertEqual(dec, data)
+        self.assertTrue(all(type(k) is str for k in dec))
+        self.assertTrue(type(dec['a'][0]) is str)
+        fmt, enc = cf.encode('json', ('', [1, 2.5]))
+        self.assertEqual(cf.decode((fmt, enc), ensure_ascii=True), [1, 2.5])
+
 if __name__ == '__main__':
     pass
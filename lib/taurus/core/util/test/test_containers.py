@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.util.containers"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import unittest
+from taurus.core.util.containers import CaselessDict, CaselessWeakValueDict
+
+
+class _Value(object):
+    pass
+
+
+class CaselessDictTest(unittest.TestCase):
+    '''TestCase for the caseless dictionaries'''
+
+    klass = CaselessDict
+
+    def test_caseless(self):
+        '''Check that the keys are case insensitive'''
+        v1, v2 = _Value(), _Value()
+        d = self.klass()
+        d['A/b/C'] = v1
+        self.assertTrue(d['a/B/c'] is v1)
+        self.assertTrue('A/B/C' in d)
+        self.assertTrue(d.has_key('a/b/c'))
+        self.assertTrue(d.get('A/b/c') is v1)
+        self.assertEqual(d.keys(), ['a/b/c'])
+        d['a/b/c'] = v2
+        self.assertEqual(len(d), 1)
+        self.assertTrue(d.setdefault('A/B/C') is v2)
+        self.assertTrue(d.pop('A/B/c') is v2)
+        self.assertFalse('a/b/c' in d)
+        self.assertTrue(d.get('a/b/c') is None)
+        self.assertRaises(KeyError, d.__getitem__, 'A/B/C')
+
+    def test_update(self):
+        '''Check the constructor and update'''
+        v1, v2 = _Value(), _Value()
+        d = self.klass({'X': v1})
+        d.update({'Y': v2})
+        self.assertTrue(d['x'] is v1)
+        self.assertTrue(d['y'] is v2)
+        del d['X']
+        self.assertFalse('x' in d)
+
+    def test_unicode(self):
+        '''Check that unicode and str keys are equivalent'''
+        v1 = _Value()
+        d = self.klass()
+        d[u'Tango://A/B/C'] = v1
+        self.assertTrue(d['tango://a/b/c'] is v1)
+        self.assertTrue(u'TANGO://A/B/C' in d)
+
+
+class CaselessWeakValueDictTest(CaselessDictTest):
+    '''TestCase for the caseless weak value dictionaries'''
+
+    klass = CaselessWeakValueDict
+
+    def test_weak(self):
+        '''Check that the values are weakly referenced'''
+        d = self.klass()
+        d['A'] = _Value()
+        self.assertFalse('a' in d)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.curvestats"""
+
+__docformat__ = 'restructuredtext'
+
+import unittest
+import numpy
+from taurus.test import insertTest
+from taurus.core.util.curvestats import CurveStats
+
+
+@insertTest(helper_name='compare', limits=None)
+@insertTest(helper_name='compare', limits=(100.5, 700))
+@insertTest(helper_name='compare', limits=(100, 700), inclusive=(False, True))
+@insertTest(helper_name='compare', limits=(None, 300))
+@insertTest(helper_name='compare', limits=(5000, 6000))
+@insertTest(helper_name='compare', imin=3, imax=900)
+@insertTest(helper_name='compare', limits=(100, 700), nans=True)
+@insertTest(helper_name='compare', limits=(100, 700), shuffle=True)
+class CurveStatsTest(unittest.TestCase):
+    '''TestCase for CurveStats'''
+
+    def setUp(self):
+        self.x = numpy.arange(1000.)
+        self.y = 1e6 + numpy.sin(self.x / 10.)
+
+    def _reference(self, x, y, limits=None, inclusive=(True, True),
+                   imin=None, imax=None):
+        x, y = x[imin:imax], y[imin:imax]
+        if limits is not None:
+            xmin, xmax = limits
+            mask = numpy.ones(x.shape, dtype=bool)
+            if xmin is not None:
+                mask &= (x >= xmin) if inclusive[0] else (x > xmin)
+            if xmax is not None:
+                mask &= (x <= xmax) if inclusive[1] else (x < xmax)
+            x, y = x[mask], y[mask]
+        mask = ~numpy.isnan(x + y)
+        return x[mask], y[mask]
+
+    def _check(self, stats, x, y):
+        self.assertEqual(stats['points'], len(x))
+        numpy.testing.assert_array_equal(stats['x'], x)
+        numpy.testing.assert_array_equal(stats['y'], y)
+        if len(x) == 0:
+            self.assertEqual(stats['mean'], None)
+            return
+        self.assertAlmostEqual(stats['mean'], y.mean())
+        self.assertAlmostEqual(stats['std'], y.std(), places=5)
+        self.assertAlmostEqual(stats['rms'], numpy.sqrt(numpy.mean(y ** 2)))
+        self.assertEqual(stats['min'][1], y.min())
+        self.assertEqual(stats['max'][1], y.max())
+        self.assertEqual(stats['min'][0], x[y.argmin()])
+        self.assertAlmostEqual(stats['integral'], numpy.trapz(y, x),
+                               places=5)
+
+    def compare(self, limits=None, inclusive=(True, True), imin=None,
+                imax=None, nans=False, shuffle=False):
+        '''Check stats against a direct computation'''
+        x, y = self.x, self.y.copy()
+        if nans:
+            y[::7] = numpy.nan
+        if shuffle:
+            order = numpy.random.permutation(len(x))
+            x, y = x[order], y[order]
+        stats = CurveStats(x, y)
+        self.assertEqual(stats.isSorted(), not shuffle)
+        ret = stats.getStats(limits=limits, inclusive=inclusive, imin=imin,
+                             imax=imax)
+        self._check(ret, *self._reference(x, y, limits, inclusive, imin,
+                                          imax))
+
+    def test_sync(self):
+        '''Check incremental updates of a sliding buffer'''
+        stats = CurveStats()
+        size = 300
+        start = end = 0
+        for newend in range(1, len(self.x), 37):
+            newstart = max(0, newend - size)
+            x, y = self.x[newstart:newend], self.y[newstart:newend]
+            stats.sync(x, y, appended=newend - end,
+                       discarded=newstart - start)
+            start, end = newstart, newend
+            self.assertEqual(len(stats), len(x))
+            ret = stats.getStats(limits=(x[0] + 10, x[-1] - 10))
+            self._check(ret, *self._reference(x, y, (x[0] + 10, x[-1] - 10)))
+
+    def test_syncReset(self):
+        '''Check that changed data is fully reprocessed'''
+        stats = CurveStats(self.x, self.y)
+        stats.sync(self.x, -self.y)
+        self._check(stats.getStats(), self.x, -self.y)
+
+    def test_syncInPlace(self):
+        '''Check that in-place changes are not missed when the changes are
+        not given'''
+        x, y = self.x, numpy.zeros(len(self.x))
+        stats = CurveStats()
+        stats.sync(x, y)
+        y[1] = 99
+        stats.sync(x, y)
+        self.assertEqual(stats.getStats()['max'], (1, 99))
+
+    def test_syncWrongCounts(self):
+        '''Check that counts inconsistent with the data force a reset'''
+        stats = CurveStats(self.x[:500], self.y[:500])
+        stats.sync(self.x[100:700], self.y[100:700], appended=10,
+                   discarded=0)
+        self._check(stats.getStats(), self.x[100:700], self.y[100:700])
+
+    def test_integralNaNs(self):
+        '''Check that the NaN gaps are bridged by the integral, whatever the
+        path used for computing the stats'''
+        x, y = numpy.arange(6.), numpy.array([1, 1, numpy.nan, 1, 1, 1])
+        stats = CurveStats()
+        for i in range(6):  # incrementally
+            stats.append(x[i], y[i])
+        self.assertEqual(stats.getStats()['integral'], 5.)
+        self.assertEqual(stats._getStatsByMasking(None, (True, True), None,
+                                                  None, True)['integral'], 5.)
+        # windows starting or ending at the gap
+        self.assertEqual(stats.getStats(imin=2)['integral'], 2.)
+        self.assertEqual(stats.getStats(imax=3)['integral'], 1.)
+        self.assertEqual(stats.getStats(limits=(1, 3))['integral'], 2.)
+        # unsorted abscissas (the stats are computed by masking)
+        order = [1, 0, 2, 3, 4, 5]
+        stats = CurveStats(x[order], y[order])
+        self.assertFalse(stats.isSorted())
+        self.assertEqual(stats.getStats(limits=(1, 5))['integral'], 4.)
+        stats = CurveStats(x[1:], y[1:])
+        self.assertEqual(stats.getStats(limits=(1, 5))['integral'], 4.)
+
+    def test_integral(self):
+        '''Check the trapezoidal integral'''
+        stats = CurveStats()
+        for i in xrange(0, 1000, 100):
+            stats.append(self.x[i:i + 100], self.x[i:i + 100])
+        ret = stats.getStats(limits=(10, 20))
+        self.assertAlmostEqual(ret['integral'], (20 ** 2 - 10 ** 2) / 2.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.dataio"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+from taurus.test import insertTest
+from taurus.core.util import dataio
+
+
+@insertTest(helper_name='exportImport', fname='data.dat', xcol=0)
+@insertTest(helper_name='exportImport', fname='data.dat', xcol=0,
+            chunksize=7)
+@insertTest(helper_name='exportImport', fname='data.npz')
+@insertTest(helper_name='exportImport', fname='data.raw')
+@insertTest(helper_name='exportImport', fname='data.raw', mmap=False,
+            chunksize=7)
+class DataIOTest(unittest.TestCase):
+    '''TestCase for checking data export/import'''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        x = numpy.linspace(0, 1, 100)
+        self.names = ['b', 'a']
+        self.data = {'a': (x, x ** 2), 'b': (x, numpy.sin(x))}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def exportImport(self, fname=None, xcol=None, mmap=True,
+                     chunksize=dataio.DEFAULT_CHUNK_SIZE):
+        '''Check that exported data is imported back unchanged'''
+        fname = os.path.join(self.tmpdir, fname)
+        dataio.exportData(fname, self.data, sortedNames=self.names,
+                          chunksize=chunksize)
+        sets = dataio.importData(fname, xcol=xcol, mmap=mmap)
+        msg = 'Unexpected number of sets read from %s' % fname
+        self.assertEqual(len(sets), len(self.names), msg)
+        for name, rawdata in zip(self.names, sets):
+            x, y = self.data[name]
+            numpy.testing.assert_array_equal(rawdata['x'], x)
+            numpy.testing.assert_array_equal(rawdata['y'], y)
+            if not fname.endswith('.dat'):
+                self.assertEqual(rawdata['title'], name)
+
+    def test_asciiDifferentAbscissas(self):
+        '''Check that ascii export refuses sets with different abscissas'''
+        x = numpy.arange(5)
+        data = {'a': (x, x), 'b': (x + 1, x)}
+        fname = os.path.join(self.tmpdir, 'data.dat')
+        self.assertRaises(ValueError, dataio.exportData, fname, data)
+
+    def test_asciiTimeHeader(self):
+        '''Check the ascii header and time abscissas'''
+        x = numpy.array([1e9, 1e9 + 1])
+        fname = os.path.join(self.tmpdir, 'data.dat')
+        dataio.exportData(fname, {'a': (x, x)}, xIsTime=True)
+        lines = open(fname).readlines()
+        self.assertEqual(lines[0], '# DATASET= "a"\n')
+        self.assertTrue(lines[1].startswith('# SNAPSHOT_TIME= '))
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[2].split('\t')[1].strip(), repr(1e9))
+
+    def test_rawAutodetect(self):
+        '''Check that raw files are recognized regardless of extension'''
+        fname = os.path.join(self.tmpdir, 'data.bin')
+        dataio.exportData(fname, self.data, fmt=dataio.RAW)
+        sets = dataio.importData(fname)
+        self.assertEqual([s['title'] for s in sets], ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
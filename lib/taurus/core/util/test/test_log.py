@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.log"""
+
+__docformat__ = 'restructuredtext'
+
+import logging
+import threading
+import unittest
+from taurus.core.util.log import Logger, AsyncLogHandler
+
+
+class _ListHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+class LoggerTestCase(unittest.TestCase):
+    '''TestCase for the taurus Logger'''
+
+    def setUp(self):
+        self._level = Logger.getLogLevel()
+        self._rateLimit = Logger.getLogRateLimit()
+        self.logger = Logger('LoggerTestCase')
+        self.logger.log_obj.propagate = False
+        self.handler = _ListHandler()
+        self.logger.addLogHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeLogHandler(self.handler)
+        self.logger.log_obj.propagate = True
+        Logger.setLogLevel(self._level)
+        Logger.setLogRateLimit(self._rateLimit)
+
+    def _raise(self, level):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            return self.logger.traceback(level)
+
+    def test_tracebackDisabled(self):
+        '''Check that tracebacks of disabled levels are not formatted'''
+        Logger.setLogLevel(Logger.Info)
+        self.assertEqual(self._raise(Logger.Debug), '')
+        self.handler.setLevel(Logger.Error)
+        self.assertEqual(self._raise(Logger.Warning), '')
+        self.assertEqual(self.handler.records, [])
+
+    def test_tracebackEnabled(self):
+        '''Check that tracebacks of enabled levels are logged'''
+        Logger.setLogLevel(Logger.Info)
+        ret = self._raise(Logger.Warning)
+        self.assertEqual(len(self.handler.records), 1)
+        self.assertTrue(isinstance(ret, str))
+        self.assertTrue('ZeroDivisionError' in ret)
+        self.assertEqual(ret, self.handler.records[0])
+
+    def test_stack(self):
+        '''Check that the stack is returned as a string only if enabled'''
+        Logger.setLogLevel(Logger.Info)
+        self.assertEqual(self.logger.stack(Logger.Debug), '')
+        ret = self.logger.stack(Logger.Warning)
+        self.assertTrue(isinstance(ret, str))
+        self.assertTrue('test_stack' in ret)
+        self.assertEqual(self.handler.records, [ret])
+
+    def test_rateLimit(self):
+        '''Check that repeated records are discarded'''
+        Logger.setLogRateLimit(1000)
+
+        def warn(arg):
+            self.logger.warning('foo %s', arg)
+        for i in range(5):
+            warn(1)
+        warn(2)
+        self.assertEqual(self.handler.records, ['foo 1', 'foo 2'])
+        Logger.rate_limit_filter.period = 0
+        warn(1)
+        self.assertEqual(self.handler.records[-1],
+                         'foo 1 [4 identical record(s) suppressed]')
+
+    def test_asyncHandler(self):
+        '''Check that the AsyncLogHandler handles records in its thread'''
+        target = _ListHandler()
+        asyncHandler = AsyncLogHandler([target])
+        self.logger.removeLogHandler(self.handler)
+        self.logger.addLogHandler(asyncHandler)
+        try:
+            for i in range(10):
+                self.logger.warning('bar %d', i)
+            asyncHandler.flush()
+        finally:
+            self.logger.removeLogHandler(asyncHandler)
+            self.logger.addLogHandler(self.handler)
+            asyncHandler.close()
+        self.assertEqual(target.records, ['bar %d' % i for i in range(10)])
+        self.assertTrue(threading.current_thread() not in target.threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
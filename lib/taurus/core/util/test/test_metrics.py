@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.util.metrics"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import tempfile
+import unittest
+
+import taurus
+from taurus.core.taurusbasetypes import TaurusEventType
+from taurus.core.tauruspollingtimer import TaurusPollingTimer
+from taurus.core.util.metrics import MetricsRegistry, Histogram
+
+
+class MetricsTest(unittest.TestCase):
+    '''TestCase for the metrics registry'''
+
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+        self._enabled = self.metrics.isEnabled()
+        self.metrics.reset()
+
+    def tearDown(self):
+        if self._enabled:
+            self.metrics.enable()
+        else:
+            self.metrics.disable()
+        self.metrics.reset()
+
+    def test_histogram(self):
+        '''Check the histogram of durations'''
+        h = Histogram()
+        for v in (5e-6, 5e-5, 5e-5, 0.5, 2):
+            h.add(v)
+        d = h.toDict()
+        self.assertEqual(d['count'], 5)
+        self.assertEqual(d['max'], 2)
+        self.assertAlmostEqual(d['mean'], 2.500105 / 5)
+        self.assertEqual(h.buckets, [1, 2, 0, 0, 0, 1, 1])
+
+    def test_registry(self):
+        '''Check the counters, histograms and gauges'''
+        m = self.metrics
+        m.count('c', 'a')
+        m.count('c', 'b', 5)
+        m.count('c', 'a')
+        m.observe('h', 'a', 0.1)
+        m.observe('h', 'a', 0.3)
+        m.setGauge('g', 'a', 3)
+        m.setGauge('g', 'a', 1)
+        self.assertEqual(m.getNames(), ['c', 'g', 'h'])
+        self.assertEqual(m.get('c'), {'a': 2, 'b': 5})
+        self.assertEqual(m.top('c', 1), [('b', 5)])
+        self.assertEqual(m.get('g'), {'a': {'last': 1, 'max': 3}})
+        self.assertEqual(m.get('h')['a']['count'], 2)
+        self.assertAlmostEqual(m.top('h')[0][1], 0.4)
+        self.assertEqual(m.get('x'), {})
+        m.reset()
+        self.assertEqual(m.getAll(), {})
+
+    def test_disabled(self):
+        '''Check that nothing is recorded while disabled'''
+        self.metrics.disable()
+        a = taurus.Attribute('sim:scalar/metrics_disabled')
+        a.fireEvent(TaurusEventType.Change, a.read())
+        self.assertEqual(self.metrics.getAll(), {})
+
+    def test_fireEvent(self):
+        '''Check the metrics of the events and polling'''
+        self.metrics.enable()
+        a = taurus.Attribute('sim:scalar/metrics_events')
+        for _ in range(3):
+            a.fireEvent(TaurusEventType.Change, a.read())
+        name = a.getFullName()
+        self.assertEqual(self.metrics.get('events')[name], 3)
+        self.assertEqual(self.metrics.get('listeners')[name]['count'], 3)
+
+        timer = TaurusPollingTimer(1000)
+        timer.addAttribute(a, auto_start=False)
+        timer._pollAttributes()
+        timer.removeAttribute(a)
+        self.assertEqual(self.metrics.get('polls')[name], 1)
+        # (addAttribute may also trigger a poll in a worker thread)
+        self.assertTrue(self.metrics.get('events')[name] >= 4)
+        self.assertEqual(len(self.metrics.get('polling_timer')), 1)
+
+    def test_export(self):
+        '''Check the export of the metrics as text'''
+        m = self.metrics
+        m.count('events', 'sim:scalar/a')
+        m.observe('poll', 'sim:/', 0.002)
+        fd, fname = tempfile.mkstemp(suffix='.txt')
+        os.close(fd)
+        try:
+            m.export(fname)
+            with open(fname) as f:
+                text = f.read()
+        finally:
+            os.remove(fname)
+        self.assertIn('[events]', text)
+        self.assertIn('sim:scalar/a 1', text)
+        self.assertIn('[poll]', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
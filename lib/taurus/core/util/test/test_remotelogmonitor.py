@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.util.remotelogmonitor"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import time
+import logging
+import logging.handlers
+import threading
+import unittest
+from taurus.core.util.remotelogmonitor import LogRecordSelectorReceiver
+
+
+class _Receiver(LogRecordSelectorReceiver):
+
+    # small, for testing the reuse and growth of the buffers
+    BufferSize = 256
+
+    def handleLogRecords(self, records):
+        self.data['records'].extend(records)
+
+
+class LogRecordSelectorReceiverTest(unittest.TestCase):
+    '''TestCase for the LogRecordSelectorReceiver'''
+
+    def _start(self, **kwargs):
+        self.handlers = []
+        self.records = []
+        self.receiver = _Receiver(host='127.0.0.1', port=0,
+                                  records=self.records, **kwargs)
+        self.receiver.timeout = 0.05
+        self.thread = threading.Thread(
+            target=self.receiver.serve_until_stopped)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        for handler in self.handlers:
+            handler.close()
+        self.receiver.stop()
+        self.thread.join()
+
+    def _send(self, n_senders, n_records, level=logging.INFO):
+        for i in range(n_senders):
+            handler = logging.handlers.SocketHandler('127.0.0.1',
+                                                     self.receiver.port)
+            self.handlers.append(handler)
+            for j in range(n_records):
+                record = logging.LogRecord('sender%d' % i, level, __file__,
+                                           0, 'message %d: %s', (j, 'x' * j),
+                                           None)
+                handler.handle(record)
+
+    def _wait(self, n, timeout=5):
+        t0 = time.time()
+        while len(self.records) < n and time.time() - t0 < timeout:
+            time.sleep(0.01)
+
+    def test_many_senders(self):
+        '''Check that the records of several senders are received'''
+        self._start()
+        self._send(5, 200)
+        self._wait(1000)
+        self.assertEqual(len(self.records), 1000)
+        for i in range(5):
+            msgs = [r.getMessage() for r in self.records
+                    if r.name == 'sender%d' % i]
+            self.assertEqual(msgs, ['message %d: %s' % (j, 'x' * j)
+                                    for j in range(200)])
+
+    def test_filters(self):
+        '''Check the name and level filters'''
+        self._start(name='sender1', level=logging.WARNING)
+        self._send(3, 10, level=logging.INFO)
+        self._send(3, 10, level=logging.ERROR)
+        self._wait(10)
+        time.sleep(0.1)
+        self.assertEqual(len(self.records), 10)
+        self.assertTrue(all(r.name == 'sender1' for r in self.records))
+        self.assertTrue(all(r.levelno == logging.ERROR for r in self.records))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.scheduler"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import time
+import unittest
+
+from taurus.core.util.scheduler import Scheduler
+
+
+class SchedulerTest(unittest.TestCase):
+    '''TestCase for the Scheduler'''
+
+    def setUp(self):
+        self.calls = []
+        self.done = threading.Event()
+        self.scheduler = Scheduler('SchedulerTest')
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def _call(self, *args):
+        self.calls.append((time.time(), threading.current_thread(), args))
+
+    def test_order(self):
+        '''Check that the calls are run in time order (and FIFO for the same
+        time)'''
+        t = time.time()
+        self.scheduler.schedule(t + .2, self._call, 3)
+        self.scheduler.schedule(t + .1, self._call, 2)
+        self.scheduler.schedule(0, self._call, 0)
+        self.scheduler.schedule(0, self._call, 1)
+        self.scheduler.schedule(t + .3, self.done.set)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual([c[2] for c in self.calls], [(0,), (1,), (2,), (3,)])
+        self.assertTrue(self.calls[2][0] >= t + .1)
+        self.assertTrue(all(c[1] is not threading.current_thread()
+                            for c in self.calls))
+
+    def test_cancel(self):
+        '''Check that cancelled calls are not run'''
+        t = time.time()
+        call = self.scheduler.schedule(t + .1, self._call, 'cancelled')
+        self.scheduler.schedule(t + .2, self._call, 'run')
+        self.scheduler.schedule(t + .3, self.done.set)
+        self.scheduler.cancel(call)
+        self.assertEqual(self.scheduler.pending(), 2)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual([c[2] for c in self.calls], [('run',)])
+        self.assertEqual(self.scheduler.pending(), 0)
+
+    def test_errors(self):
+        '''Check that an error does not stop the scheduler'''
+        self.scheduler.schedule(0, lambda: 1 / 0)
+        self.scheduler.schedule(0, self.done.set)
+        self.assertTrue(self.done.wait(2))
+
+    def test_setup(self):
+        '''Check that the setup is called in the thread before the calls'''
+        scheduler = Scheduler('SchedulerTest',
+                              setup=lambda: self._call('setup'))
+        try:
+            scheduler.schedule(0, self._call, 'call')
+            scheduler.schedule(0, self.done.set)
+            self.assertTrue(self.done.wait(2))
+        finally:
+            scheduler.stop()
+        self.assertEqual([c[2] for c in self.calls], [('setup',), ('call',)])
+        self.assertIs(self.calls[0][1], self.calls[1][1])
+
+    def test_stop(self):
+        '''Check that the pending calls are not run once stopped'''
+        self.scheduler.schedule(time.time() + .1, self._call)
+        self.scheduler.stop()
+        time.sleep(.2)
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Test for taurus.core.util.throttle"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import gc
+import threading
+import time
+import unittest
+
+from taurus.core.util.throttle import EventThrottle
+
+
+class _Receiver(object):
+
+    def __init__(self):
+        self.received = []
+        self.event = threading.Event()
+
+    def callback(self, *args):
+        self.received.append(args)
+        self.event.set()
+
+
+class EventThrottleTest(unittest.TestCase):
+    '''TestCase for the event throttle'''
+
+    def setUp(self):
+        self.receiver = _Receiver()
+        self.channel = EventThrottle().createChannel(self.receiver.callback,
+                                                     .2)
+
+    def test_immediate(self):
+        '''Check that the first value is delivered immediately'''
+        self.channel.push('a', (1,))
+        self.assertEqual(self.receiver.received, [(1,)])
+
+    def test_latestValue(self):
+        '''Check that only the latest value of each key is delivered'''
+        self.channel.push('a', (1,))
+        self.receiver.event.clear()
+        for i in range(2, 6):
+            self.channel.push('a', (i,))
+        self.channel.push('b', (10,))
+        self.assertEqual(self.receiver.received, [(1,)])
+        self.assertTrue(self.receiver.event.wait(2))
+        time.sleep(.05)
+        self.assertEqual(self.receiver.received, [(1,), (5,), (10,)])
+        self.assertEqual(self.channel.getStats(),
+                         dict(delivered=3, collapsed=3, dropped=0))
+
+    def test_period(self):
+        '''Check that the values are not delivered before the period'''
+        t0 = time.time()
+        self.channel.push('a', (1,))
+        self.receiver.event.clear()
+        self.channel.push('a', (2,))
+        self.assertTrue(self.receiver.event.wait(2))
+        self.assertGreaterEqual(time.time() - t0, .19)
+
+    def test_dropped(self):
+        '''Check that the values are dropped if the callback is deleted'''
+        self.channel.push('a', (1,))
+        self.channel.push('a', (2,))
+        self.receiver = None
+        gc.collect()
+        self.channel.flush()
+        self.assertEqual(self.channel.getStats()['dropped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,12 +36,15 @@ from traceback import extract_stack, format_list
 
 from prop import propertx
 from log import Logger, DebugIt, TraceIt
+from metrics import MetricsRegistry
+
+_metrics = MetricsRegistry()
 
 
 class ThreadPool(Logger):
     """"""
 
-    NoJob = 6 * (None,)
+    NoJob = 7 * (None,)
 
     def __init__(self, name=None, parent=None, Psize=20, Qsize=20, daemons=True):
         Logger.__init__(self, name, parent)
@@ -84,7 +87,10 @@ class ThreadPool(Logger):
             # first gather some information on the object which requested the
             # job in case the job throws an exception
             th_id, stack = currentThread().name, extract_stack()[:-1]
-            self.jobs.put((job, args, kw, callback, th_id, stack))
+            self.jobs.put((job, args, kw, callback, th_id, stack, time()))
+            if _metrics.enabled:
+                _metrics.count('jobs', self.log_name)
+                _metrics.setGauge('queue', self.log_name, self.jobs.qsize())
 
     def join(self):
         self.accept = False
@@ -124,8 +130,12 @@ class Worker(Thread, Logger):
     def run(self):
         get = self.pool.jobs.get
         while True:
-            cmd, args, kw, callback, th_id, stack = get()
+            cmd, args, kw, callback, th_id, stack, t = get()
             if cmd:
+                metrics = _metrics.enabled
+                if metrics:
+                    t0 = time()
+                    _metrics.observe('job_wait', self.pool.log_name, t0 - t)
                 self.busy = True
                 self.cmd = cmd.__name__
                 try:
@@ -141,6 +151,9 @@ class Worker(Thread, Logger):
                 finally:
                     self.busy = False
                     self.cmd = ''
+                    if metrics:
+                        _metrics.observe('job_run', self.pool.log_name,
+                                         time() - t0)
             else:
                 self.pool.workers.remove(self)
                 return
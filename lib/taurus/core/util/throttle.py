@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""Rate limiting of the event notifications with latest-value semantics.
+
+An :class:`EventThrottle` singleton (with a single thread) serves any number
+of :class:`ThrottleChannel` objects. Each channel delivers the values pushed
+to it to a callback at most once per period, keeping only the latest value
+of each key meanwhile (e.g., the last event of each model of a widget)::
+
+    from taurus.core.util.throttle import EventThrottle
+    channel = EventThrottle().createChannel(widget.emitEvent, period=.04)
+    ...
+    channel.push((evt_src, evt_type), (evt_src, evt_type, evt_value))
+
+The first value pushed after a quiet period is delivered immediately (in the
+calling thread), and the rest are delivered by the throttle thread.
+"""
+
+__all__ = ["EventThrottle", "ThrottleChannel"]
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import time
+from collections import OrderedDict
+
+from .event import CallableRef
+from .log import Logger
+from .metrics import MetricsRegistry
+from .scheduler import Scheduler
+from .singleton import Singleton
+
+_metrics = MetricsRegistry()
+
+
+class ThrottleChannel(object):
+    """Delivers the values pushed to it to a callback at most once per period,
+    keeping only the latest value of each key meanwhile. Use
+    :meth:`EventThrottle.createChannel` for creating channels.
+
+    Only a weak reference to the callback is kept. The values pending when
+    the callback is deleted are dropped.
+    """
+
+    def __init__(self, throttle, callback, period, name=None):
+        self._throttle = throttle
+        self._callback = CallableRef(callback)
+        self._period = period
+        self._name = name
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._scheduled = False
+        self._last = 0
+        self.delivered = 0
+        self.collapsed = 0
+        self.dropped = 0
+
+    def getPeriod(self):
+        """Returns the minimum time between deliveries
+
+        :return: (float) period in seconds
+        """
+        return self._period
+
+    def setPeriod(self, period):
+        """Sets the minimum time between deliveries (the already scheduled
+        delivery is not affected)
+
+        :param period: (float) period in seconds
+        """
+        self._period = period
+
+    def getStats(self):
+        """Returns the number of values delivered, collapsed (replaced by a
+        newer value of the same key before being delivered) and dropped (not
+        delivered because the callback no longer exists)
+
+        :return: (dict) with 'delivered', 'collapsed' and 'dropped' keys
+        """
+        return dict(delivered=self.delivered, collapsed=self.collapsed,
+                    dropped=self.dropped)
+
+    def push(self, key, args):
+        """Pushes a value. It will be delivered (as `callback(*args)`) when
+        the period since the previous delivery expires, unless a newer value
+        is pushed with the same key before
+
+        :param key: (object) a hashable key
+        :param args: (tuple) the arguments for the callback
+        """
+        with self._lock:
+            if self._pending.pop(key, None) is not None:
+                self.collapsed += 1
+                if _metrics.enabled:
+                    _metrics.count('collapsed_events', self._name)
+            self._pending[key] = args
+            if self._scheduled:
+                return
+            due = self._last + self._period
+            if due > time.time():
+                self._scheduled = True
+                self._throttle._schedule(due, self)
+                return
+        self.flush()
+
+    def flush(self):
+        """Delivers the pending values now"""
+        with self._lock:
+            pending = self._pending.values()
+            self._pending = OrderedDict()
+            self._scheduled = False
+            self._last = time.time()
+        if not pending:
+            return
+        callback = self._callback()
+        if callback is None:
+            self.dropped += len(pending)
+            return
+        self.delivered += len(pending)
+        for args in pending:
+            callback(*args)
+
+
+class EventThrottle(Singleton, Logger):
+    """Singleton that runs the deferred deliveries of the
+    :class:`ThrottleChannel` objects in a single thread"""
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization."""
+        name = self.__class__.__name__
+        self.call__init__(Logger, name)
+        self._scheduler = Scheduler(name)
+
+    def createChannel(self, callback, period, name=None):
+        """Creates a channel that delivers the values pushed to it to the
+        given callback at most once per period
+
+        :param callback: (callable) called with the arguments of each value
+        :param period: (float) minimum time between deliveries (in seconds)
+        :param name: (str) a name for the metrics of the channel
+
+        :return: (ThrottleChannel)
+        """
+        return ThrottleChannel(self, callback, period, name=name)
+
+    def _schedule(self, due, channel):
+        self._scheduler.schedule(due, channel.flush)
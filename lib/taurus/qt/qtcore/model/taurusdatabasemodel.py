@@ -28,7 +28,7 @@
 
 __all__ = ["TaurusTreeDevicePartItem", "TaurusTreeDeviceDomainItem",
            "TaurusTreeDeviceFamilyItem", "TaurusTreeDeviceMemberItem", "TaurusTreeSimpleDeviceItem",
-           "TaurusTreeDeviceItem", "TaurusTreeAttributeItem", "TaurusTreeServerNameItem",
+           "TaurusTreeDeviceItem", "TaurusTreeLoadingItem", "TaurusTreeAttributeItem", "TaurusTreeServerNameItem",
            "TaurusTreeServerItem", "TaurusTreeDeviceClassItem", "TaurusDbBaseModel",
            "TaurusDbSimpleDeviceModel", "TaurusDbPlainDeviceModel", "TaurusDbDeviceModel",
            "TaurusDbSimpleDeviceAliasModel",
@@ -39,6 +39,8 @@ __all__ = ["TaurusTreeDevicePartItem", "TaurusTreeDeviceDomainItem",
 
 __docformat__ = 'restructuredtext'
 
+from functools import partial
+
 from taurus.external.qt import Qt
 from taurus.core.taurusbasetypes import TaurusElementType, TaurusDevState
 import taurus.qt.qtcore.mimetypes
@@ -200,10 +202,32 @@ class TaurusTreeDeviceItem(TaurusTreeDbBaseItem):
     def updateChilds(self):
         if len(self._childItems) > 0:
             return
-        for attr in self._itemData.attributes():
+        # the attributes are obtained in the background (a placeholder is
+        # shown meanwhile), so that the views never wait for the device
+        attrs = self._itemData.requestAttributes(
+            partial(self._model.attributesLoaded.emit, self))
+        if attrs is None:
+            self.appendChild(TaurusTreeLoadingItem(self._model, None, self))
+            return
+        self.setAttributes(attrs)
+
+    def isLoading(self):
+        """Returns whether the attributes of the device are being obtained
+
+        :return: (bool)
+        """
+        return len(self._childItems) == 1 and \
+            isinstance(self._childItems[0], TaurusTreeLoadingItem)
+
+    def setAttributes(self, attrs):
+        """Replaces the child nodes by nodes for the given attributes
+
+        :param attrs: (seq<TangoAttrInfo>) the attributes of the device
+        """
+        self._childItems = []
+        for attr in attrs:
             c = TaurusTreeAttributeItem(self._model, attr, self)
             self.appendChild(c)
-        return
 
     def data(self, index):
         column, model = index.column(), index.model()
@@ -235,6 +259,23 @@ class TaurusTreeDeviceItem(TaurusTreeDbBaseItem):
         return ElemType.Device
 
 
+class TaurusTreeLoadingItem(TaurusTreeDbBaseItem):
+    """A placeholder node shown while the children of its parent are being
+    obtained"""
+
+    DisplayFunc = str
+
+    def hasChildren(self):
+        return False
+
+    def data(self, index):
+        if index.column() == 0:
+            return 'Loading...'
+
+    def mimeData(self, index):
+        return None
+
+
 class TaurusTreeAttributeItem(TaurusTreeDbBaseItem):
     """A node designed to represent an attribute"""
 
@@ -371,6 +412,36 @@ class TaurusDbBaseModel(TaurusBaseModel):
     ColumnRoles = (
         ElemType.Device, ElemType.Device), ElemType.DeviceAlias, ElemType.Server, ElemType.DeviceClass, ElemType.Exported, ElemType.Host
 
+    # emitted (from a worker thread) with a TaurusTreeDeviceItem and its
+    # attributes, when they are obtained
+    attributesLoaded = Qt.pyqtSignal(object, object)
+
+    def __init__(self, parent=None, data=None):
+        TaurusBaseModel.__init__(self, parent=parent, data=data)
+        self.attributesLoaded.connect(self.onAttributesLoaded)
+
+    def onAttributesLoaded(self, item, attrs):
+        """Replaces the placeholder of the given device node by the nodes of
+        its attributes
+
+        :param item: (TaurusTreeDeviceItem) the device node
+        :param attrs: (seq<TangoAttrInfo>) the attributes of the device
+        """
+        # ignore the nodes discarded (e.g., by a refresh) meanwhile
+        root = item
+        while root.parent() is not None:
+            root = root.parent()
+        if root is not self._rootItem or not item.isLoading():
+            return
+        index = self.createIndex(item.row(), 0, item)
+        self.beginRemoveRows(index, 0, 0)
+        item.setAttributes(())
+        self.endRemoveRows()
+        if attrs:
+            self.beginInsertRows(index, 0, len(attrs) - 1)
+            item.setAttributes(attrs)
+            self.endInsertRows()
+
     def createNewRootItem(self):
         return TaurusTreeDbBaseItem(self, self.ColumnNames)
 
@@ -29,6 +29,10 @@ emitter.py: This module provides a task scheduler used by TaurusGrid and
 """
 
 from Queue import Queue, Empty
+import heapq
+import itertools
+import threading
+import time
 import traceback
 from functools import partial
 from collections import Iterable
@@ -88,6 +92,224 @@ class QEmitter(Qt.QObject):
 ###############################################################################
 
 
+class TaurusTaskDispatcher(Qt.QObject):
+    """
+    Executes queued tasks in the GUI thread, in batches.
+
+    Each time the event loop is idle, the dispatcher executes pending tasks
+    until its time budget (in milliseconds) is exhausted and then gives the
+    control back to the event loop, so that the GUI keeps being repainted
+    and responsive while thousands of tasks (e.g. setModel calls) are
+    processed.
+
+    Tasks are executed by priority (higher first) and, for the same
+    priority, in the order in which they were added. Tasks can be
+    associated to an *owner* object and all the pending tasks of an owner
+    can be cancelled with :meth:`cancel`.
+
+    :meth:`add` and :meth:`cancel` can be called from any thread.
+
+    Usage example::
+
+        dispatcher = getTaskDispatcher()
+        dispatcher.progress.connect(lambda done, total: ...)
+        for w, model in zip(widgets, models):
+            dispatcher.add(w.setModel, (model,), owner=w)
+    """
+
+    #: emitted with the number of executed and total tasks after each batch
+    progress = Qt.pyqtSignal(int, int)
+    #: emitted when there are no more pending tasks
+    idle = Qt.pyqtSignal()
+
+    _wakeup = Qt.pyqtSignal()
+
+    #: default time budget (ms) for each batch
+    DefaultBudget = 8
+
+    def __init__(self, parent=None, name='TaurusTaskDispatcher', budget=None,
+                 cursor=True):
+        """
+        :param parent: (QObject) parent object
+        :param name: (str) identifies object logs
+        :param budget: (int) time budget (ms) for each batch. If None, the
+                       `TASK_DISPATCHER_BUDGET` custom setting is used (or
+                       :attr:`DefaultBudget` if not defined)
+        :param cursor: (bool or QCursor) cursor to be set while tasks added
+                       with `cursor=True` are pending (True for the wait
+                       cursor, None or False for not changing the cursor)
+        """
+        Qt.QObject.__init__(self, parent)
+        self.log = Logger('TaurusTaskDispatcher(%s)' % name)
+        if budget is None:
+            budget = getattr(taurus.tauruscustomsettings,
+                             'TASK_DISPATCHER_BUDGET', self.DefaultBudget)
+        self._budget = budget
+        if cursor is True:
+            cursor = Qt.QCursor(Qt.Qt.WaitCursor)
+        self._cursor = cursor or None
+        self._cursorSet = False
+        self._lock = threading.Lock()
+        self._heap = []
+        self._owners = {}
+        self._counter = itertools.count()
+        self._done = 0
+        self._total = 0
+        self._timer = Qt.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._processBatch)
+        self._wakeup.connect(self._start)
+
+    def getBudget(self):
+        """Returns the time budget (ms) for each batch
+
+        :return: (int)
+        """
+        return self._budget
+
+    def setBudget(self, budget):
+        """Sets the time budget (ms) for each batch. At least one task is
+        executed per batch, whatever the budget.
+
+        :param budget: (int)
+        """
+        self._budget = budget
+
+    def add(self, method, args=(), owner=None, priority=0, cursor=False):
+        """Adds a task, which will be executed as `method(*args)`
+
+        :param method: (callable) the method to be executed
+        :param args: (sequence) its arguments
+        :param owner: (object) the object associated to the task (see
+                      :meth:`cancel`)
+        :param priority: (int) tasks with higher priority are executed first
+        :param cursor: (bool) whether the dispatcher cursor should be set
+                       while the task is pending
+        """
+        task = [-priority, next(self._counter), owner, method, tuple(args),
+                cursor]
+        with self._lock:
+            heapq.heappush(self._heap, task)
+            if owner is not None:
+                self._owners.setdefault(id(owner), []).append(task)
+            self._total += 1
+        self._wakeup.emit()
+
+    def cancel(self, owner):
+        """Cancels the pending tasks associated to the given owner
+
+        :param owner: (object) the owner passed to :meth:`add`
+
+        :return: (int) number of cancelled tasks
+        """
+        with self._lock:
+            tasks = self._owners.pop(id(owner), [])
+            n = 0
+            for task in tasks:
+                if task[3] is not None:
+                    # tasks are marked as cancelled and discarded when popped
+                    task[3] = None
+                    n += 1
+            self._total -= n
+        return n
+
+    def clear(self):
+        """Cancels all the pending tasks"""
+        with self._lock:
+            self._heap = []
+            self._owners.clear()
+            self._total = self._done
+
+    def pending(self):
+        """Returns the number of pending tasks
+
+        :return: (int)
+        """
+        return self._total - self._done
+
+    def getDone(self):
+        """Returns the fraction (0-1) of executed tasks since the dispatcher
+        was last idle
+
+        :return: (float)
+        """
+        total = self._total
+        if not total:
+            return 1.
+        return float(self._done) / total
+
+    def _start(self):
+        if self._heap and not self._timer.isActive():
+            self._timer.start()
+
+    def _pop(self):
+        with self._lock:
+            while self._heap:
+                task = heapq.heappop(self._heap)
+                if task[3] is not None:
+                    method, args = task[3], task[4]
+                    # mark it as done, so that it is not cancelled later
+                    task[3] = task[4] = None
+                    return method, args, task[5]
+            # executed (or cancelled) tasks are only forgotten when idle
+            self._owners.clear()
+        return None
+
+    def _processBatch(self):
+        t0 = time.time()
+        budget = self._budget / 1000.
+        while True:
+            task = self._pop()
+            if task is None:
+                break
+            method, args, cursor = task
+            if cursor and self._cursor is not None and not self._cursorSet:
+                Qt.QApplication.instance().setOverrideCursor(self._cursor)
+                self._cursorSet = True
+            try:
+                method(*args)
+            except:
+                self.log.error('At TaurusTaskDispatcher(%s%s): \n%s'
+                               % (method, map(str, args),
+                                  traceback.format_exc()))
+            self._done += 1
+            if time.time() - t0 >= budget:
+                break
+        self.progress.emit(self._done, self._total)
+        with self._lock:
+            idle = not self._heap
+            if idle:
+                self._done = self._total = 0
+        if idle:
+            self._timer.stop()
+            if self._cursorSet:
+                Qt.QApplication.instance().restoreOverrideCursor()
+                self._cursorSet = False
+            self.idle.emit()
+
+
+_dispatcher = None
+
+
+def getTaskDispatcher():
+    """Returns the dispatcher shared by all the workers (the
+    :class:`TaurusTaskDispatcher` is created the first time, and it
+    lives in the GUI thread)
+
+    :return: (TaurusTaskDispatcher)
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        app = Qt.QApplication.instance()
+        _dispatcher = TaurusTaskDispatcher(name='Shared')
+        _dispatcher.moveToThread(app.thread())
+        _dispatcher.setParent(app)
+    return _dispatcher
+
+
+###############################################################################
+
+
 class TaurusEmitterThread(Qt.QThread):
     """
     The TaurusEmitterThread Class
@@ -97,6 +319,11 @@ class TaurusEmitterThread(Qt.QThread):
     operation on them.
     It is useful to serialize Qt tasks in a background thread.
 
+    .. note:: each item costs a round trip between threads plus `loopwait`
+              milliseconds. For new code, :class:`SingletonWorker` or
+              :class:`TaurusTaskDispatcher` (which execute the items in
+              batches) are preferred.
+
     :param parent: a Qt/Taurus object
     :param name: identifies object logs
     :param queue: if None parent.getQueue() is used, if not then the queue 
@@ -342,31 +569,43 @@ class TaurusEmitterThread(Qt.QThread):
 
 class DelayedSubscriber(Logger):
     """
-    DelayedSubscriber(schema) will use a TaurusEmitterThread to perform
-    a thread safe delayed subscribing on all Attributes of a given 
+    DelayedSubscriber(schema) will use the shared :class:`TaurusTaskDispatcher`
+    to perform a thread safe delayed subscribing on all Attributes of a given
     Taurus Schema that has not been previously subscribed.
 
+    The subscriptions are scheduled with a low priority, so that they are
+    executed after any other pending GUI task.
+
     .. warning:: This class belongs to a "Delayed Event Subscription" API added
                  in v.4.2.1-alpha as an *experimental* feature. This API may
                  not be stable and/or it may be removed in a future release
                  (even on a minor version change)
     """
 
-    def __init__(self, schema, parent=None, sleep=10000, pause=5, period=0):
+    #: priority of the subscription tasks
+    Priority = -1
 
+    def __init__(self, schema, parent=None, sleep=10000, pause=5, period=0):
+        """
+        :param schema: (str) the scheme
+        :param parent: (QObject) not used (kept for backwards compatibility)
+        :param sleep: (int) delay (ms) before scheduling the subscriptions
+        :param pause: (int) not used (kept for backwards compatibility)
+        :param period: (int) if not 0, the pending subscriptions are checked
+                       again with this period (ms)
+        """
         self._schema = schema
         self.call__init__(Logger, 'DelayedSubscriber(%s)' % self._schema, None)
         self._factory = taurus.Factory(schema)
+        self._dispatcher = getTaskDispatcher()
 
-        self._modelsQueue = Queue()
-        self._modelsThread = TaurusEmitterThread(parent=parent,
-                                                 queue=self._modelsQueue,
-                                                 method=self._modelSubscriber,
-                                                 sleep=sleep, loopwait=pause,
-                                                 polling=period)
-
-        self._modelsQueue.put((self.addUnsubscribedAttributes,))
-        self._modelsThread.start()
+        if period:
+            self._refreshTimer = Qt.QTimer()
+            self._refreshTimer.timeout.connect(self.addUnsubscribedAttributes)
+            self._refreshTimer.start(period)
+        else:
+            self._refreshTimer = None
+        Qt.QTimer.singleShot(sleep, self.addUnsubscribedAttributes)
 
     def _modelSubscriber(self, method, args=[]):
         self.debug('modelSubscriber(%s,%s)' % (method, args))
@@ -392,10 +631,11 @@ class DelayedSubscriber(Logger):
             items = self.getUnsubscribedAttributes()
             if len(items):
                 self.info('addUnsubscribedAttributes([%d])' % len(items))
+                # avoid scheduling twice those still pending
+                self._dispatcher.cancel(self)
                 for attr in items:
                     self._addModelObj(attr)
-                self._modelsThread.next()
-                self.info('Thread queue: [%d]' % (self._modelsQueue.qsize()))
+                self.info('Pending tasks: [%d]' % self._dispatcher.pending())
         except:
             self.warning(traceback.format_exc())
 
@@ -407,28 +647,34 @@ class DelayedSubscriber(Logger):
                 self.debug('addModelObj(%s), proxy not available' % modelObj)
                 return
 
-        self._modelsQueue.put((modelObj.subscribePendingEvents,))
+        self._dispatcher.add(self._modelSubscriber,
+                             (modelObj.subscribePendingEvents,),
+                             owner=self, priority=self.Priority)
         self.debug('addModelObj(%s)' % str(modelObj))
 
     def cleanUp(self):
         self.trace("[DelayedSubscriber] cleanUp")
-        self._modelsThread.stop()
+        if self._refreshTimer is not None:
+            self._refreshTimer.stop()
+        self._dispatcher.cancel(self)
         Logger.cleanUp(self)
 
 
 class SingletonWorker():
     """
-    SingletonWorker is used to manage TaurusEmitterThread as Singleton objects
+    SingletonWorker is used to feed the shared :class:`TaurusTaskDispatcher`
 
     SingletonWorker is constructed using the same arguments 
     than TaurusTreadEmitter ; but instead of creating a QThread for each 
-    instance it creates a single QThread for all instances.
+    instance, all the instances pass their items to a single dispatcher,
+    which executes them in the GUI thread in batches (see
+    :meth:`TaurusTaskDispatcher.getBudget`).
 
-    The Queue is still different for each of the instances; it is connected 
-    to the TaurusEmitterThread signals (*next()* and *somethingDone()*) 
-    and each Worker queue is used as a feed for the shared QThread.
-
-    This implementation reduced the cpu of vacca application in a 50% factor.
+    The Queue is still different for each of the instances; the items put in
+    it are passed to the dispatcher when :meth:`next` is called. Pending
+    items can be cancelled with :meth:`purge` and :meth:`clear`, and the
+    progress is available from :meth:`getDone` (or from the
+    :attr:`TaurusTaskDispatcher.progress` signal).
 
     :param parent: a Qt/Taurus object
     :param name: identifies object logs
@@ -437,22 +683,25 @@ class SingletonWorker():
     :param method: the method to be executed using each queue item as argument
     :param cursor: if True or QCursor a custom cursor is set while 
         the Queue is not empty
+    :param priority: priority of the items of this worker in the dispatcher
     """
-    _thread = None
 
     def __init__(self, parent=None, name='', queue=None, method=None,
-                 cursor=None, sleep=5000, log=Logger.Warning, start=True):
+                 cursor=None, sleep=5000, log=Logger.Warning, start=True,
+                 priority=0):
+        # sleep is not used anymore (kept for backwards compatibility)
         self.name = name
         self.log = Logger('SingletonWorker(%s)' % self.name)
         self.log.setLogLevel(log)
         self.log.info('At SingletonWorker.__init__(%s)' % self.name)
         self.parent = parent
         self.method = method
+        self.cursor = bool(cursor)
+        self.priority = priority
         self._running = False
-        if SingletonWorker._thread is None:
-            SingletonWorker._thread = TaurusEmitterThread(
-                parent, name='SingletonWorker', cursor=cursor, sleep=sleep)
-        self.thread = SingletonWorker._thread
+        self._owners = {}
+        self.dispatcher = getTaskDispatcher()
+        self.dispatcher.idle.connect(self._owners.clear)
         self.queue = queue or Queue()
         if start:
             self.start()
@@ -466,25 +715,31 @@ class SingletonWorker():
     def next(self, item=None):
         if item is not None:
             self.put(item)
-        elif self.queue.empty():
+        if not self._running or self.queue.empty():
             return
         msg = ('At SingletonWorker.next(), '
-               '%d items not passed yet to Emitter.'
+               '%d items not passed yet to dispatcher.'
                % self.queue.qsize())
         self.log.info(msg)
-        # (queue.empty() and self.log.info or self.log.debug)(msg)
         try:
             i = 0
             while not self.queue.empty():
                 # A blocking get here would hang the GUIs!!!
-                item = self.queue.get(False)
+                item = list(self.queue.get(False))
                 if self.method:
-                    self.thread.getQueue().put([self.method] + list(item))
+                    method, args = self.method, item
                 else:
-                    self.thread.getQueue().put(item)
+                    method, args = item[0], item[1:]
+                # the target object (e.g. the widget in modelSetter items)
+                # is used as owner, so that purge() can cancel its items
+                owner = args[0] if self.method and args else \
+                    getattr(method, 'im_self', None) or method
+                self._owners[id(owner)] = owner
+                self.dispatcher.add(method, args, owner=owner,
+                                    priority=self.priority,
+                                    cursor=self.cursor)
                 i += 1
-            self.log.info('%d Items added to emitter queue' % i)
-            self.thread.emitter.newQueue.emit()
+            self.log.info('%d Items added to dispatcher' % i)
         except Empty:
             self.log.warning(traceback.format_exc())
         except:
@@ -495,34 +750,28 @@ class SingletonWorker():
         return self.queue
 
     def getDone(self):
-        return self.thread.getDone()
+        """ Returns % of done tasks in 0-1 range """
+        return self.dispatcher.getDone()
 
     def start(self):
-        self.thread.emitter.somethingDone.connect(self.next)
-        self.thread.emitter.newQueue.connect(self.thread.next)
-        try:
-            self.thread.start()
-        except:
-            pass
-        self.next()
         self._running = True
+        self.next()
         return
 
     def stop(self):
-        self.thread.emitter.somethingDone.disconnect(self.next)
-        self.thread.emitter.newQueue.disconnect(self.thread.next)
         self._running = False
         return
 
     def clear(self):
         """
-        This method will clear queue only if next() has not been called.
-        If you call self.thread.clear() it will clear objects for all workers!,
-        be careful
+        Clears the queue and cancels the items already passed to the
+        dispatcher by this worker
         """
         while not self.queue.empty():
             self.queue.get()
-            # self.thread.clear()
+        for owner in self._owners.values():
+            self.dispatcher.cancel(owner)
+        self._owners.clear()
 
     def purge(self, obj):
         """
@@ -535,22 +784,23 @@ class SingletonWorker():
                 nqueue.put(i)
         while not nqueue.empty():
             self.queue.put(nqueue.get())
+        self.dispatcher.cancel(obj)
         self.next()
 
     def isRunning(self):
         return self._running
 
     def isFinished(self):
-        return self.thread.isFinished()
+        return not self.dispatcher.pending()
 
     def finished(self):
-        return self.thread.finished()
+        return self.isFinished()
 
     def started(self):
         return self._running
 
     def terminated(self):
-        return self.thread.terminated()
+        return False
 
     def sleep(self, s):
-        return self.thread.sleep(s)
+        return time.sleep(s)
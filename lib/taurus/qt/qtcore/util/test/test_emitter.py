@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for taurus.qt.qtcore.util.emitter"""
+
+import time
+import unittest
+
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtcore.util.emitter import TaurusTaskDispatcher
+
+
+class TaurusTaskDispatcherTestCase(BaseWidgetTestCase, unittest.TestCase):
+    '''
+    Test the batching, budgeting, ordering and cancellation of the tasks of
+    TaurusTaskDispatcher
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusTaskDispatcher
+    initkwargs = {'budget': 1000, 'cursor': None}
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self.executed = []
+        self.progress = []
+        self._widget.progress.connect(
+            lambda done, total: self.progress.append((done, total)))
+
+    def _task(self, value, delay=0):
+        time.sleep(delay)
+        self.executed.append(value)
+
+    def test_batch(self):
+        '''Check that all the tasks fitting in the budget run in one batch'''
+        for i in range(10):
+            self._widget.add(self._task, (i,))
+        self.assertEqual(self._widget.pending(), 10)
+        self._widget._processBatch()
+        self.assertEqual(self.executed, range(10))
+        self.assertEqual(self.progress, [(10, 10)])
+        self.assertEqual(self._widget.pending(), 0)
+
+    def test_budget(self):
+        '''Check that a batch stops when the budget is exhausted'''
+        self._widget.setBudget(50)
+        for i in range(10):
+            self._widget.add(self._task, (i, 0.03))
+        self._widget._processBatch()
+        self.assertEqual(self.executed, range(2))
+        self.assertEqual(self.progress, [(2, 10)])
+        self.assertEqual(self._widget.pending(), 8)
+        self.assertAlmostEqual(self._widget.getDone(), 0.2)
+
+    def test_minimumBatch(self):
+        '''Check that at least one task is executed per batch'''
+        self._widget.setBudget(0)
+        for i in range(3):
+            self._widget.add(self._task, (i,))
+        for n in range(1, 4):
+            self._widget._processBatch()
+            self.assertEqual(self.executed, range(n))
+        self.assertEqual(self.progress, [(1, 3), (2, 3), (3, 3)])
+
+    def test_eventLoop(self):
+        '''Check that the tasks are executed by the event loop'''
+        idle = []
+        self._widget.idle.connect(lambda: idle.append(True))
+        self._widget.setBudget(0)
+        for i in range(5):
+            self._widget.add(self._task, (i,))
+        self.processEvents(repetitions=20, sleep=.01)
+        self.assertEqual(self.executed, range(5))
+        self.assertEqual(len(self.progress), 5)
+        self.assertEqual(idle, [True])
+
+    def test_priority(self):
+        '''Check that tasks are executed by priority and then in order'''
+        self._widget.add(self._task, ('a',))
+        self._widget.add(self._task, ('b',), priority=1)
+        self._widget.add(self._task, ('c',))
+        self._widget.add(self._task, ('d',), priority=1)
+        self._widget._processBatch()
+        self.assertEqual(self.executed, ['b', 'd', 'a', 'c'])
+
+    def test_cancel(self):
+        '''Check that the tasks of an owner can be cancelled'''
+        owner1, owner2 = object(), object()
+        for i in range(3):
+            self._widget.add(self._task, (i,), owner=owner1)
+            self._widget.add(self._task, (-i,), owner=owner2)
+        self.assertEqual(self._widget.cancel(owner1), 3)
+        self.assertEqual(self._widget.pending(), 3)
+        self._widget._processBatch()
+        self.assertEqual(self.executed, [0, -1, -2])
+        # executed tasks cannot be cancelled
+        self.assertEqual(self._widget.cancel(owner2), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,7 +33,10 @@ __all__ = ["TaurusBaseComponent", "TaurusBaseWidget",
 __docformat__ = 'restructuredtext'
 
 import sys
+import time
+import weakref
 import threading
+from collections import OrderedDict
 from types import MethodType
 
 from taurus.external.qt import Qt
@@ -42,6 +45,8 @@ from enum import Enum
 import taurus
 from taurus.core.util import eventfilters
 from taurus.core.util.timer import Timer
+from taurus.core.util.throttle import EventThrottle
+from taurus.core.util.threadpool import ThreadPool
 from taurus.core.taurusbasetypes import TaurusElementType, TaurusEventType
 from taurus.core.taurusattribute import TaurusAttribute
 from taurus.core.taurusdevice import TaurusDevice
@@ -59,6 +64,7 @@ from taurus.qt.qtgui.util import ActionFactory
 from taurus.core.units import Quantity
 
 DefaultNoneValue = "-----"
+DefaultConnectingValue = "connecting..."
 
 
 def defaultFormatter(dtype=None, basecomponent=None, **kwargs):
@@ -78,6 +84,95 @@ def defaultFormatter(dtype=None, basecomponent=None, **kwargs):
     return basecomponent.defaultFormatDict.get(dtype, "{0}")
 
 
+class _AsyncAttachScheduler(object):
+    """Collects the components whose model is to be attached asynchronously
+    and hands them to a pool of worker threads.
+
+    Requests are not submitted immediately: they are accumulated and flushed
+    from the Qt event loop, sorted by
+    :meth:`TaurusBaseComponent.getAttachPriority`, so that the widgets that
+    are visible on screen get attached before the hidden ones.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._flushScheduled = False
+        self._pool = None
+
+    def _getPool(self):
+        if self._pool is None:
+            size = getattr(taurus.tauruscustomsettings,
+                           'ASYNC_ATTACH_WORKERS', 5)
+            self._pool = ThreadPool(name="TaurusAttachTP", Psize=size,
+                                    Qsize=0)
+        return self._pool
+
+    def schedule(self, component, token, cls, name):
+        """Enqueues an asynchronous attach request. Must be called from the
+        Qt main thread.
+
+        :param component: (TaurusBaseComponent) the component to attach
+        :param token: (int) the attach token of the component at request time
+        :param cls: (class) the model class
+        :param name: (str) the model name
+        """
+        with self._lock:
+            self._pending.append((weakref.ref(component), token, cls, name))
+            if self._flushScheduled:
+                return
+            self._flushScheduled = True
+        Qt.QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        """Submits all the pending requests to the worker pool, sorted by
+        priority"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._flushScheduled = False
+        requests = []
+        for ref, token, cls, name in pending:
+            component = ref()
+            if component is None:
+                continue
+            try:
+                priority = component.getAttachPriority()
+            except Exception:
+                # most probably the underlying C++ object was deleted
+                continue
+            requests.append((priority, component, token, cls, name))
+        requests.sort(key=lambda r: r[0])
+        pool = self._getPool()
+        for _, component, token, cls, name in requests:
+            pool.add(component._asyncAttachJob, None, token, cls, name)
+
+_asyncAttachScheduler = _AsyncAttachScheduler()
+
+
+class _ToolTipUpdater(Qt.QObject):
+    """Event filter that regenerates the outdated automatic tooltip of a
+    :class:`TaurusBaseWidget` when it is about to be shown. It is installed
+    by :meth:`TaurusBaseWidget.invalidateToolTip` and removed once the
+    tooltip is up to date."""
+
+    def eventFilter(self, obj, event):
+        if event.type() == Qt.QEvent.ToolTip:
+            obj.removeEventFilter(self)
+            if getattr(obj, '_toolTipOutdated', False):
+                obj._toolTipOutdated = False
+                obj.updateToolTip()
+        return False
+
+_toolTipUpdater = None
+
+
+def _getToolTipUpdater():
+    global _toolTipUpdater
+    if _toolTipUpdater is None:
+        _toolTipUpdater = _ToolTipUpdater()
+    return _toolTipUpdater
+
+
 class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
     """A generic Taurus component.
 
@@ -93,6 +188,7 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
     _modifiableByUser = False
     _showQuality = True
     _eventBufferPeriod = 0
+    _asyncAttach = False
 
     # Python format string or Formatter callable
     # (None means that the default formatter will be used)
@@ -105,6 +201,7 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
                          }
 
     taurusEvent = baseSignal('taurusEvent', object, object, object)
+    asyncAttachFinished = baseSignal('asyncAttachFinished', object)
 
     def __init__(self, name, parent=None, designMode=False):
         """Initialization of TaurusBaseComponent"""
@@ -112,6 +209,7 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         self.modelName = ''
         self.modelFragmentName = None
         self.noneValue = DefaultNoneValue
+        self.connectingValue = DefaultConnectingValue
         self._designMode = designMode
         self.call__init__(TaurusListener, name, parent)
 
@@ -140,6 +238,23 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         self._bufferedEventsTimer = None
         self.setEventBufferPeriod(self._eventBufferPeriod)
 
+        self._eventThrottle = None
+        self.setEventThrottlePeriod(self._getDefaultEventThrottlePeriod())
+
+        self._eventsSuspended = False
+        self._suspendedEvents = OrderedDict()
+        self._suspendedEventsLock = threading.Lock()
+        self._suspendedRefreshPeriod = getattr(
+            taurus.tauruscustomsettings, 'SUSPENDED_REFRESH_PERIOD', 0)
+        self._lastSuspendedRefresh = 0
+
+        self._attachLock = threading.Lock()
+        self._attachToken = 0
+        self._connecting = False
+        self._asyncAttachConnected = False
+        self.setAsyncAttach(getattr(taurus.tauruscustomsettings,
+                                    'ASYNC_ATTACH', self._asyncAttach))
+
         if parent is not None and hasattr(parent, "_exception_listener"):
             self._exception_listener = parent._exception_listener
         else:
@@ -273,6 +388,64 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         '''
         return self._eventBufferPeriod
 
+    def _getDefaultEventThrottlePeriod(self):
+        '''Returns the throttle period for this class, according to the
+        `EVENT_THROTTLE_PERIODS` custom setting (the entry of the most derived
+        class is used)'''
+        periods = getattr(taurus.tauruscustomsettings,
+                          'EVENT_THROTTLE_PERIODS', None)
+        if not periods:
+            return 0
+        for klass in self.__class__.__mro__:
+            period = periods.get(klass.__name__)
+            if period is not None:
+                return period
+        return 0
+
+    def setEventThrottlePeriod(self, period):
+        '''Limits the rate at which the events are passed to the Qt thread.
+        At most one event of each model (and event type) is emitted per
+        period, the last one received (the intermediate ones are collapsed).
+
+        Unlike the event buffer (see :meth:`setEventBufferPeriod`), the events
+        are emitted as soon as they are received if the previous emission was
+        more than a period ago, and all the components share a single thread.
+        The default period of each class can be set with the
+        `EVENT_THROTTLE_PERIODS` custom setting.
+
+        :param period: (float) period in seconds. 0 disables the throttling
+        '''
+        throttle = self._eventThrottle
+        if not period:
+            if throttle is not None:
+                self._eventThrottle = None
+                throttle.flush()
+        elif throttle is None:
+            self._eventThrottle = EventThrottle().createChannel(
+                self._emitTaurusEvent, period, name=self.getLogName())
+        else:
+            throttle.setPeriod(period)
+
+    def getEventThrottlePeriod(self):
+        '''Returns the event throttle period
+
+        :return: (float) period (in s). 0 means the throttling is disabled
+        '''
+        if self._eventThrottle is None:
+            return 0
+        return self._eventThrottle.getPeriod()
+
+    def getEventThrottleStats(self):
+        '''Returns the number of events emitted, collapsed and dropped by the
+        event throttle (see :meth:`setEventThrottlePeriod`)
+
+        :return: (dict or None) with 'delivered', 'collapsed' and 'dropped'
+                 keys (or None if the throttling is disabled)
+        '''
+        if self._eventThrottle is None:
+            return None
+        return self._eventThrottle.getStats()
+
     def eventReceived(self, evt_src, evt_type, evt_value):
         """The basic implementation of the event handling chain is as
         follows:
@@ -294,6 +467,9 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         :param evt_type: (taurus.core.taurusbasetypes.TaurusEventType) type of event
         :param evt_value: (object) event value
         """
+        if self._eventsSuspended and \
+                self._keepSuspendedEvent(evt_src, evt_type, evt_value):
+            return
         evt = filterEvent(evt_src, evt_type, evt_value,
                           filters=self._preFilters)
         if evt is not None:
@@ -316,12 +492,20 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
             with self._eventsBufferLock:
                 self._bufferedEvents[(evt_src, evt_type)] = (evt_src, evt_type,
                                                              evt_value)
+        elif self._eventThrottle is not None:
+            # ...or let the throttle emit the last event of each source and
+            # type at most once per throttle period
+            self._eventThrottle.push((evt_src, evt_type),
+                                     (evt_src, evt_type, evt_value))
         else:
             # if we are not buffering, directly emit the signal
-            try:
-                self.taurusEvent.emit(evt_src, evt_type, evt_value)
-            except:
-                pass  # self.error('%s.fireEvent(...) failed!'%type(self))
+            self._emitTaurusEvent(evt_src, evt_type, evt_value)
+
+    def _emitTaurusEvent(self, evt_src, evt_type, evt_value):
+        try:
+            self.taurusEvent.emit(evt_src, evt_type, evt_value)
+        except:
+            pass  # self.error('%s.fireEvent(...) failed!'%type(self))
 
     def fireBufferedEvents(self):
         '''Fire all events currently buffered (and flush the buffer)
@@ -334,6 +518,75 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
                 self.taurusEvent.emit(*evt)
             self._bufferedEvents = {}
 
+    def setEventsSuspended(self, suspended):
+        '''Suspends (or resumes) the processing of the events received by this
+        component (e.g. while it is not visible).
+
+        While suspended, only the last event of each source and type is kept
+        (unless a refresh period is set, see
+        :meth:`setSuspendedRefreshPeriod`). The kept events are processed when
+        the component is resumed, so that it catches up with the current
+        values. Unlike :meth:`setPaused`, this is not meant to be used by the
+        user.
+
+        :param suspended: (bool) True for suspending the events
+        '''
+        with self._suspendedEventsLock:
+            if suspended == self._eventsSuspended:
+                return
+            self._eventsSuspended = suspended
+            events = self._suspendedEvents.values()
+            self._suspendedEvents = OrderedDict()
+        if suspended:
+            self.debug('events suspended')
+        else:
+            self.debug('events resumed (%d kept events)', len(events))
+            for evt in events:
+                self.eventReceived(*evt)
+
+    def isEventsSuspended(self):
+        '''Returns whether the processing of the events is suspended
+
+        :return: (bool)
+        '''
+        return self._eventsSuspended
+
+    def setSuspendedRefreshPeriod(self, period):
+        '''Sets the minimum time between the events processed while the events
+        are suspended (see :meth:`setEventsSuspended`). Default is given by
+        the `SUSPENDED_REFRESH_PERIOD` custom setting.
+
+        :param period: (float) period in seconds. 0 means that no events are
+                       processed while suspended
+        '''
+        self._suspendedRefreshPeriod = period
+
+    def getSuspendedRefreshPeriod(self):
+        '''Returns the minimum time between the events processed while the
+        events are suspended
+
+        :return: (float) period in seconds (0 means no events are processed)
+        '''
+        return self._suspendedRefreshPeriod
+
+    def _keepSuspendedEvent(self, evt_src, evt_type, evt_value):
+        '''Keeps the given event for processing it when the events are
+        resumed, unless a refresh is due. Returns True if the event was kept'''
+        key = evt_src, evt_type
+        with self._suspendedEventsLock:
+            if not self._eventsSuspended:
+                return False
+            period = self._suspendedRefreshPeriod
+            now = time.time()
+            if period and now - self._lastSuspendedRefresh >= period:
+                self._lastSuspendedRefresh = now
+                self._suspendedEvents.pop(key, None)
+                return False
+            # (re)insert it at the end, so that they are processed in order
+            self._suspendedEvents.pop(key, None)
+            self._suspendedEvents[key] = evt_src, evt_type, evt_value
+            return True
+
     def filterEvent(self, evt_src=-1, evt_type=-1, evt_value=-1):
         """The event is processed by each and all filters in strict order
         unless one of them returns None (in which case the event is discarded)
@@ -659,6 +912,8 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         :return: (str) a tooltip
         """
         if self.modelObj is None:
+            if self.isConnecting():
+                return "Connecting to %s..." % self.getModelName()
             return self.getNoneValue()
         obj = self.modelObj.getDisplayDescrObj()
         return self.toolTipObjToStr(obj)
@@ -822,6 +1077,8 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         :return: (str) a string representation of the model value.
         """
         if self.modelObj is None:
+            if self.isConnecting():
+                return self.getConnectingValue()
             return self.getNoneValue()
         try:
             v = self.getModelFragmentObj(fragmentName=fragmentName)
@@ -849,6 +1106,22 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         """
         return self.noneValue
 
+    def setConnectingValue(self, v):
+        """Sets the string representation used while the model is being
+        attached asynchronously.
+
+        :param v: (str) the string representation for a connecting model
+        """
+        self.connectingValue = v
+
+    def getConnectingValue(self):
+        """Returns the string representation used while the model is being
+        attached asynchronously.
+
+        :return: (str) a string representation for a connecting model
+        """
+        return self.connectingValue
+
     def isChangeable(self):
         """Tells if this component value can be changed by the user. Default implementation
         will return True if and only if:
@@ -882,6 +1155,16 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         """
         return self._attached
 
+    def isConnecting(self):
+        """Determines if this component is waiting for an asynchronous attach
+        to its taurus model to finish.
+
+        :return: (bool) True if the attach is in progress or False otherwise.
+
+        .. seealso:: :meth:`setAsyncAttach`
+        """
+        return self._connecting
+
     def preAttach(self):
         """Called inside self.attach() before actual attach is performed.
         Default implementation just emits a signal.
@@ -927,9 +1210,15 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         In general it should not be necessary to overwrite this method in a
         subclass.
 
+        If the asynchronous attach mode is enabled (see
+        :meth:`setAsyncAttach`), the model object creation and subscription
+        are delegated to a worker thread and this method returns False
+        immediately (:meth:`isConnecting` will return True until the attach
+        finishes).
+
         :return: (bool) True if success in attachment or False otherwise.
         """
-        if self.isAttached():
+        if self.isAttached() or self.isConnecting():
             return self._attached
 
         self.preAttach()
@@ -942,6 +1231,9 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         elif self.modelName == '':
             self._attached = False
             self.modelObj = None
+        elif self._asyncAttach:
+            self._scheduleAsyncAttach(cls)
+            return self._attached
         else:
             try:
                 self.modelObj = taurus.Manager().getObject(cls, self.modelName)
@@ -959,10 +1251,82 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         self.postAttach()
         return self._attached
 
+    def _scheduleAsyncAttach(self, cls):
+        """Requests an asynchronous attach to the current model. Called from
+        :meth:`_attach` (in the Qt main thread).
+
+        :param cls: (class) the model class
+        """
+        if not self._asyncAttachConnected:
+            self.asyncAttachFinished.connect(self._onAsyncAttachFinished)
+            self._asyncAttachConnected = True
+        with self._attachLock:
+            self._attachToken += 1
+            token = self._attachToken
+            self._connecting = True
+        # let the widget show its "connecting" state
+        self.fireEvent(None, TaurusEventType.Change, None)
+        _asyncAttachScheduler.schedule(self, token, cls, self.modelName)
+
+    def _asyncAttachJob(self, token, cls, name):
+        """Creates the model object and registers this component as its
+        listener. Executed in a worker thread.
+
+        The initial value reaches the component through the usual event
+        path. The token is used to discard the result if the model changed
+        (or the component was detached) in the meanwhile.
+
+        :param token: (int) the attach token at request time
+        :param cls: (class) the model class
+        :param name: (str) the model name
+        """
+        with self._attachLock:
+            if token != self._attachToken:
+                return
+        try:
+            obj = taurus.Manager().getObject(cls, name)
+        except Exception:
+            obj = None
+            self.debug("Exception occured while trying to attach '%s'" % name)
+            self.traceback()
+        if obj is not None:
+            with self._attachLock:
+                if token != self._attachToken:
+                    return
+                self.modelObj = obj
+                self._attached = True
+                self.changeLogName(self.log_name + "." + name)
+            obj.addListener(self)
+            with self._attachLock:
+                stale = token != self._attachToken
+            if stale:
+                obj.removeListener(self)
+                return
+        self.asyncAttachFinished.emit(token)
+
+    def _onAsyncAttachFinished(self, token):
+        """Completes an asynchronous attach in the Qt main thread
+
+        :param token: (int) the attach token of the finished request
+        """
+        with self._attachLock:
+            if token != self._attachToken or not self._connecting:
+                return
+            self._connecting = False
+        if not self._attached:
+            # let the widget leave its "connecting" state
+            self.fireEvent(None, TaurusEventType.Change, None)
+        self.postAttach()
+
     def _detach(self):
         """Detaches the component from the taurus model"""
         self.preDetach()
 
+        with self._attachLock:
+            # invalidate any asynchronous attach in progress
+            self._attachToken += 1
+            self._connecting = False
+
         if self.isAttached():
             m = self.getModelObj()
             if not m is None:
@@ -1224,6 +1588,48 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         """Resets the showing of the display value to True"""
         self.setShowText(True)
 
+    def setAsyncAttach(self, yesno):
+        """Sets/unsets the asynchronous attach mode.
+
+        When enabled, the creation of the model object and the subscription
+        to its events are done in a pool of worker threads instead of
+        blocking the caller (normally the Qt main thread). Meanwhile, the
+        component shows its "connecting" state and the first value is
+        received through the normal event chain. Pending attach requests are
+        processed in the order given by :meth:`getAttachPriority`.
+
+        The default is taken from `tauruscustomsettings.ASYNC_ATTACH`.
+
+        .. note:: the new mode applies to the next attach
+
+        :param yesno: (bool) whether or not to attach asynchronously
+        """
+        self._asyncAttach = bool(yesno)
+
+    def getAsyncAttach(self):
+        """Returns whether the asynchronous attach mode is enabled
+
+        :return: (bool) True if attaching asynchronously or False otherwise
+        """
+        return self._asyncAttach
+
+    def resetAsyncAttach(self):
+        """Resets the asynchronous attach mode to its default"""
+        self.setAsyncAttach(getattr(taurus.tauruscustomsettings,
+                                    'ASYNC_ATTACH',
+                                    self.__class__._asyncAttach))
+
+    def getAttachPriority(self):
+        """Returns the priority used for sorting the pending asynchronous
+        attach requests. Requests with lower values are processed first.
+        Default implementation returns the same priority for all components.
+
+        Override when necessary.
+
+        :return: (tuple) a sortable priority key
+        """
+        return (0, 0, 0)
+
     def setTaurusPopupMenu(self, menuData):
         """Sets/unsets the taurus popup menu
 
@@ -1294,11 +1700,17 @@ class TaurusBaseWidget(TaurusBaseComponent):
 
     def __init__(self, name, parent=None, designMode=False):
         self._disconnect_on_hide = False
+        self._suspendWhenHidden = False
         self._supportedMimeTypes = None
         self._autoTooltip = True
+        self._toolTipOutdated = False
+        self._lastRenderState = None
         self.call__init__(TaurusBaseComponent, name,
                           parent=parent, designMode=designMode)
         self._setText = self._findSetTextMethod()
+        if getattr(taurus.tauruscustomsettings, 'SUSPEND_HIDDEN_WIDGETS',
+                   False):
+            self.setSuspendWhenHidden(True)
 
     def showFormatterDlg(self):
         """
@@ -1486,25 +1898,31 @@ class TaurusBaseWidget(TaurusBaseComponent):
         :param evt_type: (taurus.core.taurusbasetypes.TaurusEventType or None) type of event
         :param evt_value: (object or None) event value
         """
+        # the tooltip is only regenerated when it is about to be shown
+        self.invalidateToolTip()
+
         # Update the text shown by the widget
+        renderState = None
         if self._setText:
             text = ''
             if self.getShowText():
                 if isinstance(evt_src, TaurusAttribute):
                     if evt_type in (TaurusEventType.Change, TaurusEventType.Periodic):
                         text = self.displayValue(evt_value.rvalue)
+                        renderState = text, evt_value.quality
                     elif evt_type == TaurusEventType.Error:
                         text = self.getNoneValue()
                     elif evt_type == TaurusEventType.Config:
                         text = self.getDisplayValue()
                 else:
                     text = self.getDisplayValue()
+            # skip the update if the displayed text and quality did not
+            # change (e.g. periodic events of an unchanged value)
+            if renderState is not None and renderState == self._lastRenderState:
+                return
+            self._lastRenderState = renderState
             self._setText(text)
 
-        # update tooltip
-        if self._autoTooltip:
-            self.setToolTip(self.getFormatedToolTip())
-
         # TODO: update whatsThis
 
         # update appearance
@@ -1539,6 +1957,28 @@ class TaurusBaseWidget(TaurusBaseComponent):
         """
         self.update()
 
+    def getAttachPriority(self):
+        """Reimplemented from :meth:`TaurusBaseComponent.getAttachPriority`
+        to give precedence to visible widgets, sorted by their position on
+        the screen (top to bottom, left to right).
+
+        :return: (tuple) a sortable priority key
+        """
+        if not self.isVisible():
+            return (1, 0, 0)
+        pos = self.mapToGlobal(Qt.QPoint(0, 0))
+        return (0, pos.y(), pos.x())
+
+    def _onAsyncAttachFinished(self, token):
+        """Reimplemented from :meth:`TaurusBaseComponent._onAsyncAttachFinished`
+        to notify the child widgets using the parent model, since they could
+        not resolve their models while this widget was connecting.
+        """
+        was_connecting = self.isConnecting()
+        TaurusBaseComponent._onAsyncAttachFinished(self, token)
+        if was_connecting and not self.isConnecting() and self.isAttached():
+            self.modelChanged.emit(self.getModel())
+
     def getParentTaurusComponent(self):
         """Returns the first taurus component in the widget hierarchy or None if no
         taurus component is found
@@ -1565,9 +2005,33 @@ class TaurusBaseWidget(TaurusBaseComponent):
             return
         self._disconnect_on_hide = disconnect
 
+    def setSuspendWhenHidden(self, suspend):
+        """Sets whether the processing of the events of this widget is
+        suspended while it is hidden (e.g. in a hidden tab or panel, or in a
+        minimized window). See :meth:`setEventsSuspended`.
+
+        Default is given by the `SUSPEND_HIDDEN_WIDGETS` custom setting.
+
+        :param suspend: (bool) True for suspending the events while hidden
+        """
+        self._suspendWhenHidden = suspend
+        self.setEventsSuspended(suspend and not self.isVisible())
+
+    def getSuspendWhenHidden(self):
+        """Returns whether the processing of the events of this widget is
+        suspended while it is hidden
+
+        :return: (bool)
+        """
+        return self._suspendWhenHidden
+
     def hideEvent(self, event):
         """Override of the QWidget.hideEvent()
         """
+        # (the hide events are also received when an ancestor is hidden or
+        # the window is minimized)
+        if self._suspendWhenHidden:
+            self.setEventsSuspended(True)
         if self._disconnect_on_hide:
             try:
                 if self.getModelName():
@@ -1579,6 +2043,8 @@ class TaurusBaseWidget(TaurusBaseComponent):
 
     def showEvent(self, event):
         """Override of the QWidget.showEvent()"""
+        if self._suspendWhenHidden:
+            self.setEventsSuspended(False)
         if self._disconnect_on_hide:
             try:
                 if self.getModelName():
@@ -1864,6 +2330,25 @@ class TaurusBaseWidget(TaurusBaseComponent):
         """
         return self._autoTooltip
 
+    def invalidateToolTip(self):
+        """Marks the automatic tooltip as outdated. It will be regenerated
+        (see :meth:`updateToolTip`) the next time that it is shown.
+        """
+        if self._toolTipOutdated:
+            return
+        self._toolTipOutdated = True
+        # only filter the widget events while the tooltip is outdated
+        self.installEventFilter(_getToolTipUpdater())
+
+    def updateToolTip(self):
+        """Sets the automatic tooltip of the widget (if enabled). Default
+        implementation uses :meth:`getFormatedToolTip`.
+
+        Override when necessary.
+        """
+        if self._autoTooltip:
+            self.setToolTip(self.getFormatedToolTip())
+
     @classmethod
     def getQtDesignerPluginInfo(cls):
         """Returns pertinent information in order to be able to build a valid
@@ -2128,6 +2613,11 @@ class TaurusBaseWritableWidget(TaurusBaseWidget):
 
     def updateStyle(self):
         '''reimplemented from :class:`TaurusBaseWidget`'''
+        self.invalidateToolTip()
+
+    def updateToolTip(self):
+        '''reimplemented from :class:`TaurusBaseWidget` to show the pending
+        operations'''
         if self._autoTooltip:
             toolTip = self.getFormatedToolTip()
             if self.hasPendingOperations():
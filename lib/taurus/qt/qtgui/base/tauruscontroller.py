@@ -53,6 +53,8 @@ class TaurusBaseController(object):
         self._last_value = None
         self._last_config_value = None
         self._last_error_value = None
+        self._last_render_state = None
+        self._last_bg_key = None
         self._setStyle()
 
     def _setStyle(self):
@@ -115,7 +117,19 @@ class TaurusBaseController(object):
                     self._last_value = self.modelObj().getValueObj()
                 except:
                     self._last_value = None
+        # skip the update if what is displayed did not change (e.g. periodic
+        # events of an unchanged value)
+        if evt_type in (TaurusEventType.Change, TaurusEventType.Periodic):
+            widget = self.widget()
+            render_state = self._getRenderState(widget)
+            if render_state is not None and \
+                    render_state == self._last_render_state:
+                widget.invalidateToolTip()
+                return
+        else:
+            render_state = None
         self.update()
+        self._last_render_state = render_state
 
     def eventReceived(self, evt_src, evt_type, evt_value):
         # should handle the state event here. Because this is invoked by a random
@@ -131,10 +145,33 @@ class TaurusBaseController(object):
 
     def update(self):
         widget = self.widget()
+        self._last_render_state = None
         self._updateConnections(widget)
         self._updateForeground(widget)
         self._updateBackground(widget)
-        self._updateToolTip(widget)
+        # the tooltip is only generated (see _updateToolTip) when shown
+        widget.invalidateToolTip()
+
+    def _getText(self, widget):
+        return self.getDisplayValue()
+
+    def _getRenderState(self, widget):
+        """Returns a summary (text, quality and state) of what the widget
+        displays, or None if it cannot be summarized (in which case the
+        widget is always updated)"""
+        bgRole = getattr(widget, 'bgRole', 'quality')
+        if bgRole not in ('', 'none', 'None', 'quality', 'state'):
+            # the background depends on other members of the model
+            return None
+        stateObj = self._stateObj
+        if stateObj is None:
+            if self._needsStateConnection():
+                # not connected to the state yet
+                return None
+            state = None
+        else:
+            state = stateObj.state
+        return self._getText(widget), self.quality(), state
 
     def _needsStateConnection(self):
         return False
@@ -295,6 +332,11 @@ class TaurusConfigurationControllerHelper(object):
 
 StyleSheetTemplate = """border-style: outset; border-width: 2px; border-color: {0}; {1}"""
 
+_TRANSPARENT_STYLESHEET = StyleSheetTemplate.format("rgba(0,0,0,0)", "")
+_TRANSPARENT_BRUSH = Qt.QBrush(Qt.Qt.transparent)
+_BLACK_BRUSH = Qt.QBrush(Qt.Qt.black)
+_FRAME_BRUSH = Qt.QBrush(Qt.QColor(255, 255, 255, 128))
+
 
 def _updatePaletteColors(widget, bgBrush, fgBrush, frameBrush):
     qt_palette = widget.palette()
@@ -306,57 +348,60 @@ def _updatePaletteColors(widget, bgBrush, fgBrush, frameBrush):
     widget.setPalette(qt_palette)
 
 
+def _getBackgroundItem(ctrl, widget, bgRole):
+    """Returns the color palette and the item (state, quality...) that
+    determine the background of the widget for the given bgRole"""
+    bgItem, palette = None, QT_DEVICE_STATE_PALETTE
+    if bgRole == 'quality':
+        palette = QT_ATTRIBUTE_QUALITY_PALETTE
+        bgItem = ctrl.quality()
+    elif bgRole == 'state':
+        bgItem = ctrl.state()
+    elif bgRole == 'value':
+        bgItem = ctrl.value()
+    else:
+        # TODO: this is an *experimental* extension of the bgRole API
+        # added in v 4.1.2-alpha. It may change in future versions
+        modelObj = widget.getModelObj()
+        try:
+            bgItem = modelObj.getFragmentObj(bgRole)
+        except:
+            widget.warning('Invalid bgRole "%s"', bgRole)
+    return palette, bgItem
+
+
 def updateLabelBackground(ctrl, widget):
     """Helper method to setup background of taurus labels and lcds"""
     bgRole = widget.bgRole
+    usePalette = ctrl.usePalette()
 
-    if ctrl.usePalette():
+    if bgRole in ('', 'none', 'None'):
+        palette, colorKey = None, None
+    else:
+        palette, bgItem = _getBackgroundItem(ctrl, widget, bgRole)
+        colorKey = palette.key(bgItem)
+
+    # setting the palette or the style sheet makes Qt re-polish the widget,
+    # so it is only done if the color changed
+    key = usePalette, palette, colorKey
+    if key == ctrl._last_bg_key:
+        return
+    ctrl._last_bg_key = key
+
+    if usePalette:
         widget.setAutoFillBackground(True)
-        if bgRole in ('', 'none', 'None'):
-            transparentBrush = Qt.QBrush(Qt.Qt.transparent)
-            frameBrush = transparentBrush
-            bgBrush, fgBrush = transparentBrush, Qt.QBrush(Qt.Qt.black)
+        if palette is None:
+            frameBrush = _TRANSPARENT_BRUSH
+            bgBrush, fgBrush = _TRANSPARENT_BRUSH, _BLACK_BRUSH
         else:
-            frameBrush = Qt.QBrush(Qt.QColor(255, 255, 255, 128))
-            bgItem, palette = None, QT_DEVICE_STATE_PALETTE
-            if bgRole == 'quality':
-                palette = QT_ATTRIBUTE_QUALITY_PALETTE
-                bgItem = ctrl.quality()
-            elif bgRole == 'state':
-                bgItem = ctrl.state()
-            elif bgRole == 'value':
-                bgItem = ctrl.value()
-            else:
-                # TODO: this is an *experimental* extension of the bgRole API
-                # added in v 4.1.2-alpha. It may change in future versions
-                modelObj = widget.getModelObj()
-                try:
-                    bgItem = modelObj.getFragmentObj(bgRole)
-                except:
-                    widget.warning('Invalid bgRole "%s"', bgRole)
-            bgBrush, fgBrush = palette.qbrush(bgItem)
+            frameBrush = _FRAME_BRUSH
+            bgBrush, fgBrush = palette.qbrush(colorKey)
         _updatePaletteColors(widget, bgBrush, fgBrush, frameBrush)
     else:
-        if bgRole in ('', 'none', 'None'):
-            ss = StyleSheetTemplate.format("rgba(0,0,0,0)", "")
+        if palette is None:
+            ss = _TRANSPARENT_STYLESHEET
         else:
-            bgItem, palette = None, QT_DEVICE_STATE_PALETTE
-            if bgRole == 'quality':
-                palette = QT_ATTRIBUTE_QUALITY_PALETTE
-                bgItem = ctrl.quality()
-            elif bgRole == 'state':
-                bgItem = ctrl.state()
-            elif bgRole == 'value':
-                bgItem = ctrl.value()
-            else:
-                # TODO: this is an *experimental* extension of the bgRole API
-                # added in v 4.1.2-alpha. It may change in future versions
-                modelObj = widget.getModelObj()
-                try:
-                    bgItem = modelObj.getFragmentObj(bgRole)
-                except:
-                    widget.warning('Invalid bgRole "%s"', bgRole)
-            color_ss = palette.qtStyleSheet(bgItem)
+            color_ss = palette.qtStyleSheet(colorKey)
             ss = StyleSheetTemplate.format("rgba(255,255,255,128)",  color_ss)
         widget.setStyleSheet(ss)
     widget.update()  # necessary in pyqt <= 4.4
@@ -26,6 +26,7 @@
 """Unit tests for taurusbase"""
 
 
+import time
 import unittest
 from taurus.test import insertTest
 from taurus.qt.qtgui.test import BaseWidgetTestCase
@@ -99,3 +100,85 @@ class GetDisplayValueTestCase(TangoSchemeTestLauncher, BaseWidgetTestCase,
                (model, expected, got))
         self.assertEqual(expected, got, msg)
         self.assertMaxDeprecations(0)
+
+
+class AsyncAttachTestCase(BaseWidgetTestCase, unittest.TestCase):
+    """Check the asynchronous attach mode of TaurusBaseComponent
+    """
+    _klass = TaurusWidget
+
+    def _waitAttached(self, timeout=5):
+        t0 = time.time()
+        while self._widget.isConnecting() and time.time() - t0 < timeout:
+            self.processEvents(sleep=.01)
+
+    def test_asyncAttach(self):
+        '''Check that the model is attached in the background'''
+        self._widget.setAsyncAttach(True)
+        self._widget.setModel('eval:1+2')
+        self.assertFalse(self._widget.isAttached())
+        self.assertTrue(self._widget.isConnecting())
+        self.assertEqual(self._widget.getDisplayValue(),
+                         self._widget.getConnectingValue())
+        self._waitAttached()
+        self.assertFalse(self._widget.isConnecting())
+        self.assertTrue(self._widget.isAttached())
+        self.assertEqual(self._widget.getDisplayValue(), '3')
+
+    def test_asyncAttachModelChange(self):
+        '''Check that a model change discards a pending attach'''
+        self._widget.setAsyncAttach(True)
+        self._widget.setModel('eval:1+2')
+        self._widget.setModel('eval:2+2')
+        self._waitAttached()
+        self.assertTrue(self._widget.isAttached())
+        self.assertEqual(self._widget.getModelObj().getFullName(),
+                         'eval://localhost/@DefaultEvaluator/2+2')
+        self.assertEqual(self._widget.getDisplayValue(), '4')
+
+    def test_asyncAttachDetach(self):
+        '''Check that resetting the model cancels a pending attach'''
+        self._widget.setAsyncAttach(True)
+        self._widget.setModel('eval:1+2')
+        self._widget.resetModel()
+        self.assertFalse(self._widget.isConnecting())
+        self.processEvents(repetitions=10, sleep=.01)
+        self.assertFalse(self._widget.isAttached())
+        self.assertIsNone(self._widget.getModelObj())
+
+
+class SuspendEventsTestCase(BaseWidgetTestCase, unittest.TestCase):
+    """Check the suspension of the events of hidden widgets
+    """
+    _klass = TaurusWidget
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._handled = []
+        self._widget.handleEvent = lambda *evt: self._handled.append(evt)
+        # (normally done when attaching the model)
+        self._widget.taurusEvent.connect(self._widget.filterEvent)
+
+    def test_suspendWhenHidden(self):
+        '''Check that the events are kept while hidden and caught up'''
+        self._widget.setSuspendWhenHidden(True)
+        self.assertTrue(self._widget.isEventsSuspended())
+        for i in range(3):
+            self._widget.eventReceived('src', 'type', i)
+        self.processEvents(repetitions=5, sleep=.01)
+        self.assertEqual(self._handled, [])
+        self._widget.show()
+        self.processEvents(repetitions=5, sleep=.01)
+        self.assertFalse(self._widget.isEventsSuspended())
+        self.assertEqual(self._handled, [('src', 'type', 2)])
+        self._widget.hide()
+        self.assertTrue(self._widget.isEventsSuspended())
+
+    def test_suspendedRefreshPeriod(self):
+        '''Check that events are let through with the refresh period'''
+        self._widget.setSuspendedRefreshPeriod(1000)
+        self._widget.setEventsSuspended(True)
+        for i in range(3):
+            self._widget.eventReceived('src', 'type', i)
+        self.processEvents(repetitions=5, sleep=.01)
+        self.assertEqual(self._handled, [('src', 'type', 0)])
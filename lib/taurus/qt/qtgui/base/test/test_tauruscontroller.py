@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+
+"""Unit tests for taurus.qt.qtgui.base.tauruscontroller"""
+
+import unittest
+from taurus.test import insertTest
+from taurus.core.taurusbasetypes import AttrQuality, TaurusDevState
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.display import TaurusLabel
+from taurus.qt.qtgui.base.tauruscontroller import (TaurusBaseController,
+                                                   updateLabelBackground)
+
+
+class _Controller(TaurusBaseController):
+    """a controller whose quality and state are set by the test"""
+
+    def __init__(self, widget, updateAsPalette=True):
+        TaurusBaseController.__init__(self, widget, updateAsPalette)
+        self._quality = AttrQuality.ATTR_VALID
+        self._state = TaurusDevState.Ready
+
+    def quality(self):
+        return self._quality
+
+    def state(self):
+        return self._state
+
+
+@insertTest(helper_name='checkUpdates', bgRole='quality', usePalette=True,
+            values=[AttrQuality.ATTR_VALID, AttrQuality.ATTR_VALID,
+                    AttrQuality.ATTR_ALARM, AttrQuality.ATTR_ALARM,
+                    AttrQuality.ATTR_VALID])
+@insertTest(helper_name='checkUpdates', bgRole='quality', usePalette=False,
+            values=[AttrQuality.ATTR_VALID, AttrQuality.ATTR_VALID,
+                    AttrQuality.ATTR_ALARM, AttrQuality.ATTR_ALARM,
+                    AttrQuality.ATTR_VALID])
+@insertTest(helper_name='checkUpdates', bgRole='state', usePalette=True,
+            values=[TaurusDevState.Ready, TaurusDevState.NotReady,
+                    TaurusDevState.NotReady, TaurusDevState.Undefined])
+@insertTest(helper_name='checkUpdates', bgRole='state', usePalette=False,
+            values=[TaurusDevState.Ready, TaurusDevState.NotReady,
+                    TaurusDevState.NotReady, TaurusDevState.Undefined])
+class UpdateLabelBackgroundTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Test that updateLabelBackground only sets the palette or the style
+    sheet of the widget when the background color changes
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusLabel
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self.calls = []
+        for name in ('setPalette', 'setStyleSheet'):
+            setattr(self._widget, name, self._recorder(name))
+
+    def _recorder(self, name):
+        method = getattr(self._widget, name)
+
+        def recorder(*args):
+            self.calls.append(name)
+            return method(*args)
+        return recorder
+
+    def checkUpdates(self, bgRole, usePalette, values):
+        '''Check the calls to setPalette/setStyleSheet for the given
+        sequence of qualities or states'''
+        self._widget.setBgRole(bgRole)
+        ctrl = _Controller(self._widget, updateAsPalette=usePalette)
+        method = 'setPalette' if usePalette else 'setStyleSheet'
+        last = None
+        for value in values:
+            if bgRole == 'quality':
+                ctrl._quality = value
+            else:
+                ctrl._state = value
+            del self.calls[:]
+            updateLabelBackground(ctrl, self._widget)
+            expected = [] if value == last else [method]
+            self.assertEqual(self.calls, expected,
+                             'unexpected calls for %s' % value)
+            last = value
+
+    def test_switchMode(self):
+        '''Check that switching between palette and style sheet modes
+        re-applies the background'''
+        self._widget.setBgRole('quality')
+        ctrl = _Controller(self._widget, updateAsPalette=True)
+        updateLabelBackground(ctrl, self._widget)
+        ctrl._updateAsPalette = False
+        del self.calls[:]
+        updateLabelBackground(ctrl, self._widget)
+        self.assertEqual(self.calls, ['setStyleSheet'])
+
+    def test_colorKey(self):
+        '''Check the keys of the Qt color palettes'''
+        from taurus.qt.qtgui.util.tauruscolor import (
+            QT_ATTRIBUTE_QUALITY_PALETTE, QT_DEVICE_STATE_PALETTE)
+        for palette, a, b in ((QT_ATTRIBUTE_QUALITY_PALETTE,
+                               AttrQuality.ATTR_VALID, AttrQuality.ATTR_ALARM),
+                              (QT_DEVICE_STATE_PALETTE, TaurusDevState.Ready,
+                               TaurusDevState.NotReady)):
+            self.assertEqual(palette.key(a), palette.key(a))
+            self.assertNotEqual(palette.key(a), palette.key(b))
+            self.assertIs(palette.qtStyleSheet(a), palette.qtStyleSheet(a))
+            self.assertNotEqual(palette.qtStyleSheet(a),
+                                palette.qtStyleSheet(b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+"""
+Benchmark harness for the taurus widgets.
+
+Each benchmark creates a widget, attaches it to synthetic attributes of the
+`eval` scheme which are polled at the given rate, runs the event loop for
+some time and reports (see :mod:`taurus.core.benchmarks.results`):
+
+- `events_per_s`: events received from the attributes
+- `paints_per_s`: paint events received by the widget (and its children)
+- `latency_ms_*`: time from an event to the next paint of the widget
+- `paint_ms_*`: time needed for rendering the whole widget
+- `rss_mb` and `rss_delta_mb`: memory used by the process, and its
+  increase during the benchmark
+
+It is meant to be run without a display, with the offscreen Qt platform
+(Qt5), or with a virtual X server such as Xvfb (Qt4)::
+
+    python -m taurus.qt.qtgui.benchmarks.widgets --rate=50 --duration=10 \\
+        --output=results.json --baseline=baseline.json label form trend
+"""
+
+__all__ = ["WidgetBenchmark", "BENCHMARKS", "runBenchmarks", "main"]
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import time
+import threading
+
+import taurus
+from taurus.external.qt import Qt
+from taurus.core.benchmarks.results import summarize
+
+
+def _rss_mb():
+    """returns the resident memory of the process, in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1048576.
+    except (IOError, OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+class _Probe(Qt.QObject):
+    """Listens to the attributes and filters the paint events of the widget
+    for recording the event-to-paint latency"""
+
+    def __init__(self):
+        Qt.QObject.__init__(self)
+        self._lock = threading.Lock()
+        self.events = 0
+        self.paints = 0
+        self.latencies = []
+        self._pending = None
+
+    def eventReceived(self, src, evt_type, evt_value):
+        t = time.time()
+        with self._lock:
+            self.events += 1
+            if self._pending is None:
+                self._pending = t
+
+    def eventFilter(self, obj, event):
+        if event.type() == Qt.QEvent.Paint:
+            t = time.time()
+            with self._lock:
+                self.paints += 1
+                if self._pending is not None:
+                    self.latencies.append(t - self._pending)
+                    self._pending = None
+        return False
+
+    def install(self, widget):
+        widget.installEventFilter(self)
+        for child in widget.findChildren(Qt.QWidget):
+            child.installEventFilter(self)
+
+
+class WidgetBenchmark(object):
+    """Measures a widget attached to polled attributes
+
+    :param name: (str) the benchmark name
+    :param factory: (callable) called with the list of models, it returns
+                    the widget
+    :param models: (list<str>) the models
+    :param rate: (float) polling rate (Hz) of each attribute
+    :param duration: (float) duration of the measurement (s)
+    :param renders: (int) number of renders for measuring the paint time
+    """
+
+    def __init__(self, name, factory, models, rate=10., duration=5.,
+                 renders=20):
+        self.name = name
+        self.factory = factory
+        self.models = models
+        self.rate = rate
+        self.duration = duration
+        self.renders = renders
+
+    def _runEventLoop(self, duration):
+        loop = Qt.QEventLoop()
+        Qt.QTimer.singleShot(int(duration * 1000), loop.quit)
+        loop.exec_()
+
+    def run(self):
+        """Runs the benchmark
+
+        :return: (dict) the metrics
+        """
+        rss0 = _rss_mb()
+        probe = _Probe()
+        widget = self.factory(self.models)
+        widget.resize(800, 600)
+        widget.show()
+        # let the widget attach and show before measuring
+        self._runEventLoop(0.5)
+        probe.install(widget)
+        if isinstance(widget, Qt.QAbstractScrollArea):
+            widget.viewport().installEventFilter(probe)
+        attrs = [taurus.Attribute(m) for m in self.models]
+        period = max(1, int(1000. / self.rate))
+        for attr in attrs:
+            attr.addListener(probe)
+            attr.activatePolling(period, force=True)
+        t0 = time.time()
+        self._runEventLoop(self.duration)
+        elapsed = time.time() - t0
+        for attr in attrs:
+            attr.removeListener(probe)
+            attr.disablePolling()
+        widget.removeEventFilter(probe)
+
+        pixmap = Qt.QPixmap(widget.size())
+        renders = []
+        for _ in range(self.renders):
+            t = time.time()
+            widget.render(pixmap)
+            renders.append(time.time() - t)
+
+        ret = {'events_per_s': probe.events / elapsed,
+               'paints_per_s': probe.paints / elapsed,
+               'rss_mb': _rss_mb(),
+               'rss_delta_mb': _rss_mb() - rss0}
+        ret.update(summarize(probe.latencies, 'latency_ms', 1000))
+        ret.update(summarize(renders, 'paint_ms', 1000))
+
+        widget.close()
+        widget.deleteLater()
+        self._runEventLoop(0.1)
+        return ret
+
+
+def _scalars(n):
+    return ['eval:rand()+%d' % i for i in range(n)]
+
+
+def _spectra(n):
+    return ['eval:rand(256)+%d' % i for i in range(n)]
+
+
+def _label(models):
+    from taurus.qt.qtgui.display import TaurusLabel
+    w = TaurusLabel()
+    w.setModel(models[0])
+    return w
+
+
+def _form(models):
+    from taurus.qt.qtgui.panel import TaurusForm
+    w = TaurusForm()
+    w.setModel(models)
+    return w
+
+
+def _trend(models):
+    from taurus.qt.qtgui.plot import TaurusTrend
+    w = TaurusTrend()
+    w.setModel(models)
+    return w
+
+
+def _plot(models):
+    from taurus.qt.qtgui.plot import TaurusPlot
+    w = TaurusPlot()
+    w.setModel(models)
+    return w
+
+
+def _grid(models):
+    from taurus.qt.qtgui.table import TaurusGrid
+    w = TaurusGrid()
+    w.setModel(models)
+    return w
+
+
+def _synoptic(models):
+    from taurus.qt.qtgui.graphic import TaurusJDrawSynopticsView
+    w = TaurusJDrawSynopticsView()
+    w.setModel(models[0])
+    return w
+
+
+#: available benchmarks: name -> (widget factory, function returning the
+#: models for the given size)
+BENCHMARKS = {
+    'label': (_label, lambda n: _scalars(1)),
+    'form': (_form, _scalars),
+    'trend': (_trend, _scalars),
+    'plot': (_plot, _spectra),
+    'grid': (_grid, _scalars),
+}
+
+
+def runBenchmarks(names=None, size=10, rate=10., duration=5., jdw=None,
+                  jdwModels=None):
+    """Runs the given benchmarks (a QApplication must exist)
+
+    :param names: (list<str>) the benchmark names (all if None). See
+                  :data:`BENCHMARKS`
+    :param size: (int) number of models for the widgets with several models
+    :param rate: (float) polling rate (Hz) of each attribute
+    :param duration: (float) duration of each benchmark (s)
+    :param jdw: (str) a JDraw file. If given, a `synoptic` benchmark is run
+    :param jdwModels: (list<str>) the models used in the JDraw file (for
+                      polling them)
+
+    :return: (dict) the results (benchmark name -> metrics)
+    """
+    if names is None:
+        names = sorted(BENCHMARKS)
+    results = {}
+    for name in names:
+        if name == 'synoptic':
+            if jdw is None:
+                raise ValueError('A jdw file is needed for synoptic')
+            bench = WidgetBenchmark(name, lambda m: _synoptic([jdw]),
+                                    jdwModels or [], rate, duration)
+        else:
+            factory, models = BENCHMARKS[name]
+            bench = WidgetBenchmark(name, factory, models(size), rate,
+                                    duration)
+        results[name] = bench.run()
+    return results
+
+
+def main():
+    import optparse
+    from taurus.core.benchmarks.results import (saveResults, loadResults,
+                                                compareResults,
+                                                formatComparison)
+    from taurus.qt.qtgui.application import TaurusApplication
+
+    parser = optparse.OptionParser(
+        usage='%prog [options] [benchmark ...]',
+        description='Benchmarks for the taurus widgets. Available: %s, '
+                    'synoptic' % ', '.join(sorted(BENCHMARKS)))
+    parser.add_option('--size', type='int', default=10,
+                      help='number of models [default: %default]')
+    parser.add_option('--rate', type='float', default=10.,
+                      help='polling rate (Hz) [default: %default]')
+    parser.add_option('--duration', type='float', default=5.,
+                      help='duration of each benchmark (s) '
+                           '[default: %default]')
+    parser.add_option('--jdw', help='JDraw file for the synoptic benchmark')
+    parser.add_option('--jdw-models', default='',
+                      help='comma separated models used in the JDraw file')
+    parser.add_option('--output', help='save the results to a JSON file')
+    parser.add_option('--baseline',
+                      help='compare with the results of a JSON file')
+    parser.add_option('--tolerance', type='float', default=0.1,
+                      help='relative change tolerated when comparing '
+                           '[default: %default]')
+
+    # use the offscreen platform, unless another one is requested (Qt5)
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    app = TaurusApplication(cmd_line_parser=parser, app_name='benchmarks')
+    args = app.get_command_line_args()
+    options = app.get_command_line_options()
+
+    jdwModels = [m for m in options.jdw_models.split(',') if m]
+    results = runBenchmarks(args or None, size=options.size,
+                            rate=options.rate, duration=options.duration,
+                            jdw=options.jdw, jdwModels=jdwModels)
+    for name in sorted(results):
+        print name
+        for metric, value in sorted(results[name].items()):
+            print '    %-20s %12.4g' % (metric, value)
+    if options.output:
+        saveResults(options.output, results, size=options.size,
+                    rate=options.rate, duration=options.duration,
+                    qt=Qt.QT_VERSION_STR)
+    if options.baseline:
+        rows = compareResults(results, loadResults(options.baseline),
+                              options.tolerance)
+        print formatComparison(rows)
+        if any(row[5] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
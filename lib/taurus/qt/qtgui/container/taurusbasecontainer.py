@@ -82,6 +82,22 @@ class TaurusBaseContainer(TaurusBaseWidget):
                 result += self.taurusChildren(o.children())
         return result
 
+    def setSuspendWhenHidden(self, suspend, recursive=False):
+        '''Reimplemented from :meth:`TaurusBaseWidget.setSuspendWhenHidden` to
+        optionally apply it to all the taurus children as well
+
+        :param suspend: (bool) True for suspending the events while hidden
+        :param recursive: (bool) if True, apply it also to the taurus children
+                          (recursively)
+        '''
+        TaurusBaseWidget.setSuspendWhenHidden(self, suspend)
+        if recursive:
+            for child in self.taurusChildren():
+                if isinstance(child, TaurusBaseContainer):
+                    child.setSuspendWhenHidden(suspend, recursive=True)
+                else:
+                    child.setSuspendWhenHidden(suspend)
+
     def defineStyle(self):
         self.updateStyle()
 
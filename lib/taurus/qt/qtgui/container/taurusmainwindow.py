@@ -799,6 +799,7 @@ class TaurusMainWindow(Qt.QMainWindow, TaurusBaseContainer):
         '''This event handler receives widget show events'''
         if self.__splashScreen is not None and not event.spontaneous():
             self.__splashScreen.finish(self)
+        TaurusBaseContainer.showEvent(self, event)
 
     def closeEvent(self, event):
         '''This event handler receives widget close events'''
@@ -102,8 +102,14 @@ class QLed(QPixmapWidget):
 
     def _refresh(self):
         """internal usage only"""
-        self._ledName = self.toLedName()
-        pixmap = getCachedPixmap(self._ledName)
+        ledName = self.toLedName()
+        if ledName == self._ledName and not self.getPixmap().isNull():
+            # same image: avoid rescaling and repainting the led
+            return
+        self._ledName = ledName
+        # the pixmaps from the cache share their data (and their cacheKey,
+        # used by QPixmapWidget for sharing the scaled pixmaps as well)
+        pixmap = getCachedPixmap(ledName)
         self.setPixmap(pixmap)
         return self.update()
 
@@ -60,8 +60,20 @@ class QPixmapWidget(Qt.QWidget):
         origPixmap = self._pixmap
         if origPixmap.isNull():
             return origPixmap
-        return origPixmap.scaled(self.size(), self._pixmapAspectRatioMode,
-                                 self._pixmapTransformationMode)
+        # the scaled pixmaps are kept in the QPixmapCache, so that all the
+        # widgets showing the same pixmap (e.g. the leds of a grid) with the
+        # same size and modes share a single scaled copy
+        size = self.size()
+        key = "QPixmapWidget_%d_%dx%d_%d_%d" % (
+            origPixmap.cacheKey(), size.width(), size.height(),
+            int(self._pixmapAspectRatioMode),
+            int(self._pixmapTransformationMode))
+        pixmap = Qt.QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = origPixmap.scaled(size, self._pixmapAspectRatioMode,
+                                       self._pixmapTransformationMode)
+            Qt.QPixmapCache.insert(key, pixmap)
+        return pixmap
 
     def _setDirty(self):
         self._pixmapDrawn = None
@@ -59,6 +59,7 @@ class TaurusLabelController(TaurusBaseController):
         self._text = ''
         self._trimmedText = False
         self._trimPattern = re.compile('<[^<]*>')
+        self._trimKey = None
         TaurusBaseController.__init__(self, label)
 
     def _setStyle(self):
@@ -81,7 +82,7 @@ class TaurusLabelController(TaurusBaseController):
         ret = 'state' in (label.fgRole, label.bgRole)
         return ret
 
-    def _updateForeground(self, label):
+    def _getText(self, label):
         fgRole, value = label.fgRole, ''
 
         # handle special cases (that are not covered with fragment)
@@ -91,7 +92,10 @@ class TaurusLabelController(TaurusBaseController):
             pass
         else:
             value = label.getDisplayValue(fragmentName=fgRole)
-        self._text = text = label.prefixText + value + label.suffixText
+        return label.prefixText + value + label.suffixText
+
+    def _updateForeground(self, label):
+        self._text = text = self._getText(label)
 
         # Checks that the display fits in the widget and sets it to "..." if
         # it does not fit the widget
@@ -103,10 +107,17 @@ class TaurusLabelController(TaurusBaseController):
     def _shouldTrim(self, label, text):
         if not label.autoTrim:
             return False
+        # measuring the text is expensive: reuse the last result unless the
+        # text, the label width or the font changed
+        size, font = label.size().width(), label.font()
+        key = text, size, font
+        if self._trimKey is not None and self._trimKey[0] == key:
+            return self._trimKey[1]
         text = re.sub(self._trimPattern, '', text)
-        font_metrics = Qt.QFontMetrics(label.font())
-        size, textSize = label.size().width(), font_metrics.width(text)
-        return textSize > size
+        font_metrics = Qt.QFontMetrics(font)
+        ret = font_metrics.width(text) > size
+        self._trimKey = key, ret
+        return ret
 
     def _updateToolTip(self, label):
         if not label.getAutoTooltip():
@@ -312,6 +323,11 @@ class TaurusLabel(Qt.QLabel, TaurusBaseWidget):
         if ctrl is not None:
             ctrl.handleEvent(evt_src, evt_type, evt_value)
 
+    def updateToolTip(self):
+        ctrl = self.controller()
+        if ctrl is not None:
+            ctrl._updateToolTip(self)
+
     def isReadOnly(self):
         return True
 
@@ -68,7 +68,7 @@ class TaurusLCDController(TaurusBaseController):
         """Helper method that returns the LCDNumber widget"""
         return self.widget()
 
-    def _updateForeground(self, lcd):
+    def _getText(self, lcd):
         value = None
         if lcd.fgRole == 'value':
             value = self.getDisplayValue()
@@ -79,7 +79,10 @@ class TaurusLCDController(TaurusBaseController):
 
         if value is None:
             value = "udef"
+        return value
 
+    def _updateForeground(self, lcd):
+        value = self._getText(lcd)
         lcd.setNumDigits(len(value))
         lcd.display(value)
 
@@ -249,6 +252,11 @@ class TaurusLCD(Qt.QLCDNumber, TaurusBaseWidget):
     def handleEvent(self, evt_src, evt_type, evt_value):
         self.controller().handleEvent(evt_src, evt_type, evt_value)
 
+    def updateToolTip(self):
+        ctrl = self.controller()
+        if ctrl is not None:
+            ctrl._updateToolTip(self)
+
     def isReadOnly(self):
         return True
 
@@ -104,7 +104,8 @@ class _TaurusLedController(object):
         widget = self.widget()
 
         self._updateDisplay(widget)
-        self._updateToolTip(widget)
+        # the tooltip is only generated (see _updateToolTip) when shown
+        widget.invalidateToolTip()
 
     def _updateDisplay(self, widget):
         key = None
@@ -264,6 +265,11 @@ class TaurusLed(QLed, TaurusBaseWidget):
     def handleEvent(self, evt_src, evt_type, evt_value):
         self.controller().handleEvent(evt_src, evt_type, evt_value)
 
+    def updateToolTip(self):
+        ctrl = self.controller()
+        if ctrl is not None:
+            ctrl._updateToolTip(self)
+
     def isReadOnly(self):
         return True
 
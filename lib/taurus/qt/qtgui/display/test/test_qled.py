@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for QLed and QPixmapWidget"""
+
+import unittest
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.display import QLed
+
+
+class QLedPixmapTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Test the sharing of the scaled led pixmaps and that the led is not
+    rescaled if its image does not change
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = QLed
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._widget.resize(24, 24)
+        self._recalculated = 0
+        recalculate = self._widget.recalculatePixmap
+
+        def counter():
+            self._recalculated += 1
+            return recalculate()
+        self._widget.recalculatePixmap = counter
+
+    def _led(self, color='green', status=True, size=(24, 24)):
+        led = QLed()
+        led.setLedColor(color)
+        led.setLedStatus(status)
+        led.resize(*size)
+        return led
+
+    def test_sharedPixmap(self):
+        '''Check that leds of the same color, status and size share the
+        scaled pixmap'''
+        led1, led2 = self._led(), self._led()
+        key = led1._getPixmap().cacheKey()
+        self.assertFalse(led1._getPixmap().isNull())
+        self.assertEqual(led2._getPixmap().cacheKey(), key)
+        for led in (self._led(color='red'), self._led(status=False),
+                    self._led(size=(32, 32))):
+            self.assertNotEqual(led._getPixmap().cacheKey(), key)
+
+    def test_noRescale(self):
+        '''Check that the led is not rescaled if its image does not change'''
+        led = self._widget
+        pixmap = led._getPixmap()
+        self.assertEqual(self._recalculated, 1)
+        led.setLedStatus(led.getLedStatus())
+        led.setLedColor(led.getLedColor())
+        self.assertIs(led._getPixmap(), pixmap)
+        self.assertEqual(self._recalculated, 1)
+        led.toggleLedStatus()
+        self.assertNotEqual(led._getPixmap().cacheKey(), pixmap.cacheKey())
+        self.assertEqual(self._recalculated, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
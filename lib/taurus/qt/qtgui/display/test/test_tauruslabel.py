@@ -32,6 +32,7 @@ from taurus.qt.qtgui.test import GenericWidgetTestCase, BaseWidgetTestCase
 from taurus.qt.qtgui.display import TaurusLabel
 from taurus.qt.qtgui.container import TaurusWidget
 from taurus.core.tango.test import TangoSchemeTestLauncher
+from taurus.core.taurusbasetypes import TaurusEventType
 import functools
 from taurus.core.util.colors import ATTRIBUTE_QUALITY_DATA, DEVICE_STATE_DATA
 
@@ -303,6 +304,48 @@ class TaurusLabelFormatTest(BaseWidgetTestCase, unittest.TestCase):
         self.assertEqual(got, expected, msg)
 
 
+class TaurusLabelRenderStateTest(BaseWidgetTestCase, unittest.TestCase):
+    '''
+    Check that TaurusLabel skips the updates that do not change what is
+    displayed, and that its tooltip is generated only when shown
+    '''
+    _klass = TaurusLabel
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._widget.setModel('eval:1.2345')
+        self.processEvents(repetitions=10, sleep=.1)
+        self._attr = self._widget.getModelObj()
+        self._ctrl = self._widget.controller()
+        self._updates = []
+        self._ctrl._updateForeground = self._updates.append
+
+    def test_unchangedValue(self):
+        '''Check that periodic events of an unchanged value are skipped'''
+        value = self._attr.read()
+        for _ in range(3):
+            self._ctrl.handleEvent(self._attr, TaurusEventType.Periodic, value)
+        self.assertEqual(len(self._updates), 0)
+
+    def test_changedFormat(self):
+        '''Check that a change of the displayed text updates the label'''
+        value = self._attr.read()
+        self._widget.setFormat('>>{}<<')
+        self._updates[:] = []
+        self._ctrl.handleEvent(self._attr, TaurusEventType.Periodic, value)
+        self.assertEqual(len(self._updates), 1)
+
+    def test_lazyToolTip(self):
+        '''Check that the tooltip is generated when it is shown'''
+        self._widget.setToolTip('')
+        self._widget.invalidateToolTip()
+        self.assertEqual(self._widget.toolTip(), '')
+        evt = Qt.QHelpEvent(Qt.QEvent.ToolTip, Qt.QPoint(1, 1),
+                            Qt.QPoint(1, 1))
+        Qt.QApplication.sendEvent(self._widget, evt)
+        self.assertNotEqual(self._widget.toolTip(), '')
+
+
 #
 # if __name__ == "__main__":
 #     unittest.main()
@@ -30,8 +30,12 @@ __all__ = ["QDataExportDialog"]
 
 import os.path
 from datetime import datetime
+from cStringIO import StringIO
+
+import numpy
 
 from taurus.external.qt import Qt
+from taurus.core.util import dataio
 from taurus.qt.qtgui.util.ui import UILoadable
 
 
@@ -46,16 +50,23 @@ class QDataExportDialog(Qt.QDialog):
     where name is the curve name and
     x,y are iterable containers (e.g., lists, tuple, arrays...) of data to be exported
 
+    Only the first :attr:`previewMaxRows` rows are shown in the preview (which
+    then becomes read-only), but the whole sets are written when exporting.
+
     @TODO: It would be nice if the textedit scrolled to the start ***also for the first set loaded***"""
 
     # constants
     allInSingleFile = "All sets in a single file (table like)"
     allInMultipleFiles = "All set in multiple files"
 
+    #: maximum number of rows shown in the preview
+    previewMaxRows = 10000
+
     def __init__(self, parent=None, datadict=None, sortedNames=None):
         super(QDataExportDialog, self).__init__(parent)
         self.loadUi()
         self._xIsTime = False
+        self._previewTruncated = False
 
         # connections
         self.exportBT.clicked.connect(self.exportData)
@@ -113,17 +124,13 @@ class QDataExportDialog(Qt.QDialog):
                 ofile = open(str(ofile), "w")
             if self.dataSetCB.currentText() == self.allInMultipleFiles:
                 # 1  file per curve
-                text = "# DATASET= %s" % set
-                text += "\n# SNAPSHOT_TIME= %s\n" % self.datatime.isoformat('_')
-                xdata, ydata = self.datadict[set]
-                if self.xIsTime():
-                    for x,y in zip(xdata, ydata):
-                        t = datetime.fromtimestamp(x)
-                        text += "%s\t%r\n" % (t.isoformat('_'), y)
+                self._writeData(ofile, [set])
+            elif self._previewTruncated:
+                # the preview is not complete: write the data directly
+                if set == self.allInSingleFile:
+                    self._writeData(ofile, self.sortedNames)
                 else:
-                    for x,y in zip(xdata, ydata):
-                        text+="%r\t%r\n" % (x, y)
-                print >> ofile, str(text)
+                    self._writeData(ofile, [set])
             else:
                 print >> ofile, str(self.dataTE.toPlainText())
         except:
@@ -170,22 +177,57 @@ class QDataExportDialog(Qt.QDialog):
         key = str(key)
         self.updateText(key)
 
+    def _writeData(self, ofile, names, maxRows=None):
+        """writes the given sets to ofile (see :func:`dataio.writeAscii`)
+
+        :param ofile: (file) output file object
+        :param names: (list<str>) the names of the sets to be written
+        :param maxRows: (int or None) if given, only the first maxRows rows
+                        are written
+
+        :return: (bool) True if all the rows were written
+        """
+        datadict = {}
+        complete = True
+        for name in names:
+            xdata, ydata = self.datadict[name]
+            if maxRows is not None and len(xdata) > maxRows:
+                xdata, ydata = xdata[:maxRows], ydata[:maxRows]
+                complete = False
+            datadict[name] = xdata, ydata
+        dataio.writeAscii(ofile, datadict, sortedNames=names,
+                          xIsTime=self.xIsTime(), snapshotTime=self.datatime)
+        return complete
+
+    def _showPreview(self, names):
+        """fills the text edit with the (possibly truncated) data of the
+        given sets"""
+        preview = StringIO()
+        complete = self._writeData(preview, names,
+                                   maxRows=self.previewMaxRows)
+        text = preview.getvalue()
+        if not complete:
+            text += ("# (Preview truncated to %i rows. All rows will be "
+                     "exported)\n" % self.previewMaxRows)
+        self._previewTruncated = not complete
+        self.dataTE.clear()
+        self.dataTE.insertPlainText(text)
+        self.dataTE.moveCursor(Qt.QTextCursor.Start)
+        return complete
+
     def updateText(self, key=None):
         '''update the text edit that shows the preview of the data'''
         if key is None:
             key = str(self.dataSetCB.currentText())
+        self._previewTruncated = False
         if key in (self.allInMultipleFiles, self.allInSingleFile):
-            # check that all arrays have the same length and the same xdata and
-            # update header section
-            header = "# DATASET= "
-            body = ""
+            # check that all arrays have the same length and the same xdata
             previous = None
             for curve_name in self.sortedNames:
                 xdata, ydata = self.datadict[curve_name]
                 if previous is None:
                     previous = xdata
-                    header += ' "abscissa"'
-                elif previous != xdata:
+                elif not numpy.array_equal(previous, xdata):
                     if (key == self.allInSingleFile):
                         self.dataTE.clear()
                         Qt.QMessageBox.critical(self,
@@ -203,44 +245,16 @@ class QDataExportDialog(Qt.QDialog):
                         self.dataTE.insertPlainText("Unable to display because abscissas are different.\n"
                                                     "Curves will be saved each one in its own file")
                         return
-                header += ' , "%s"' % curve_name
-
-            header += "\n# SNAPSHOT_TIME= %s\n" % self.datatime.isoformat('_')
             # if we reached this point x axes are equal, so fill the editor
             # with the data
-            for i, x in enumerate(previous):
-                if self.xIsTime():
-                    t = datetime.fromtimestamp(x)
-                    body += "%s" % t.isoformat('_')
-                else:
-                    body += "%r" % x
-                for curve_name in self.sortedNames:
-                    xdata, ydata = self.datadict[curve_name]
-                    body += ("\t%r" % ydata[i])
-                body += "\n"
-            # fill text editor
-            self.dataTE.clear()
-            self.dataTE.insertPlainText(header + body)
-            self.dataTE.moveCursor(Qt.QTextCursor.Start)
+            complete = self._showPreview(self.sortedNames)
             if key == self.allInMultipleFiles:
                 self.dataTE.setReadOnly(True)
             else:
-                self.dataTE.setReadOnly(False)
+                self.dataTE.setReadOnly(not complete)
         else:
-            self.dataTE.setReadOnly(False)
-            xdata, ydata = self.datadict[key]
-            text = '# DATASET= "%s"\n' % key
-            text += "# SNAPSHOT_TIME= %s\n" % self.datatime.isoformat('_')
-            if self.xIsTime():
-                for x, y in zip(xdata, ydata):
-                    t = datetime.fromtimestamp(x)
-                    text += "%s\t%r\n"%(t.isoformat('_'), y)
-            else:
-                for x, y in zip(xdata, ydata):
-                    text += "%r\t%r\n" %(x, y)
-            self.dataTE.clear()
-            self.dataTE.insertPlainText(text)
-            self.dataTE.moveCursor(Qt.QTextCursor.Start)
+            complete = self._showPreview([key])
+            self.dataTE.setReadOnly(not complete)
 
     def setXIsTime(self, xIsTime):
         self._xIsTime = xIsTime
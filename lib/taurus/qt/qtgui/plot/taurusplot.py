@@ -29,7 +29,6 @@ taurusplot.py: Generic graphical plotting widget for Taurus
 __all__ = ["TaurusCurve", "TaurusCurveMarker",
            "TaurusXValues", "TaurusPlot", "isodatestr2float"]
 
-import os
 import copy
 from datetime import datetime
 import time
@@ -42,6 +41,9 @@ from taurus.core.taurusmanager import getSchemeFromName
 from taurus.core.taurusbasetypes import DataFormat
 # TODO: Tango-centric
 from taurus.core.util.containers import LoopList, CaselessDict, CaselessList
+from taurus.core.util import dataio
+from taurus.core.util.curvestats import CurveStats
+from taurus.core.util.metrics import MetricsRegistry
 from taurus.core.util.safeeval import SafeEvaluator
 from taurus.qt.qtcore.util.signal import baseSignal
 from taurus.qt.qtcore.mimetypes import TAURUS_MODEL_LIST_MIME_TYPE, TAURUS_ATTR_MIME_TYPE
@@ -255,6 +257,10 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
         self._rawData = rawData
         self._xValues = None
         self._yValues = None
+        self._curveStats = None
+        # (appended, discarded) points since the stats were last synced, if
+        # known (see getStats)
+        self._statsChanges = None
         self._showMaxPeak = False
         self._showMinPeak = False
         #self._markerFormatter = self.defaultMarkerFormatter
@@ -566,6 +572,9 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
         :param reason: (str) The reason of the drop
         '''
         self.debug("Droping event. Reason %s", reason)
+        metrics = MetricsRegistry()
+        if metrics.enabled:
+            metrics.count('dropped_events', self.modelName)
         self.droppedEventsCount += 1
         self.consecutiveDroppedEventsCount += 1
         mustwarn = False
@@ -878,10 +887,15 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
                  -'mean' : arithmetic average of y (float)
                  -'std' : (biased)standard deviation of y (float)
                  -'rms' : root mean square of y (float)
+                 -'integral' : integral of y over x (trapezoidal rule) (float)
 
         Note that some of the values may be None if that cannot be computed.
 
-        Also,
+        The statistics are obtained from running aggregates which are kept
+        between calls (see :class:`taurus.core.util.curvestats.CurveStats`).
+        If the owner of the data reports how many points were appended and
+        discarded since the previous call (as :class:`TaurusTrendsSet` does),
+        only those changes are processed.
 
         :param limits: (None or tuple<float,float>) tuple containing (min,max) limits.
                         Points of the curve whose abscisa value is outside of
@@ -898,51 +912,22 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
 
         :return: (dict) A dict containing the stats.
         '''
-
         data = self.data()
-        if imin is None:
-            imin = 0
-        if imax is None:
-            imax = data.size()
-
-        x = numpy.array([data.x(i) for i in xrange(imin, imax)])
-        y = numpy.array([data.y(i) for i in xrange(imin, imax)])
-
-        if limits is not None:
-            xmin, xmax = limits
-            if xmax is None:
-                xmax = numpy.inf
-            if inclusive:
-                mask = (x >= xmin) * (x <= xmax)
-            else:
-                mask = (x > xmin) * (x < xmax)
-            x = x[mask]
-            y = y[mask]
-
-        if ignorenans:
-            # we remove points where either x or y are Nan
-            mask = numpy.invert(numpy.isnan(x + y))
-            x = x[mask]
-            y = y[mask]
-
-        ret = {'x': x,
-               'y': y,
-               'points': x.size,
-               'min': None,
-               'max': None,
-               'mean': None,
-               'std': None,
-               'rms': None}
-
-        if x.size > 0:
-            argmin = y.argmin()
-            argmax = y.argmax()
-            ret.update({'min': (x[argmin], y[argmin]),
-                        'max': (x[argmax], y[argmax]),
-                        'mean': y.mean(),
-                        'std': y.std(),
-                        'rms': numpy.sqrt(numpy.mean(y ** 2))})
-        return ret
+        x, y = self._xValues, self._yValues
+        changes, self._statsChanges = self._statsChanges, None
+        # use the stored values (unless the plotted data differs, e.g. because
+        # of filtering of non-positive values in log scale)
+        if not (isinstance(x, numpy.ndarray) and isinstance(y, numpy.ndarray)
+                and x.shape == y.shape and x.size == data.size()):
+            x = numpy.array([data.x(i) for i in xrange(data.size())])
+            y = numpy.array([data.y(i) for i in xrange(data.size())])
+            changes = None
+        if self._curveStats is None:
+            self._curveStats = CurveStats()
+        self._curveStats.sync(x, y, *(changes or (None, None)))
+        return self._curveStats.getStats(limits=limits, inclusive=inclusive,
+                                         imin=imin, imax=imax,
+                                         ignorenans=ignorenans)
 
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
     # Methods necessary to show/hide peak values
@@ -1830,7 +1815,8 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                 # if no x is given, the indices will be used
                 x = numpy.arange(len(y))
             else:
-                x = numpy.array(x)
+                # asarray does not copy the (possibly memory-mapped) arrays
+                x = numpy.asarray(x)
         else:
             if y is not None:
                 raise ValueError(
@@ -1839,7 +1825,7 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                 # we need x values in which to evaluate
                 raise ValueError('Missing "x" values')
             title = str(rawdata.get("title", fx))
-            x = numpy.array(x)
+            x = numpy.asarray(x)
             sev = SafeEvaluator({'x': x})
             try:
                 y = sev.eval(fx)
@@ -1853,7 +1839,7 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
 #        ey=rawdata.get("ey",numpy.zeros(len(y)))
 
         # at this point, both x and y must be valid
-        y = numpy.array(y)
+        y = numpy.asarray(y)
 
         if id is None:
             name = title
@@ -1952,7 +1938,9 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
         finally:
             self.curves_lock.release()
         if numpy:
-            x, y = numpy.array(x), numpy.array(y)
+            # (the numpy argument hides the numpy module)
+            from numpy import array
+            x, y = array(x), array(y)
         return x, y
 
     def updateCurves(self, names):
@@ -2725,15 +2713,9 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                         exportable. if None given, all curves are offered for
                         export.
         '''
-        self.curves_lock.acquire()
-        try:
-            if curves is None:
-                curves = self.getCurveNamesSorted()
-            frozendata = {}
-            for k in curves:
-                frozendata[k] = self.getCurveData(k)
-        finally:
-            self.curves_lock.release()
+        if curves is None:
+            curves = self.getCurveNamesSorted()
+        frozendata = self.getCurvesDataSnapshot(curves)
         klass = getattr(self, 'exportDlgClass', None)
         if klass is None:
             from taurus.qt.qtgui.panel import QDataExportDialog
@@ -2743,6 +2725,56 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
         dialog.setXIsTime(self.getXIsTime())
         return dialog.exec_()
 
+    def getCurvesDataSnapshot(self, curves=None):
+        """returns a copy of the data of the given curves as numpy arrays.
+        Unlike :meth:`getCurveData`, it does not iterate over the points of
+        each curve, so it is suitable for large curves.
+
+        :param curves: (sequence<str> or None) names of the curves. If None,
+                       all curves are included
+
+        :return: (dict<str,tuple>) dictionary of the form {name:(x,y)}
+        """
+        self.curves_lock.acquire()
+        try:
+            if curves is None:
+                curves = self.getCurveNamesSorted()
+            frozendata = {}
+            for k in curves:
+                curve = self.curves.get(k)
+                x = getattr(curve, '_xValues', None)
+                y = getattr(curve, '_yValues', None)
+                if (isinstance(x, numpy.ndarray) and
+                        isinstance(y, numpy.ndarray) and
+                        x.shape == y.shape):
+                    frozendata[k] = x.copy(), y.copy()
+                else:
+                    frozendata[k] = self.getCurveData(k, numpy=True)
+        finally:
+            self.curves_lock.release()
+        return frozendata
+
+    def exportData(self, fileName, curves=None, fmt=None):
+        """Exports the data of the given curves to a file without going
+        through the export dialog. The data is written in chunks, so it is
+        suitable for curves with a large number of points.
+
+        :param fileName: (str) output file name
+        :param curves: (sequence<str> or None) the curves to be exported. If
+                       None, all curves are exported
+        :param fmt: (str or None) one of "ascii", "npz" or "raw" (see
+                    :mod:`taurus.core.util.dataio`). If None, it is guessed
+                    from the fileName extension
+
+        .. note:: the "ascii" format requires that all the exported curves
+                  share the same abscissas
+        """
+        if curves is None:
+            curves = self.getCurveNamesSorted()
+        frozendata = self.getCurvesDataSnapshot(curves)
+        dataio.exportData(str(fileName), frozendata, sortedNames=curves,
+                          fmt=fmt, xIsTime=self.getXIsTime())
+
     def importAscii(self, filenames=None, xcol=None, **kwargs):
         '''imports curves from ASCII files. It uses :meth:numpy.loadtxt
         The data in the file(s) must be formatted in columns, with possibly a
@@ -2770,36 +2802,26 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                          - usecols=None
                          - unpack=False
 
-        .. seealso:: :meth:`numpy.loadtxt`
+        Files written by :meth:`exportData` in the "npz" or "raw" binary
+        formats are also accepted (in which case, xcol and kwargs are ignored
+        and the curves are restored with their original names).
+
+        .. seealso:: :meth:`numpy.loadtxt`, :mod:`taurus.core.util.dataio`
         '''
         if filenames is None:
             filenames = Qt.QFileDialog.getOpenFileNames(
-                self, 'Choose input files', '', 'Ascii file (*)')
+                self, 'Choose input files', '',
+                'Ascii file (*);;Numpy archive (*.npz);;Raw data (*.raw)')
         if not filenames:
             return False
-        rawdata = {}
         for fname in filenames:
             fname = str(fname)
             if self.xIsTime and xcol is not None:
                 converters = kwargs.get('converters', {})
                 converters[xcol] = isodatestr2float
                 kwargs['converters'] = converters
-            M = numpy.loadtxt(fname, **kwargs)
-            if len(M.shape) == 1:
-                # make sure we are dealing with a 2D matrix even if it is just
-                # a colum
-                M = M.reshape(M.size, 1)
-            if xcol is None:
-                rawdata["x"] = None
-            else:
-                rawdata["x"] = M[:, xcol]
-
-            for col in xrange(M.shape[1]):
-                if col == xcol:
-                    continue  # ignore the xcol (it has already been set)
-                rawdata["y"] = M[:, col]
-                rawdata["title"] = "%s[%i]" % (os.path.basename(fname), col)
-                self.attachRawData(copy.deepcopy(rawdata))
+            for rawdata in dataio.importData(fname, xcol=xcol, **kwargs):
+                self.attachRawData(rawdata)
 
     def showDataImportDlg(self):
         '''Launches the data import dialog. This dialog lets the user manage
@@ -3693,7 +3715,9 @@ def main():
     parser.add_option("--import-ascii", dest="import_ascii", default=None,
                       help="import the given ascii file into the plot")
     parser.add_option("--export", "--export-file", dest="export_file", default=None,
-                      help="use the given file to as output instead of showing the plot")
+                      help="use the given file to as output instead of showing the plot. "
+                      "Use the .pdf extension for exporting an image or .dat, .npz or .raw "
+                      "for exporting the data")
     parser.add_option("--window-name", dest="window_name",
                       default="TaurusPlot", help="Name of the window")
 
@@ -3721,7 +3745,8 @@ def main():
         w.setModel(models)
         
     if options.export_file is not None:
-        curves = dict.fromkeys(w.trendSets.keys(), 0)
+        curves = dict.fromkeys([n for n in w.getCurveNamesSorted()
+                                if not w.curves[n].isRawData], 0)
 
         def exportIfAllCurves(curve, trend=w, counters=curves):
             curve = str(curve)
@@ -3729,15 +3754,17 @@ def main():
             if curve in counters:
                 counters[curve] += 1
                 if all(counters.values()):
-                    trend.exportPdf(options.export_file)
+                    if options.export_file.lower().endswith('.pdf'):
+                        trend.exportPdf(options.export_file)
+                    else:
+                        trend.exportData(options.export_file)
                     print '*' * 10 + ' %s: Exported to : %s  ' % (datetime.now().isoformat(), options.export_file) + '*' * 10
                     trend.close()
             return
         if not curves:
             w.close()
         else:
-            for ts in w.trendSets.values():
-                ts.dataChanged.connect(exportIfAllCurves)
+            w.dataChanged.connect(exportIfAllCurves)
         sys.exit(app.exec_())  # exit without showing the widget
 
     # show the widget
@@ -39,11 +39,17 @@ from taurus.external.qt import Qt, Qwt5
 import taurus.core
 from taurus.core.taurusattribute import TaurusAttribute
 from taurus.core.util.containers import CaselessDict, CaselessList, ArrayBuffer
+from taurus.core.util.metrics import MetricsRegistry
+from taurus.core.util.archiving import getDefaultArchivingReader, \
+    ArchivingBackfill
 from taurus.qt.qtgui.base import TaurusBaseComponent
 from taurus.qt.qtgui.plot import TaurusPlot
 
 
 def getArchivedTrendValues(*args, **kwargs):
+    '''Kept for backwards compatibility. TaurusTrend now uses an
+    :class:`taurus.core.util.archiving.ArchivingReader` (see
+    :meth:`TaurusTrend.setArchivingReader`)'''
     try:
         import PyTangoArchiving  # TODO: tango-centric
         return PyTangoArchiving.getArchivedTrendValues(*args, **kwargs)
@@ -99,6 +105,7 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
         self.call__init__(TaurusBaseComponent, self.__class__.__name__)
         self._xBuffer = None
         self._yBuffer = None
+        self._archivingEnd = None
         self.forcedReadingTimer = None
         self.droppedEventsCount = 0
         self.consecutiveDroppedEventsCount = 0
@@ -331,6 +338,7 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
         if self._yBuffer is None:
             self._yBuffer = ArrayBuffer(numpy.zeros(
                 (min(128, self._maxBufferSize), ntrends), dtype='d'), maxSize=self._maxBufferSize)
+        npoints = len(self._xBuffer)
         if value is not None:
             if attr.isNumeric():
                 v = value.rvalue.magnitude
@@ -349,23 +357,86 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
                 self._xBuffer.append(value.time.totime())
             # Adding archiving values
             if self.parent().getUseArchiving():
-                # open a mysql connection for online trends or any not
+                # request archived data for online trends or any not
                 # autoscaled plots
                 if self.parent().getXDynScale() or not self.parent().axisAutoScale(Qwt5.QwtPlot.xBottom):
-                    try:
-                        getArchivedTrendValues(self, model, insert=True)
-                    except Exception, e:
-                        import traceback
-                        self.warning('%s: reading from archiving failed: %s' % (
-                            datetime.now().isoformat('_'), traceback.format_exc()))
+                    self._requestArchivedData()
         elif value is not None:
             # add the event number to the x buffer
             try:
                 self._xBuffer.append(1. + self._xBuffer[-1])
             except IndexError:  # this will happen when the x buffer is empty
                 self._xBuffer.append(0)
+        appended = int(value is not None)
+        self._addStatsChanges(appended, npoints + appended -
+                              len(self._xBuffer))
         return self._xBuffer.contents(), self._yBuffer.contents()
 
+    def _addStatsChanges(self, appended, discarded):
+        '''accumulates, for each curve, the number of points appended to and
+        discarded from the history buffers since its stats were last updated
+        (so that :meth:`TaurusCurve.getStats` only processes the changes)'''
+        for n, c in self.getCurves():
+            a, d = c._statsChanges or (0, 0)
+            c._statsChanges = (a + appended, d + discarded)
+
+    def _requestArchivedData(self):
+        '''requests (asynchronously) the archived values for the part of the
+        x axis range which is before the first value received. The values are
+        inserted in the history by :meth:`mergeArchivedData`'''
+        backfill = self.parent().getArchivingBackfill()
+        if backfill is None:
+            return
+        if self._archivingEnd is None:
+            if len(self._xBuffer):
+                self._archivingEnd = self._xBuffer[0]
+            else:
+                self._archivingEnd = time.time()
+        start = self.parent().axisScaleDiv(Qwt5.QwtPlot.xBottom).lowerBound()
+        if start < self._archivingEnd:
+            backfill.request(self.getModel(), start, self._archivingEnd)
+
+    def mergeArchivedData(self, t, v):
+        '''Inserts archived values in the history buffers (keeping them sorted
+        by time) and updates the curves. Values that do not fit in the
+        buffers (see :meth:`setMaxDataBufferSize`) are discarded, starting
+        from the oldest.
+
+        :param t: (numpy.ndarray) timestamps
+        :param v: (numpy.ndarray) values (one row per timestamp)
+        '''
+        if self._xBuffer is None or self._yBuffer is None or not self._curves:
+            return
+        v = numpy.asarray(v, dtype='d')
+        if v.ndim == 1:
+            v = v.reshape(v.size, 1)
+        ycontents = self._yBuffer.contents()
+        if v.shape[1:] != ycontents.shape[1:]:
+            self.warning('Ignoring archived values of %s (shape mismatch)',
+                         self.getModel())
+            return
+        x = numpy.concatenate((numpy.asarray(t, dtype='d'),
+                               self._xBuffer.contents()))
+        y = numpy.concatenate((v, ycontents))
+        order = numpy.argsort(x, kind='mergesort')[-self._maxBufferSize:]
+        x, y = x[order], y[order]
+        bsize = max(len(x), min(128, self._maxBufferSize))
+        self._xBuffer = ArrayBuffer(numpy.zeros(bsize, dtype='d'),
+                                    maxSize=self._maxBufferSize)
+        self._yBuffer = ArrayBuffer(numpy.zeros((bsize, y.shape[1]),
+                                                dtype='d'),
+                                    maxSize=self._maxBufferSize)
+        self._xBuffer.extend(x)
+        self._yBuffer.extend(y)
+        self._xValues = self._xBuffer.contents()
+        self._yValues = self._yBuffer.contents()
+        for i, (n, c) in enumerate(self.getCurves()):
+            c._xValues, c._yValues = self._xValues, self._yValues[:, i]
+            # the buffers were rebuilt: the stats must be fully recomputed
+            c._curveStats = None
+            c._updateMarkers()
+        self.dataChanged.emit(Qt.QString(self.getModel()))
+
     def clearTrends(self, replot=True):
         '''clears all stored data (buffers and copies of the curves data)
 
@@ -379,6 +450,11 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
         # clean history Buffers
         self._xBuffer = None
         self._yBuffer = None
+        # forget the archived intervals already retrieved
+        self._archivingEnd = None
+        backfill = self.parent().getArchivingBackfill(create=False)
+        if backfill is not None:
+            backfill.clear(self.getModel())
         # clean x,ydata
         self._xValues = None
         self._yValues = None
@@ -486,6 +562,9 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
         :param reason: (str) The reason of the drop
         '''
         self.debug("Dropping event. Reason %s", reason)
+        metrics = MetricsRegistry()
+        if metrics.enabled:
+            metrics.count('dropped_events', self.modelName)
         self.droppedEventsCount += 1
         self.consecutiveDroppedEventsCount += 1
         mustwarn = False
@@ -902,6 +981,7 @@ class TaurusTrend(TaurusPlot):
     DEFAULT_MAX_BUFFER_SIZE = 65536  # (=2**16, i.e., 64K events))
 
     dataChanged = Qt.pyqtSignal('QString')
+    _archivedDataReceived = Qt.pyqtSignal(object)
 
     def __init__(self, parent=None, designMode=False):
         TaurusPlot.__init__(self, parent=parent, designMode=designMode)
@@ -909,6 +989,9 @@ class TaurusTrend(TaurusPlot):
         self._supportedConfigVersions = ["ttc-1"]
         self._xDynScaleSupported = True
         self._useArchiving = False
+        self._archivingReader = None
+        self._archivingBackfill = None
+        self._archivedDataReceived.connect(self._onArchivedDataReceived)
         self._usePollingBuffer = False
         self.setDefaultCurvesTitle('<label><[trend_index]>')
         self._maxDataBufferSize = self.DEFAULT_MAX_BUFFER_SIZE
@@ -1192,6 +1275,9 @@ class TaurusTrend(TaurusPlot):
             for name in del_sets:
                 name = str(name)
                 tset = self.trendSets.pop(name)
+                backfill = self.getArchivingBackfill(create=False)
+                if backfill is not None:
+                    backfill.clear(tset.getModel())
                 tset.setModel(None)
                 tset.unregisterDataChanged(self, self.curveDataChanged)
                 tset.forcedReadingTimer = None
@@ -1596,12 +1682,72 @@ class TaurusTrend(TaurusPlot):
         '''Same as setUseArchiving(True)'''
         self.setUseArchiving(True)
 
+    def setArchivingReader(self, reader):
+        '''sets the reader used for retrieving archived values (see
+        :meth:`setUseArchiving`)
+
+        :param reader: (ArchivingReader or None) the archiving reader. If
+                       None, the default reader is used (see
+                       :func:`taurus.core.util.archiving.getDefaultArchivingReader`)
+        '''
+        self._archivingReader = reader
+        self._archivingBackfill = None
+
+    def getArchivingReader(self):
+        '''returns the reader used for retrieving archived values
+
+        :return: (ArchivingReader or None) the archiving reader (None if
+                 archiving is not available)
+
+        .. seealso:: :meth:`setArchivingReader`
+        '''
+        if self._archivingReader is None:
+            return getDefaultArchivingReader()
+        return self._archivingReader
+
+    def getArchivingBackfill(self, create=True):
+        '''returns the object in charge of retrieving the archived values.
+        It keeps track of the time intervals already retrieved for each
+        trend set so that they are not requested again.
+
+        :param create: (bool) whether to create it if it does not exist yet
+
+        :return: (ArchivingBackfill or None) None if archiving is not
+                 available (or if it was not created and create is False)
+        '''
+        if self._archivingBackfill is None and create:
+            reader = self.getArchivingReader()
+            if reader is not None:
+                self._archivingBackfill = ArchivingBackfill(
+                    reader, self._onArchivedData, parent=self)
+        return self._archivingBackfill
+
+    def _onArchivedData(self, model, t, v):
+        '''callback for the archiving backfill (called from a worker thread).
+        It passes the data to the GUI thread'''
+        self._archivedDataReceived.emit((model, t, v))
+
+    def _onArchivedDataReceived(self, data):
+        '''inserts the archived values in the corresponding trend set'''
+        model, t, v = data
+        self.curves_lock.acquire()
+        try:
+            tset = self.trendSets.get(model)
+            if tset is not None and self.getUseArchiving():
+                tset.mergeArchivedData(t, v)
+        finally:
+            self.curves_lock.release()
+
     def _onUseArchivingAction(self, enable):
         '''slot being called when toggling the useArchiving action
 
         .. seealso:: :meth:`setUseArchiving`
         '''
         if enable:
+            # allow retrying intervals that previously failed
+            backfill = self.getArchivingBackfill(create=False)
+            if backfill is not None:
+                backfill.clear()
             self._archivingWarningThresshold = self._startingTime - \
                 600  # 10 min before the widget was created
             self.axisWidget(self.xBottom).scaleDivChanged.connect(self._scaleChangeWarning)
@@ -1888,7 +2034,9 @@ def main():
     parser.add_option("--config", "--config-file", dest="config_file", default=None,
                       help="use the given config file for initialization")
     parser.add_option("--export", "--export-file", dest="export_file", default=None,
-                      help="use the given file to as output instead of showing the plot")
+                      help="use the given file to as output instead of showing the plot. "
+                      "Use the .pdf extension for exporting an image or .dat, .npz or .raw "
+                      "for exporting the data")
     parser.add_option("-r", "--forced-read", dest="forced_read_period", type="int", default=-1, metavar="MILLISECONDS",
                       help="force Taurustrend to re-read the attributes every MILLISECONDS ms")
     parser.add_option("-a", "--use-archiving",
@@ -1930,7 +2078,10 @@ def main():
             if curve in counters:
                 counters[curve] += 1
                 if all(counters.values()):
-                    trend.exportPdf(options.export_file)
+                    if options.export_file.lower().endswith('.pdf'):
+                        trend.exportPdf(options.export_file)
+                    else:
+                        trend.exportData(options.export_file)
                     print '*' * 10 + ' %s: Exported to : %s  ' % (datetime.now().isoformat(), options.export_file) + '*' * 10
                     trend.close()
             return
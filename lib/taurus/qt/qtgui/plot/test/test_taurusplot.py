@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the data export/import of TaurusPlot"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from taurus.core.util import dataio
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.plot import TaurusPlot
+
+
+class TaurusPlotDataIOTestCase(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for exporting and importing the raw data curves of TaurusPlot
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusPlot
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._dir = tempfile.mkdtemp()
+        self._x = numpy.arange(10.)
+        self._y = self._x ** 2
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+        unittest.TestCase.tearDown(self)
+
+    def test_getCurveData(self):
+        '''Check that getCurveData can return numpy arrays'''
+        self._widget.attachRawData(dict(x=list(self._x), y=list(self._y),
+                                        title='raw'))
+        x, y = self._widget.getCurveData('raw', numpy=True)
+        self.assertIsInstance(x, numpy.ndarray)
+        numpy.testing.assert_array_equal(y, self._y)
+
+    def test_exportRawDataCurve(self):
+        '''Check that the raw data curves can be exported and imported'''
+        self._widget.attachRawData(dict(x=self._x, y=self._y, title='raw'))
+        for ext in ('dat', 'npz', 'raw'):
+            fname = os.path.join(self._dir, 'data.%s' % ext)
+            self._widget.exportData(fname)
+            sets = dataio.importData(fname, xcol=0)
+            self.assertEqual(len(sets), 1)
+            numpy.testing.assert_array_almost_equal(sets[0]['x'], self._x)
+            numpy.testing.assert_array_almost_equal(sets[0]['y'], self._y)
+
+    def test_importRawIsNotCopied(self):
+        '''Check that the memory-mapped raw data reaches the curve'''
+        fname = os.path.join(self._dir, 'data.raw')
+        dataio.exportData(fname, {'raw': (self._x, self._y)})
+        self._widget.importAscii([fname])
+        rawdata = dataio.importData(fname)[0]
+        curve = self._widget.curves['raw']
+        self.assertIsInstance(rawdata['y'], numpy.memmap)
+        numpy.testing.assert_array_equal(curve._yValues, self._y)
+        self.assertFalse(curve._yValues.flags.owndata)
@@ -40,7 +40,7 @@ import socket
 import taurus
 from taurus.core.util.log import Logger
 from taurus.core.util.remotelogmonitor import LogRecordStreamHandler, \
-    LogRecordSocketReceiver
+    LogRecordSocketReceiver, LogRecordSelectorReceiver
 from taurus.core.util.decorator.memoize import memoized
 
 from taurus.external.qt import Qt
@@ -300,6 +300,10 @@ class QLoggingTableModel(Qt.QAbstractTableModel, logging.Handler):
     def emit(self, record):
         self._accumulated_records.append(record)
 
+    def emitRecords(self, records):
+        """Adds a batch of records (they are shown in the next update)"""
+        self._accumulated_records.extend(records)
+
     def flush(self):
         pass
 
@@ -315,14 +319,31 @@ class _LogRecordStreamHandler(LogRecordStreamHandler):
         self.server.data.get('model').emit(record)
 
 
+class _LogRecordSelectorReceiver(LogRecordSelectorReceiver):
+
+    def handleLogRecords(self, records):
+        self.data.get('model').emitRecords(records)
+
+
 class QRemoteLoggingTableModel(QLoggingTableModel):
     """A remote Qt table that displays the taurus logging messages"""
 
     def connect_logging(self, host='localhost',
                         port=logging.handlers.DEFAULT_TCP_LOGGING_PORT,
-                        handler=_LogRecordStreamHandler):
-        self.log_receiver = LogRecordSocketReceiver(host=host, port=port,
-                                                    handler=handler, model=self)
+                        handler=None, name=None, level=None):
+        """Starts receiving the log records sent to the given host and port.
+
+        By default, all the connections are served from a single thread and
+        the records can be filtered by logger name and level. If a
+        :class:`LogRecordStreamHandler` class is given, a thread per
+        connection is used instead (and the filters are ignored)
+        """
+        if handler is None:
+            self.log_receiver = _LogRecordSelectorReceiver(
+                host=host, port=port, name=name, level=level, model=self)
+        else:
+            self.log_receiver = LogRecordSocketReceiver(
+                host=host, port=port, handler=handler, model=self)
         self.log_thread = threading.Thread(
             target=self.log_receiver.serve_until_stopped)
         self.log_thread.daemon = False
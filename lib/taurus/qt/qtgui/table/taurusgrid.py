@@ -64,6 +64,73 @@ def re_match_low(regexp, target):
     return re.match(regexp.lower(), target.lower())
 
 
+plain_token = re.compile('^[\w\-]+$')
+
+
+class LabelClassifier(object):
+    """
+    Classifies models into the grid rows (or columns), i.e. it returns the
+    first label whose expression is found in the model name (case
+    insensitive, with `*` as wildcard), or 'Others' if none matches.
+
+    The expressions are compiled only once, the expressions that are plain
+    tokens (e.g. domain or family names) are looked up in a dictionary and
+    the results are cached, so that models can be added incrementally.
+    """
+
+    def __init__(self, labels):
+        self.labels = self._strip(labels)
+        self._regexps = []
+        self._tokens = {}
+        self._cache = {}
+        for i, (label, rexp) in enumerate(self.labels):
+            if '*' in rexp and '.*' not in rexp:
+                rexp = rexp.replace('*', '.*')
+            rexp = rexp.lower()
+            if plain_token.match(rexp):
+                self._tokens.setdefault(rexp, i)
+            else:
+                self._regexps.append((i, re.compile(rexp).search))
+        self._lengths = sorted(set(len(t) for t in self._tokens))
+
+    @staticmethod
+    def _strip(labels):
+        # trailing ('Others','.*') labels just match what no other label
+        # matches (they are appended by TaurusGrid when needed)
+        labels = [tuple(l) for l in labels]
+        while labels and labels[-1] == ('Others', '.*'):
+            labels.pop()
+        return labels
+
+    def matches(self, labels):
+        """Returns True if this classifier is valid for the given labels"""
+        return self.labels == self._strip(labels)
+
+    def classify(self, model):
+        """Returns the label for the given model"""
+        try:
+            return self._cache[model]
+        except KeyError:
+            pass
+        m = model.lower()
+        # first token found in the model (looking up its substrings)
+        end = len(self.labels)
+        tokens = self._tokens
+        for n in self._lengths:
+            for j in xrange(len(m) - n + 1):
+                end = min(end, tokens.get(m[j:j + n], end))
+        # only the regular expressions before it have to be checked
+        for i, search in self._regexps:
+            if i >= end:
+                break
+            if search(m):
+                end = i
+                break
+        label = self.labels[end][0] if end < len(self.labels) else 'Others'
+        self._cache[model] = label
+        return label
+
+
 def get_all_models(expressions, limit=1000):
     '''
     All devices matching expressions must be obtained.
@@ -263,6 +330,8 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
         self._modelNames = []
         self.row_labels = []
         self.column_labels = []
+        self._row_classifier = None
+        self._column_classifier = None
         self._widgets_list = []
         self._last_selected = None
         self._show_frames = True
@@ -674,27 +743,25 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
             # values[domain][family].append(m)
 
         row_not_found, col_not_found = False, False
+        # the classifiers (and their cached results) are reused as long as
+        # the labels do not change (e.g. when appending models)
+        if not (self._row_classifier and
+                self._row_classifier.matches(self.row_labels)):
+            self._row_classifier = LabelClassifier(self.row_labels)
+        if not (self._column_classifier and
+                self._column_classifier.matches(self.column_labels)):
+            self._column_classifier = LabelClassifier(self.column_labels)
+        classify_row = self._row_classifier.classify
+        classify_column = self._column_classifier.classify
 
         for m in models:
-            row, column = 'Others', 'Others'
-            for label, rexp in self.row_labels:
-                if '*' in rexp and '.*' not in rexp:
-                    rexp = rexp.replace('*', '.*')
-                if re_search_low(rexp, m):
-                    row = label
-                    break
-            for label, rexp in self.column_labels:
-                if '*' in rexp and '.*' not in rexp:
-                    rexp = rexp.replace('*', '.*')
-                if re_search_low(rexp, m):
-                    column = label
-                    break
+            row, column = classify_row(m), classify_column(m)
             if 'Others' == row:
                 row_not_found = True
             if 'Others' == column:
                 col_not_found = True
-            self.debug('Model %s added to row %s , column %s' %
-                       (m, row, column))
+            self.debug('Model %s added to row %s , column %s',
+                       m, row, column)
             values[row][column].append(m)
         if row_not_found:
             self.row_labels.append(('Others', '.*'))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the row/column classification of TaurusGrid"""
+
+import unittest
+
+from taurus.test import insertTest
+from taurus.qt.qtgui.table.taurusgrid import LabelClassifier, re_search_low
+
+
+MODELS = ['SR01/VC/IP-01/Pressure', 'sr01/vc/ccg-01/pressure',
+          'sr02/VC/CCG-02/State', 'sr03/di/bpm-05/x', 'sr12/vc/ip-12/current',
+          'bl01/vc/ip-01/pressure', 'bl01/ct/alarms/state', 'ct/vc/bl01/state',
+          'sys/tg_test/1/double_scalar', 'a/b-c/d/e', 'ccg', '']
+
+
+@insertTest(helper_name='compare',
+            labels=[('SR01', 'sr01'), ('SR02', 'SR02'), ('BL', 'bl01')])
+@insertTest(helper_name='compare',
+            labels=[('IP', 'ip'), ('VC', 'vc'), ('Pressure', 'pressure'),
+                    ('dash', 'b-c')])
+@insertTest(helper_name='compare',
+            labels=[('Gauges', '*ccg*'), ('Pumps', 'vc/ip*'),
+                    ('Storage ring', 'sr*/vc')])
+@insertTest(helper_name='compare',
+            labels=[('first', '^sr0[1-2]'), ('IP', 'ip'),
+                    ('end', 'state$'), ('VC', 'vc'), ('Any', 'ip.*pressure')])
+@insertTest(helper_name='compare',
+            labels=[('VC', 'vc'), ('Ion pumps', 'ip-.*'), ('Others', '.*'),
+                    ('BL', 'bl*')])
+@insertTest(helper_name='compare', labels=[('Others', '.*')])
+@insertTest(helper_name='compare', labels=[])
+class LabelClassifierTestCase(unittest.TestCase):
+    '''Check that LabelClassifier groups the models as the row/column
+    classification loop of TaurusGrid did before it was introduced'''
+
+    def _reference(self, labels, model):
+        for label, rexp in labels:
+            if '*' in rexp and '.*' not in rexp:
+                rexp = rexp.replace('*', '.*')
+            if re_search_low(rexp, model):
+                return label
+        return 'Others'
+
+    def compare(self, labels):
+        '''Check the classification against the reference'''
+        classifier = LabelClassifier(labels)
+        self.assertTrue(classifier.matches(labels))
+        for _ in range(2):  # the second time, cached results are used
+            for model in MODELS:
+                self.assertEqual(classifier.classify(model),
+                                 self._reference(labels, model),
+                                 'wrong label for "%s"' % model)
+
+    def test_matches(self):
+        '''Check that a classifier is only valid for its labels'''
+        labels = [('VC', 'vc'), ('IP', 'ip')]
+        classifier = LabelClassifier(labels)
+        self.assertTrue(classifier.matches(labels + [('Others', '.*')]))
+        self.assertFalse(classifier.matches(labels[::-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -72,6 +72,17 @@ SYNOPTIC = ['images/example01.jdw', 'images/syn2.jdw']
 #=========================================================================
 INSTRUMENTS_FROM_POOL = False
 
+#=========================================================================
+# Set LAZY_PANELS to True for creating the panel widgets only when they are
+# shown for the first time (this speeds up the startup of GUIs with many
+# panels).
+# Set STARTUP_CACHE to True for caching the resolved panel descriptions
+# (including the instruments from the Pool) between executions. The cache is
+# invalidated whenever this file (or the XML_CONFIG file) changes.
+#=========================================================================
+LAZY_PANELS = False
+STARTUP_CACHE = False
+
 #=========================================================================
 # Define panels to be shown.
 # To define a panel, instantiate a PanelDescription object (see documentation
@@ -35,6 +35,8 @@ import sys
 import copy
 import weakref
 import inspect
+import hashlib
+import cPickle as pickle
 
 from lxml import etree
 
@@ -136,6 +138,70 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
         # store a weakref of the main window
         self._mainwindow = weakref.proxy(mainwindow)
 
+        # description of the widget to be created on demand (lazy panels)
+        self._widgetDescription = None
+        self._pendingConfig = None
+
+    def setWidgetDescription(self, description):
+        """Sets a description of the widget to be created on demand.
+
+        The widget described will not be instantiated until the panel is
+        shown for the first time (or :meth:`createWidget` is called). Until
+        then, a placeholder widget is used.
+
+        :param description: (PanelDescription) the description of the widget
+        """
+        self._widgetDescription = description
+        placeholder = Qt.QLabel('Loading %s...' % description.name)
+        placeholder.setAlignment(Qt.Qt.AlignCenter)
+        self.setWidget(placeholder)
+        self.visibilityChanged.connect(self._onLazyVisibilityChanged)
+
+    def getWidgetDescription(self):
+        """Returns the description of the widget which is still to be created,
+        or None if the panel widget has already been created
+
+        :return: (PanelDescription or None)
+        """
+        return self._widgetDescription
+
+    def isWidgetCreated(self):
+        """Returns whether the panel widget has been created (always True for
+        panels which are not created lazily)
+
+        :return: (bool)
+        """
+        return self._widgetDescription is None
+
+    def createWidget(self):
+        """Creates the widget described by :meth:`getWidgetDescription` (if
+        not already created) and applies any configuration which was
+        restored before its creation.
+        """
+        description = self._widgetDescription
+        if description is None:
+            return
+        self._widgetDescription = None
+        self.visibilityChanged.disconnect(self._onLazyVisibilityChanged)
+        self.debug('Creating widget for panel "%s"' % description.name)
+        try:
+            w = self._mainwindow._createPanelWidget(description)
+        except Exception, e:
+            self.error('Cannot create widget for panel "%s"' %
+                       description.name)
+            self.traceback(level=taurus.Info)
+            self.widget().setText('Cannot create %s:\n%r' %
+                                  (description.name, e))
+            return
+        self.setWidget(w)
+        configdict, self._pendingConfig = self._pendingConfig, None
+        if configdict is not None:
+            self.applyConfig(configdict)
+
+    def _onLazyVisibilityChanged(self, visible):
+        if visible:
+            self.createWidget()
+
     def isCustom(self):
         return self._custom
 
@@ -173,23 +239,37 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
             w.setObjectName(wname)
 
     def getWidgetModuleName(self):
+        if not self.isWidgetCreated():
+            if self._pendingConfig is not None:
+                return self._pendingConfig.get('widgetModuleName', '')
+            return self._widgetDescription.modulename or ''
         w = self.widget()
         if w is None:
             return ''
         return w.__module__
 
     def getWidgetClassName(self):
+        if not self.isWidgetCreated():
+            if self._pendingConfig is not None:
+                return self._pendingConfig.get('widgetClassName', '')
+            return self._widgetDescription.classname or ''
         w = self.widget()
         if w is None:
             return ''
         return w.__class__.__name__
 
     def applyConfig(self, configdict, depth=-1):
+        if not self.isWidgetCreated():
+            # keep the config until the widget is created
+            self._pendingConfig = configdict
+            TaurusBaseWidget.applyConfig(self, configdict, depth)
+            return
         # create the widget
         try:
             self.setWidgetFromClassName(configdict.get(
                 'widgetClassName'), modulename=configdict.get('widgetModuleName', None))
-            if isinstance(self.widget(), BaseConfigurableClass):
+            if isinstance(self.widget(), BaseConfigurableClass) and \
+                    'widget' in configdict:
                 self.widget().applyConfig(configdict['widget'])
         except Exception, e:
             self.info(
@@ -202,7 +282,11 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
         configdict = TaurusBaseWidget.createConfig(self, *args, **kwargs)
         configdict['widgetClassName'] = self.getWidgetClassName()
         configdict['widgetModuleName'] = self.getWidgetModuleName()
-        if isinstance(self.widget(), BaseConfigurableClass):
+        if not self.isWidgetCreated():
+            if self._pendingConfig is not None and \
+                    'widget' in self._pendingConfig:
+                configdict['widget'] = self._pendingConfig['widget']
+        elif isinstance(self.widget(), BaseConfigurableClass):
             configdict['widget'] = self.widget().createConfig()
         return configdict
 
@@ -919,6 +1003,109 @@ class TaurusGui(TaurusMainWindow):
                if len(instrument.model) > 0]
         return ret
 
+    def _createPanelWidget(self, description):
+        """Creates the widget for a panel from its description
+
+        :param description: (PanelDescription) the panel description
+
+        :return: (QWidget) the widget to be inserted in the panel
+        """
+        w = description.getWidget(sdm=Qt.qApp.SDM, setModel=False)
+        if hasattr(w, 'setCustomWidgetMap'):
+            w.setCustomWidgetMap(self.getCustomWidgetMap())
+        if description.model is not None:
+            w.setModel(description.model)
+        return w
+
+    def _getConfigurationHash(self, conf):
+        """Returns a hash of the contents of the configuration files (the
+        python module and the XML file, if any) or None if it cannot be
+        calculated.
+
+        :param conf: (module) the configuration module
+
+        :return: (str or None) hexadecimal digest
+        """
+        fnames = []
+        fname = getattr(conf, '__file__', None)
+        if fname is None:
+            return None
+        base, ext = os.path.splitext(fname)
+        if ext in ('.pyc', '.pyo') and os.path.exists(base + '.py'):
+            fname = base + '.py'
+        fnames.append(fname)
+        if self._xmlConfigFileName is not None:
+            fnames.append(self._xmlConfigFileName)
+        h = hashlib.sha1()
+        try:
+            for fname in fnames:
+                with open(fname, 'rb') as f:
+                    h.update(f.read())
+        except IOError:
+            return None
+        return h.hexdigest()
+
+    def getStartupCacheFileName(self):
+        """Returns the name of the file used for caching the startup state
+        (located next to the settings file)
+
+        :return: (str) file name
+        """
+        settingsfname = unicode(self.getQSettings().fileName())
+        base, _ = os.path.splitext(settingsfname)
+        return base + '.startupcache'
+
+    def _loadStartupCache(self, key):
+        """Returns the startup state stored with :meth:`_saveStartupCache` if
+        it was stored for the given key (or None otherwise)
+
+        :param key: (str) the configuration hash
+
+        :return: (dict or None) a dict with "panels" and "instruments" keys
+        """
+        if key is None:
+            return None
+        fname = self.getStartupCacheFileName()
+        if not os.path.exists(fname):
+            return None
+        try:
+            with open(fname, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception, e:
+            self.warning('Cannot read startup cache "%s" (%r)', fname, e)
+            return None
+        if cached.get('key') != key:
+            self.info('Startup cache "%s" is outdated', fname)
+            return None
+        self.info('Using startup cache "%s"', fname)
+        return cached
+
+    def _saveStartupCache(self, key, panels, instruments):
+        """Stores the resolved panel descriptions (the custom panels and the
+        instruments from pool) for the given configuration hash.
+
+        :param key: (str) the configuration hash
+        :param panels: (list<PanelDescription>) custom panel descriptions
+        :param instruments: (list<PanelDescription>) instrument descriptions
+        """
+        fname = self.getStartupCacheFileName()
+        cached = dict(key=key, panels=panels, instruments=instruments)
+        try:
+            dirname = os.path.dirname(fname)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            with open(fname, 'wb') as f:
+                pickle.dump(cached, f, pickle.HIGHEST_PROTOCOL)
+        except Exception, e:
+            self.warning('Cannot write startup cache "%s" (%r)', fname, e)
+
+    def clearStartupCache(self):
+        """Removes the startup cache file (it will be regenerated on the next
+        start if the STARTUP_CACHE option is enabled)"""
+        fname = self.getStartupCacheFileName()
+        if os.path.exists(fname):
+            os.remove(fname)
+
     def __getVarFromXML(self, root, nodename, default=None):
         name = root.find(nodename)
         if name is None or name.text is None:
@@ -1135,10 +1322,24 @@ class TaurusGui(TaurusMainWindow):
         for s in SYNOPTIC:
             self.createMainSynoptic(s)
 
+        # the resolved panel descriptions can be cached between executions
+        STARTUP_CACHE = getattr(conf, 'STARTUP_CACHE', (self.__getVarFromXML(
+            xmlroot, "STARTUP_CACHE", 'False').lower() == 'true'))
+        cacheKey = None
+        cached = None
+        if STARTUP_CACHE:
+            cacheKey = self._getConfigurationHash(conf)
+            cached = self._loadStartupCache(cacheKey)
+            if cached is not None:
+                # no need to store it again
+                cacheKey = None
+
         # Get panel descriptions from pool if required
         INSTRUMENTS_FROM_POOL = getattr(conf, 'INSTRUMENTS_FROM_POOL', (self.__getVarFromXML(
             xmlroot, "INSTRUMENTS_FROM_POOL", 'False').lower() == 'true'))
-        if INSTRUMENTS_FROM_POOL:
+        if cached is not None:
+            POOLINSTRUMENTS = cached['instruments']
+        elif INSTRUMENTS_FROM_POOL:
             try:
                 self.splashScreen().showMessage("Gathering Instrument info from Pool")
             except AttributeError:
@@ -1158,18 +1359,28 @@ class TaurusGui(TaurusMainWindow):
             self.createConsole([])
         #######################################################################
 
-        # get custom panel descriptions from the python config file
-        CUSTOM_PANELS = [obj for name, obj in inspect.getmembers(
-            conf) if isinstance(obj, PanelDescription)]
-
-        # add custom panel descriptions from xml config
-        panelDescriptions = xmlroot.find("PanelDescriptions")
-        if (panelDescriptions is not None):
-            for child in panelDescriptions:
-                if (child.tag == "PanelDescription"):
-                    pd = PanelDescription.fromXml(etree.tostring(child))
-                    if pd is not None:
-                        CUSTOM_PANELS.append(pd)
+        if cached is not None:
+            CUSTOM_PANELS = cached['panels']
+        else:
+            # get custom panel descriptions from the python config file
+            CUSTOM_PANELS = [obj for name, obj in inspect.getmembers(
+                conf) if isinstance(obj, PanelDescription)]
+
+            # add custom panel descriptions from xml config
+            panelDescriptions = xmlroot.find("PanelDescriptions")
+            if (panelDescriptions is not None):
+                for child in panelDescriptions:
+                    if (child.tag == "PanelDescription"):
+                        pd = PanelDescription.fromXml(etree.tostring(child))
+                        if pd is not None:
+                            CUSTOM_PANELS.append(pd)
+
+        if cacheKey is not None:
+            self._saveStartupCache(cacheKey, CUSTOM_PANELS, POOLINSTRUMENTS)
+
+        # panels can be created on demand (when first shown)
+        LAZY_PANELS = getattr(conf, 'LAZY_PANELS', (self.__getVarFromXML(
+            xmlroot, "LAZY_PANELS", 'False').lower() == 'true'))
 
         # create panels based on the panel descriptions gathered before
         for p in CUSTOM_PANELS + POOLINSTRUMENTS:
@@ -1178,19 +1389,22 @@ class TaurusGui(TaurusMainWindow):
                     self.splashScreen().showMessage("Creating panel %s" % p.name)
                 except AttributeError:
                     pass
-                w = p.getWidget(sdm=Qt.qApp.SDM, setModel=False)
-                if hasattr(w, 'setCustomWidgetMap'):
-                    w.setCustomWidgetMap(self.getCustomWidgetMap())
-                if p.model is not None:
-                    w.setModel(p.model)
+                if LAZY_PANELS:
+                    w = None
+                else:
+                    w = self._createPanelWidget(p)
                 if p.instrumentkey is None:
                     instrumentkey = self.IMPLICIT_ASSOCIATION
                 # the pool instruments may change when the pool config changes,
                 # so we do not store their config
                 registerconfig = p not in POOLINSTRUMENTS
                 # create a panel
-                self.createPanel(w, p.name, floating=p.floating, registerconfig=registerconfig,
-                                 instrumentkey=instrumentkey, permanent=True)
+                panel = self.createPanel(w, p.name, floating=p.floating,
+                                         registerconfig=registerconfig,
+                                         instrumentkey=instrumentkey,
+                                         permanent=True)
+                if w is None:
+                    panel.setWidgetDescription(p)
             except Exception, e:
                 msg = 'Cannot create panel %s' % getattr(
                     p, 'name', '__Unknown__')
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the lazy panels and the startup cache of TaurusGui"""
+
+import os
+import shutil
+import tempfile
+import types
+import unittest
+
+from taurus.external.qt import Qt
+from taurus.qt.qtgui.test import BaseWidgetTestCase
+from taurus.qt.qtgui.taurusgui import TaurusGui
+from taurus.qt.qtgui.taurusgui.utils import PanelDescription
+
+
+class LazyPanelTestCase(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the panels whose widget is created when first shown
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGui
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._description = PanelDescription(
+            'LazyPanel', classname='taurus.external.qt.Qt.QLineEdit')
+        self._panel = self._widget.createPanel(None, 'LazyPanel')
+        self._panel.hide()
+        self._panel.setWidgetDescription(self._description)
+
+    def tearDown(self):
+        self._widget.removePanel('LazyPanel')
+        self._widget.close()
+        unittest.TestCase.tearDown(self)
+
+    def test_deferredCreation(self):
+        '''Check that the widget is created only when the panel is shown'''
+        self.assertFalse(self._panel.isWidgetCreated())
+        self.assertIs(self._panel.getWidgetDescription(), self._description)
+        self.assertIsInstance(self._panel.widget(), Qt.QLabel)
+        # the description is reported while the widget is not created
+        self.assertEqual(self._panel.getWidgetClassName(), 'QLineEdit')
+        self.assertIs(PanelDescription.fromPanel(self._panel),
+                      self._description)
+        self._widget.show()
+        self.processEvents(repetitions=5)
+        self.assertFalse(self._panel.isWidgetCreated())
+        self._panel.show()
+        self.processEvents(repetitions=5)
+        self.assertTrue(self._panel.isWidgetCreated())
+        self.assertIsNone(self._panel.getWidgetDescription())
+        self.assertIsInstance(self._panel.widget(), Qt.QLineEdit)
+
+    def test_pendingConfig(self):
+        '''Check that the config restored before creation is kept'''
+        configdict = self._panel.createConfig()
+        configdict['widgetClassName'] = 'QLineEdit'
+        configdict['widgetModuleName'] = 'taurus.external.qt.Qt'
+        self._panel.applyConfig(configdict)
+        self.assertFalse(self._panel.isWidgetCreated())
+        self.assertEqual(self._panel.createConfig()['widgetModuleName'],
+                         'taurus.external.qt.Qt')
+        self._panel.createWidget()
+        self.assertIsInstance(self._panel.widget(), Qt.QLineEdit)
+
+
+class StartupCacheTestCase(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the cache of the panel descriptions of TaurusGui
+
+    .. seealso: :class:`taurus.qt.qtgui.test.base.BaseWidgetTestCase`
+    '''
+    _klass = TaurusGui
+
+    def setUp(self):
+        BaseWidgetTestCase.setUp(self)
+        self._dir = tempfile.mkdtemp()
+        self._cachefname = os.path.join(self._dir, 'gui.startupcache')
+        self._widget.getStartupCacheFileName = lambda: self._cachefname
+        self._conffname = os.path.join(self._dir, 'config.py')
+        self._writeConf('GUI_NAME = "foo"\n')
+        self._conf = types.ModuleType('config')
+        self._conf.__file__ = self._conffname
+        self._panels = [PanelDescription('P1', classname='QLineEdit',
+                                         modulename='taurus.external.qt.Qt')]
+
+    def tearDown(self):
+        self._widget.close()
+        shutil.rmtree(self._dir)
+        unittest.TestCase.tearDown(self)
+
+    def _writeConf(self, text):
+        with open(self._conffname, 'w') as f:
+            f.write(text)
+
+    def test_reuse(self):
+        '''Check that the cache is reused for the same configuration'''
+        key = self._widget._getConfigurationHash(self._conf)
+        self.assertIsNotNone(key)
+        self._widget._saveStartupCache(key, self._panels, [])
+        key = self._widget._getConfigurationHash(self._conf)
+        cached = self._widget._loadStartupCache(key)
+        self.assertIsNotNone(cached)
+        self.assertEqual([p.name for p in cached['panels']], ['P1'])
+        self.assertEqual(cached['panels'][0].classname, 'QLineEdit')
+        self.assertEqual(cached['instruments'], [])
+
+    def test_invalidation(self):
+        '''Check that the cache is ignored if the configuration changes'''
+        key = self._widget._getConfigurationHash(self._conf)
+        self._widget._saveStartupCache(key, self._panels, [])
+        self._writeConf('GUI_NAME = "bar"\n')
+        newkey = self._widget._getConfigurationHash(self._conf)
+        self.assertNotEqual(key, newkey)
+        self.assertIsNone(self._widget._loadStartupCache(newkey))
+        self._widget.clearStartupCache()
+        self.assertFalse(os.path.exists(self._cachefname))
+        self.assertIsNone(self._widget._loadStartupCache(key))
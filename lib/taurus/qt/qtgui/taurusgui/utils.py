@@ -368,6 +368,10 @@ class PanelDescription(TaurusGuiComponentDescription):
 
     @staticmethod
     def fromPanel(panel):
+        # panels whose widget was not created yet keep their description
+        description = getattr(panel, 'getWidgetDescription', lambda: None)()
+        if description is not None:
+            return description
         name = str(panel.objectName())
         classname = panel.getWidgetClassName()
         modulename = panel.getWidgetModuleName()
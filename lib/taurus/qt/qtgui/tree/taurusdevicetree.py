@@ -352,6 +352,7 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
     deviceSelected = Qt.pyqtSignal('QString')
     addAttrSelected = Qt.pyqtSignal('QStringList')
     removeAttrSelected = Qt.pyqtSignal('QStringList')
+    statesRead = Qt.pyqtSignal(object)
 
     def __init__(self, parent=None, designMode=False):
         name = "TaurusDevTree"
@@ -391,11 +392,22 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
             self.Loader
             self.Expander
 
+        # The states of the devices shown in the viewport are read in the
+        # background (see refreshStates) when the tree is scrolled or
+        # expanded, and periodically
+        self._statesTimer = Qt.QTimer(self)
+        self._statesTimer.setSingleShot(True)
+        self._statesTimer.timeout.connect(self.refreshStates)
+
         self.initConfig()
 
         # Signal
         self.itemClicked.connect(self.deviceClicked)
         self.nodeFound.connect(self.expandNode)
+        self.statesRead.connect(self.setStates)
+        self.itemExpanded.connect(self._scheduleStatesRefresh)
+        self.verticalScrollBar().valueChanged.connect(
+            self._scheduleStatesRefresh)
         self.setDragDropMode(Qt.QAbstractItemView.DragDrop)
         self.setModifiableByUser(True)
         self.setModelInConfig(False)  # We store Filters instead!
@@ -459,6 +471,9 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
             self, 'ShowNotExported', 'bool', default=True, qt=False, config=True)
         properties.set_property_methods(
             self, 'ShowColors', 'bool', default=True, qt=False, config=True)
+        properties.set_property_methods(
+            self, 'ShowStates', 'bool', default=False, qt=False, config=True,
+            set_callback=lambda v, s=self: s._scheduleStatesRefresh())
         # properties.set_property_methods(self,'Expand','int',default=0)
 
     @staticmethod
@@ -701,8 +716,7 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
                 item = self.createItem(parent, node, text)
 
     def clear(self):
-        while not self.Expander.getQueue().empty():
-            self.Expander.getQueue().get()
+        self.Expander.clear()
         self.item_index.clear()
         while self.item_list:
             self.item_list.pop()
@@ -1074,6 +1088,62 @@ class TaurusDevTree(TaurusTreeNodeContainer, Qt.QTreeWidget, TaurusBaseWidget):
                 update_node(node, name, dct or {name: ''})
         return
 
+    def getVisibleDeviceNodes(self):
+        """Returns the device nodes shown in the viewport (i.e., those of
+        the expanded branches which are not scrolled out of view)"""
+        nodes = []
+        height = self.viewport().height()
+        item = self.itemAt(0, 0)
+        while item is not None and self.visualItemRect(item).top() < height:
+            if not item.isAttribute and self.getNodeText(item).count('/') == 2:
+                nodes.append(item)
+            item = self.itemBelow(item)
+        return nodes
+
+    def _scheduleStatesRefresh(self, *args):
+        if self.getShowStates():
+            # restarted on each call, so that scrolling reads only the
+            # devices on which the view stops
+            self._statesTimer.start(100)
+
+    def refreshStates(self):
+        """Updates the state of the devices shown in the viewport (if the
+        ShowStates property is set). The cached states are applied at once,
+        and the expired ones are read in the background, in bulk (see
+        :class:`taurus.core.tango.util.devstatereader.DeviceStateReader`).
+        The devices which are not visible are never read."""
+        if not self.getShowStates():
+            return
+        from taurus.core.tango.util.devstatereader import DeviceStateReader
+        reader = DeviceStateReader()
+        names = [self.getNodeText(n) for n in self.getVisibleDeviceNodes()]
+        if names:
+            self.setStates(reader.requestStates(names, self.statesRead.emit,
+                                                authority=self.db))
+        self._statesTimer.start(int(1000 * reader.getTTL()))
+
+    def setStates(self, states):
+        """Updates the icon and (if the ShowColors property is set) the
+        background of the nodes of the given devices
+
+        :param states: (dict) {device name: state}. A None state means that
+                       the state is unknown
+        """
+        showColors = self.getShowColors()
+        for name, state in states.items():
+            node = self.item_index.get(name)
+            if node is None:
+                continue
+            state = 'UNKNOWN' if state is None else str(state)
+            if getattr(node, 'DeviceState', None) == state:
+                continue
+            node.DeviceState = state
+            if showColors and not hasattr(node, 'CustomBackground'):
+                node.setBackground(0, Qt.QBrush(
+                    Qt.QColor(DEVICE_STATE_PALETTE.number(state))))
+            if not hasattr(node, 'CustomIcon'):
+                self.setStateIcon(node, state)
+
     def setStateIcon(self, child, color):
         if icons_dev_tree is None:
             self.debug('In setStateIcon(...): Icons for states not available!')
@@ -49,6 +49,25 @@ class QtColorPalette(ColorPalette):
         self._qbrush_cache_bg = dict()
         self._qvariant_cache_fg = dict()
         self._qvariant_cache_bg = dict()
+        self._qstylesheet_cache = dict()
+        # precompute the brushes and style sheets of all the colors
+        for name in self:
+            self.qbrush(name)
+            self.qtStyleSheet(name)
+
+    def key(self, stoq):
+        """Returns the key (the name of the entry in the color table) for the
+        specified state or quality"""
+        return self._decoder(stoq)
+
+    def qtStyleSheet(self, stoq):
+        """Returns the style sheet for the specified state or quality"""
+        name = self._decoder(stoq)
+        ss = self._qstylesheet_cache.get(name)
+        if ss is None:
+            ss = ColorPalette.qtStyleSheet(self, name)
+            self._qstylesheet_cache[name] = ss
+        return ss
 
     def qbrush(self, stoq):
         # print stoq
@@ -71,6 +71,83 @@ DEFAULT_SCHEME = "tango"
 # False (or commented out) for backwards (pre 4.1) compatibility
 FILTER_OLD_TANGO_EVENTS = True
 
+# Asynchronous model attach:
+# True makes the Taurus widgets create their model objects and subscribe to
+# their events in a pool of worker threads, so that unreachable models do not
+# block the GUI (the widgets show a "connecting" state meanwhile).
+# False (or commented out) for backwards compatibility
+ASYNC_ATTACH = False
+
+# Number of worker threads used for the asynchronous model attach
+ASYNC_ATTACH_WORKERS = 5
+
+# Set to True for passing the taurus log records to the log handlers from a
+# dedicated thread (so that formatting and writing the records does not
+# delay the threads that log, e.g. those processing events)
+ASYNC_LOG_OUTPUT = False
+
+# Minimum time (in seconds) between identical log records (same logger,
+# level, call site and message). Repeated records arriving before are
+# discarded and counted. 0 (or commented out) disables the rate limit
+LOG_RATE_LIMIT = 0
+
+# Time budget (in milliseconds) that the GUI thread devotes to queued tasks
+# (e.g. the models set by TaurusGrid and TaurusDevTree) before processing
+# other events. Larger values fill big grids faster but make the GUI less
+# responsive meanwhile
+TASK_DISPATCHER_BUDGET = 8
+
+# Maximum rate at which the events of each model are passed to the widgets
+# (i.e., to the Qt thread), as a dictionary of periods (in seconds) per
+# widget class name (the entry of the most derived class is used). Only the
+# last event received in each period is passed. E.g., for refreshing all the
+# widgets at most 25 times per second, except the trends (which need all the
+# events):
+# EVENT_THROTTLE_PERIODS = {'TaurusBaseComponent': 0.04,
+#                           'TaurusTrendsSet': 0,  # TaurusTrend curves
+#                           'TaurusTrendItem': 0,  # guiqwt trend curves
+#                           'TaurusTrend2DItem': 0}  # guiqwt 2D trends
+EVENT_THROTTLE_PERIODS = {}
+
+# Suspend the processing of the events of the widgets while they are hidden
+# (e.g. in hidden tabs or panels, or in minimized windows). While suspended,
+# only the last event of each model is kept (and processed when the widget
+# is shown again), unless SUSPENDED_REFRESH_PERIOD (in seconds) is not 0, in
+# which case the widgets are also refreshed with that period.
+# False (or commented out) for backwards compatibility
+SUSPEND_HIDDEN_WIDGETS = False
+SUSPENDED_REFRESH_PERIOD = 0
+
+# Maximum time (in seconds) to wait for the write operations applied by the
+# widgets (e.g. when pressing "Apply" in a TaurusForm). The writes are grouped
+# by device and the devices are written in parallel by up to
+# PENDING_OPERATIONS_WORKERS threads
+PENDING_OPERATIONS_TIMEOUT = 30
+PENDING_OPERATIONS_WORKERS = 8
+
+# Record runtime metrics of the taurus core (events fired by each attribute,
+# time spent in the listeners, polling and thread pool latencies...). See
+# taurus.core.util.metrics. False (or commented out) for no overhead
+METRICS_ENABLED = False
+
+# Write the runtime metrics to the given text file when the program exits
+# (it is only useful if the metrics are enabled)
+# METRICS_EXPORT_FILE = '/tmp/taurus_metrics.txt'
+
+# Persistent cache of the configuration of the Tango attributes, shared by
+# the taurus processes of the host. If set, the attributes take their
+# configuration from this file (and refresh it asynchronously) instead of
+# querying the devices at startup. The attribute lists shown by the database
+# trees are also cached (until the devices are exported again). See
+# taurus.core.tango.util.attrinfocache
+# TANGO_CONFIG_CACHE_FILE = '~/.taurus/tango_config_cache'
+
+# Time (in seconds) during which the device states read in the background
+# (e.g. for colouring the TaurusDevTree nodes) are reused, and number of
+# threads reading them. See taurus.core.tango.util.devstatereader
+DEVICE_STATE_TTL = 3
+DEVICE_STATE_WORKERS = 4
+
 # Extra Taurus schemes. You can add a list of modules to be loaded for
 # providing support to new schemes
 # EXTRA_SCHEME_MODULES = ['myownschememodule']
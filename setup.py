@@ -97,6 +97,8 @@ console_scripts = [
     'taurustrend2d = taurus.qt.qtgui.extra_guiqwt.taurustrend2d:taurusTrend2DMain',
     'taurusiconcatalog = taurus.qt.qtgui.icon.catalog:main',
     'taurusdemo = taurus.qt.qtgui.panel.taurusdemo:main',
+    'taurusbenchmark = taurus.core.benchmarks.suite:main',
+    'taurusstats = taurus.core.util.metrics:main',
     # TODO: taurusdoc,
 ]
 